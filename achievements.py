@@ -0,0 +1,262 @@
+# Achievement engine for Number Master Pro.
+#
+# Each achievement is a Rule: a key, a label and a test on a player's
+# Progress, a handful of running totals updated in O(1) per finished game.
+# When a game finishes, only rules the player hasn't unlocked yet are tested,
+# and new unlocks are saved with a timestamp, so rendering achievements is a
+# single indexed read however many rules exist.
+#
+# Progress and unlocks are kept in SQLite next to the game history. Rules added
+# later start from a player's saved progress; award_history() replays archived
+# games to grant achievements in bulk, timestamped with the game that earned
+# them. It only backfills players with no saved progress, whose whole history
+# it must be given; players already tracked game by game are left alone:
+#
+#   python achievements.py                  # award over the history database
+#   python achievements.py archives         # or over an archive.py directory
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from history_store import DEFAULT_PATH
+
+# Games needed before a win rate counts towards an achievement
+MIN_RATE_GAMES = 10
+# Players whose progress is kept in memory; the rest are read back on demand
+PLAYER_CACHE_SIZE = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS achievement_progress (
+    player TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS achievements (
+    player TEXT NOT NULL,
+    key TEXT NOT NULL,
+    unlocked_at TEXT,
+    game_id INTEGER,
+    PRIMARY KEY (player, key)
+);
+"""
+
+
+class Progress:
+    # A player's running totals. Every field merges by sum, min or max, so
+    # summaries of separate parts of a history can be combined (see analytics.py).
+    __slots__ = ('games', 'wins', 'hintless_wins', 'best_attempts', 'high_score')
+
+    def __init__(self, games=0, wins=0, hintless_wins=0, best_attempts=None, high_score=None):
+        self.games = games
+        self.wins = wins
+        self.hintless_wins = hintless_wins
+        # Fewest attempts in a won game
+        self.best_attempts = best_attempts
+        self.high_score = high_score
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games * 100 if self.games else 0.0
+
+    def update(self, record):
+        score = record['score']
+        self.games += 1
+        # A game counts as won when it scored, as in HistoryStats
+        if score > 0:
+            self.wins += 1
+            if not record.get('hints_used'):
+                self.hintless_wins += 1
+            attempts = record['attempts']
+            if self.best_attempts is None or attempts < self.best_attempts:
+                self.best_attempts = attempts
+        if self.high_score is None or score > self.high_score:
+            self.high_score = score
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.hintless_wins += other.hintless_wins
+        if other.best_attempts is not None and (self.best_attempts is None or other.best_attempts < self.best_attempts):
+            self.best_attempts = other.best_attempts
+        if other.high_score is not None and (self.high_score is None or other.high_score > self.high_score):
+            self.high_score = other.high_score
+
+    def to_json(self):
+        return json.dumps([getattr(self, field) for field in self.__slots__])
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(*json.loads(text))
+
+
+class Rule:
+    __slots__ = ('key', 'label', 'test')
+
+    def __init__(self, key, label, test):
+        self.key = key
+        self.label = label
+        self.test = test
+
+
+RULES = (
+    Rule('dedicated', "🎮 Dedicated Player: Played 10+ games", lambda p: p.games >= 10),
+    Rule('winner', "🏅 Winner: Won 5+ games", lambda p: p.wins >= 5),
+    Rule('master_guesser', f"🌟 Master Guesser: 70%+ win rate over {MIN_RATE_GAMES}+ games",
+         lambda p: p.games >= MIN_RATE_GAMES and p.win_rate >= 70),
+    Rule('sharp_eye', "🔍 Sharp Eye: Guessed correctly in 3 or fewer attempts",
+         lambda p: p.best_attempts is not None and p.best_attempts <= 3),
+    Rule('high_scorer', "💯 High Scorer: Scored 500+ points in a single game",
+         lambda p: p.high_score is not None and p.high_score >= 500),
+    Rule('pure_skill', "🧠 Pure Skill: Won a game without using hints", lambda p: p.hintless_wins > 0),
+)
+
+
+class AchievementEngine:
+    # Shared by every session. The progress and unlocked keys of the most
+    # recently active players are cached; writes go straight to SQLite, so a
+    # player dropped from the cache is simply read back.
+    def __init__(self, path=None, rules=RULES, cache_size=PLAYER_CACHE_SIZE):
+        if path is None:
+            path = os.environ.get("NUMBER_MASTER_DB", DEFAULT_PATH)
+        self.path = path
+        self.rules = rules
+        self.rules_by_key = {rule.key: rule for rule in rules}
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        # player -> (Progress, set of unlocked keys), least recently used first
+        self._players = OrderedDict()
+
+    def _load(self, player):
+        cached = self._players.get(player)
+        if cached is None:
+            row = self._conn.execute(
+                "SELECT state FROM achievement_progress WHERE player = ?", (player,)
+            ).fetchone()
+            keys = {key for (key,) in self._conn.execute(
+                "SELECT key FROM achievements WHERE player = ?", (player,)
+            )}
+            cached = self._players[player] = (Progress.from_json(row[0]) if row else None, keys)
+            while len(self._players) > self.cache_size:
+                self._players.popitem(last=False)
+        else:
+            self._players.move_to_end(player)
+        return cached
+
+    def has_progress(self, player):
+        with self._lock:
+            return self._load(player)[0] is not None
+
+    def record_game(self, player, record, game_id=None):
+        # Update a player's progress with one finished game; returns the rules
+        # it unlocked
+        with self._lock:
+            progress, keys = self._load(player)
+            if progress is None:
+                progress = Progress()
+                self._players[player] = (progress, keys)
+            progress.update(record)
+            unlocked = [rule for rule in self.rules if rule.key not in keys and rule.test(progress)]
+            keys.update(rule.key for rule in unlocked)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO achievement_progress (player, state) VALUES (?, ?)",
+                    (player, progress.to_json())
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO achievements (player, key, unlocked_at, game_id) VALUES (?, ?, ?, ?)",
+                    [(player, rule.key, record.get('date'), game_id) for rule in unlocked]
+                )
+        return unlocked
+
+    def award_history(self, games, chunk_size=10_000):
+        # Build progress from a stream of (player, record) pairs holding each
+        # player's whole history in play order, granting what each game
+        # earned. Only players with no saved progress are backfilled: the
+        # others are already counted, so their games are skipped rather than
+        # counted again or replaced by a partial history. Unlocks a player
+        # already has keep their original timestamp. Returns the number of
+        # new unlocks.
+        players = {}
+        skipped = set()
+        pending = []
+        awarded = 0
+        for player, record in games:
+            if player in skipped:
+                continue
+            state = players.get(player)
+            if state is None:
+                if self.has_progress(player):
+                    skipped.add(player)
+                    continue
+                state = players[player] = (Progress(), set())
+            progress, keys = state
+            progress.update(record)
+            for rule in self.rules:
+                if rule.key not in keys and rule.test(progress):
+                    keys.add(rule.key)
+                    pending.append((player, rule.key, record.get('date'), record.get('id')))
+            if len(pending) >= chunk_size:
+                awarded += self._save_unlocks(pending)
+                pending = []
+        awarded += self._save_unlocks(pending)
+        with self._lock:
+            # A player whose first live game was recorded meanwhile keeps that
+            # progress; it is never overwritten
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO achievement_progress (player, state) VALUES (?, ?)",
+                    [(player, progress.to_json()) for player, (progress, _) in players.items()]
+                )
+            for player in players:
+                self._players.pop(player, None)
+        return awarded
+
+    def _save_unlocks(self, rows):
+        with self._lock:
+            with self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO achievements (player, key, unlocked_at, game_id) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                return self._conn.total_changes - before
+
+    def unlocked(self, player):
+        # (rule, unlocked_at) pairs, in the order they were unlocked
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, unlocked_at FROM achievements WHERE player = ? ORDER BY rowid",
+                (player,)
+            ).fetchall()
+        return [(self.rules_by_key[key], when) for key, when in rows if key in self.rules_by_key]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Award achievements over stored or archived game history.")
+    parser.add_argument("archive", nargs="?", help="archive.py directory (default: the history database)")
+    parser.add_argument("--db", help="database holding history and achievements "
+                        "(default: NUMBER_MASTER_DB or number_master.db)")
+    args = parser.parse_args(argv)
+
+    engine = AchievementEngine(args.db)
+    if args.archive:
+        from archive import iter_archive
+        games = iter_archive(args.archive)
+    else:
+        from history_store import HistoryStore
+        games = HistoryStore(args.db).iter_games()
+    print(f"{engine.award_history(games)} achievements awarded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+# Offline analytics over archived game history.
+#
+# Computes the Stats tab's metrics (win rate, attempts distribution, score by
+# difficulty, learning curve and achievements) across every player in one or
+# more history sources:
+#   - a SQLite history database (*.db);
+#   - an archive directory written by archive.py (Parquet, Arrow or CSV);
+#   - a directory containing any number of the above.
+#
+# Sources are split into tasks (id ranges of a database, row groups of a
+# Parquet file, record batches of an Arrow file, whole CSV files) that worker
+# processes summarise independently. Each summary holds only mergeable totals
+# (counts, histograms, per-player aggregates), so no process ever holds the
+# games themselves; the main process merges summaries in source order.
+#
+#   python analytics.py history.db archives/ --workers 8
+#   python analytics.py archives/ --format json > cohort.json
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from achievements import RULES, Progress
+from stats import RECENT_WINDOW
+
+# Columns the metrics need; guesses are never read
+COLUMNS = ('attempts', 'score', 'difficulty', 'hints_used')
+DB_TASK_GAMES = 100_000
+LEARNING_CURVE_GAMES = 100
+DB_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+class PlayerSummary:
+    # One player's achievement progress, with the attempts of their first
+    # games for the learning curve
+    __slots__ = ('progress', 'first_attempts')
+
+    def __init__(self):
+        self.progress = Progress()
+        self.first_attempts = []
+
+    def merge(self, other):
+        # Add a later part of the same player's history
+        room = LEARNING_CURVE_GAMES - self.progress.games
+        if room > 0:
+            self.first_attempts.extend(other.first_attempts[:room])
+        self.progress.merge(other.progress)
+
+
+class Summary:
+    # Mergeable totals for a set of games
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.total_attempts = 0
+        self.total_score = 0
+        self.attempts = Counter()
+        # difficulty -> Counter of scores, for exact quartiles
+        self.scores = {}
+        self.players = {}
+        # Rows that couldn't be read
+        self.skipped = 0
+
+    def add(self, player, attempts, score, difficulty, hints_used):
+        self.games += 1
+        won = score > 0
+        self.wins += won
+        self.total_attempts += attempts
+        self.total_score += score
+        self.attempts[attempts] += 1
+        scores = self.scores.get(difficulty)
+        if scores is None:
+            scores = self.scores[difficulty] = Counter()
+        scores[score] += 1
+
+        summary = self.players.get(player)
+        if summary is None:
+            summary = self.players[player] = PlayerSummary()
+        if summary.progress.games < LEARNING_CURVE_GAMES:
+            summary.first_attempts.append(attempts)
+        summary.progress.update({'attempts': attempts, 'score': score, 'hints_used': hints_used})
+
+    def merge(self, other):
+        # Add a summary of later games
+        self.games += other.games
+        self.wins += other.wins
+        self.total_attempts += other.total_attempts
+        self.total_score += other.total_score
+        self.skipped += other.skipped
+        self.attempts.update(other.attempts)
+        for difficulty, scores in other.scores.items():
+            self.scores.setdefault(difficulty, Counter()).update(scores)
+        for player, summary in other.players.items():
+            mine = self.players.get(player)
+            if mine is None:
+                self.players[player] = summary
+            else:
+                mine.merge(summary)
+
+    def report(self, window=RECENT_WINDOW):
+        attempts = sorted(self.attempts)
+        return {
+            'overall': {
+                'games': self.games,
+                'players': len(self.players),
+                'wins': self.wins,
+                'win_rate': self.wins / self.games * 100 if self.games else 0.0,
+                'avg_attempts': self.total_attempts / self.games if self.games else 0.0,
+                'avg_score': self.total_score / self.games if self.games else 0.0,
+                'min_attempts': attempts[0] if attempts else None,
+                'max_attempts': attempts[-1] if attempts else None,
+                'high_score': max((max(s) for s in self.scores.values()), default=None),
+                'total_score': self.total_score,
+                'skipped_rows': self.skipped,
+            },
+            'attempts_distribution': {str(a): self.attempts[a] for a in attempts},
+            'score_by_difficulty': {
+                str(difficulty): _box_stats(scores) for difficulty, scores in self.scores.items()
+            },
+            'learning_curve': self._learning_curve(window),
+            # Judged on each player's final totals, so a win rate that has
+            # since dropped below 70% doesn't count
+            'achievements': {
+                rule.label: sum(1 for p in self.players.values() if rule.test(p.progress))
+                for rule in RULES
+            },
+        }
+
+    def _learning_curve(self, window):
+        # Mean attempts at each game number across players, with the same
+        # moving average the Stats tab draws for one player
+        totals, counts = [], []
+        for summary in self.players.values():
+            for i, attempts in enumerate(summary.first_attempts):
+                if i == len(totals):
+                    totals.append(0)
+                    counts.append(0)
+                totals[i] += attempts
+                counts[i] += 1
+        means = [t / c for t, c in zip(totals, counts)]
+        curve = []
+        for i, mean in enumerate(means):
+            recent = means[max(0, i - window + 1):i + 1]
+            curve.append({
+                'game_number': i + 1,
+                'players': counts[i],
+                'avg_attempts': mean,
+                'moving_avg_attempts': sum(recent) / len(recent) if i + 1 >= window else None,
+            })
+        return curve
+
+
+# Function to get box plot statistics from a Counter of values
+def _box_stats(counts):
+    n = sum(counts.values())
+    values = sorted(counts)
+
+    def quantile(q):
+        # Linear interpolation between order statistics, as pandas does
+        position = (n - 1) * q
+        lower = int(position)
+        return _nth(values, counts, lower) + (position - lower) * (
+            _nth(values, counts, min(lower + 1, n - 1)) - _nth(values, counts, lower)
+        )
+
+    return {
+        'count': n,
+        'min': values[0],
+        'q1': quantile(0.25),
+        'median': quantile(0.5),
+        'q3': quantile(0.75),
+        'max': values[-1],
+        'mean': sum(v * c for v, c in counts.items()) / n,
+    }
+
+
+def _nth(values, counts, k):
+    # k-th smallest (0-based) value of a Counter, given its sorted keys
+    for value in values:
+        k -= counts[value]
+        if k < 0:
+            return value
+    return values[-1]
+
+
+# Sources and tasks. A task is a picklable tuple naming one slice of a source.
+
+def find_tasks(paths, workers=1):
+    tasks = []
+    for path in paths:
+        if os.path.isdir(path):
+            archive = _archive_format(path)
+            if archive:
+                tasks.extend(_archive_tasks(path, archive))
+            else:
+                tasks.extend(find_tasks(
+                    [os.path.join(path, name) for name in sorted(os.listdir(path))], workers
+                ))
+        elif path.endswith(DB_SUFFIXES):
+            tasks.extend(_db_tasks(path, workers))
+    return tasks
+
+
+def _archive_format(path):
+    for fmt in ('parquet', 'arrow', 'csv'):
+        if os.path.exists(os.path.join(path, f"games.{fmt}")):
+            return fmt
+    return None
+
+
+def _archive_tasks(path, fmt):
+    games_path = os.path.join(path, f"games.{fmt}")
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return [('parquet', games_path, i) for i in range(pq.ParquetFile(games_path).num_row_groups)]
+    if fmt == 'arrow':
+        import pyarrow as pa
+        with pa.memory_map(games_path) as source:
+            return [('arrow', games_path, i) for i in range(pa.ipc.open_file(source).num_record_batches)]
+    return [('csv', games_path, None)]
+
+
+def _db_tasks(path, workers):
+    from history_store import HistoryStore
+    store = HistoryStore(path)
+    first, last = store.id_range()
+    store.close()
+    if first is None:
+        return []
+    # Enough tasks to keep every worker busy, but no more than needed
+    step = max(1, min(DB_TASK_GAMES, -(-(last - first + 1) // (workers * 4))))
+    return [('db', path, (start, min(start + step - 1, last))) for start in range(first, last + 1, step)]
+
+
+def _rows(task):
+    # Yield (player, attempts, score, difficulty, hints_used) for one task,
+    # or None for a row that can't be read
+    kind, path, part = task
+    if kind == 'db':
+        from history_store import HistoryStore
+        store = HistoryStore(path)
+        try:
+            for row in store.iter_columns(COLUMNS, part[0], part[1]):
+                yield row[1:]
+        finally:
+            store.close()
+    elif kind in ('parquet', 'arrow'):
+        if kind == 'parquet':
+            import pyarrow.parquet as pq
+            batch = pq.ParquetFile(path).read_row_group(part, columns=['player', *COLUMNS])
+        else:
+            import pyarrow as pa
+            with pa.memory_map(path) as source:
+                batch = pa.ipc.open_file(source).get_batch(part).select(['player', *COLUMNS])
+        yield from zip(*(batch.column(name).to_pylist() for name in ('player', *COLUMNS)))
+    else:
+        import csv
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                try:
+                    yield (row['player'], int(row['attempts']), int(row['score']),
+                           row['difficulty'], int(row['hints_used'] or 0))
+                except (KeyError, TypeError, ValueError):
+                    yield None
+
+
+def summarize(task):
+    summary = Summary()
+    for row in _rows(task):
+        if row is None:
+            summary.skipped += 1
+            continue
+        player, attempts, score, difficulty, hints_used = row
+        summary.add(player, attempts or 0, score or 0, difficulty, hints_used)
+    return summary
+
+
+# Function to summarise every source, in parallel when workers > 1
+def analyze(paths, workers=1):
+    tasks = find_tasks(paths, workers)
+    total = Summary()
+    if workers <= 1:
+        for task in tasks:
+            total.merge(summarize(task))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            # map() yields in task order, so each player's games merge in order
+            for summary in pool.map(summarize, tasks):
+                total.merge(summary)
+    return total
+
+
+def print_tables(report, out=sys.stdout):
+    overall = report['overall']
+    out.write("Overall\n")
+    for key, value in overall.items():
+        out.write(f"  {key:<14} {value:.2f}\n" if isinstance(value, float) else f"  {key:<14} {value}\n")
+
+    out.write("\nAttempts distribution\n")
+    for attempts, count in report['attempts_distribution'].items():
+        out.write(f"  {attempts:>6} {count:>10}\n")
+
+    out.write("\nScore by difficulty\n")
+    out.write(f"  {'difficulty':<16}{'count':>10}{'min':>8}{'q1':>10}{'median':>10}{'q3':>10}{'max':>8}{'mean':>10}\n")
+    for difficulty, box in report['score_by_difficulty'].items():
+        out.write(f"  {difficulty:<16}{box['count']:>10}{box['min']:>8}{box['q1']:>10.1f}"
+                  f"{box['median']:>10.1f}{box['q3']:>10.1f}{box['max']:>8}{box['mean']:>10.1f}\n")
+
+    out.write("\nLearning curve\n")
+    out.write(f"  {'game':>6}{'players':>10}{'attempts':>10}{'moving avg':>12}\n")
+    for point in report['learning_curve']:
+        moving = point['moving_avg_attempts']
+        out.write(f"  {point['game_number']:>6}{point['players']:>10}{point['avg_attempts']:>10.2f}"
+                  f"{'' if moving is None else f'{moving:.2f}':>12}\n")
+
+    out.write("\nAchievements (players unlocked)\n")
+    for label, players in report['achievements'].items():
+        out.write(f"  {players:>10}  {label}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute Stats tab metrics over archived game history.")
+    parser.add_argument("paths", nargs="+", help="history databases, archive directories, or directories of them")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--window", type=int, default=RECENT_WINDOW, help="learning curve moving-average window")
+    parser.add_argument("--format", choices=("table", "json"), default="table")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.paths, args.workers).report(args.window)
+    if args.format == "json":
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        print_tables(report)
+
+
+if __name__ == "__main__":
+    main()
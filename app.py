@@ -1,9 +1,29 @@
 import streamlit as st
-import random
 import time
 from datetime import datetime
-import pandas as pd
-import altair as alt
+from uuid import uuid4
+
+from achievements import AchievementEngine
+from charts import (
+    attempts_histogram_spec, chart_cache, daily_attempts_spec, difficulty_boxplot_spec,
+    guess_progression_spec, learning_curve_spec, score_progression_spec
+)
+from daily import DailyBoard
+from engine import (
+    BIG_RANGE_DEFAULT_MAX, CORRECT, DIFFICULTIES, MAX_HINTS, RANGE_LIMITS, TOO_LOW,
+    calculate_big_range_score, calculate_score, difficulty_settings,
+    format_hint, new_seed, parse_number, range_error, seeded_game
+)
+from guess_log import GuessLog
+from hints import DEFAULT_HINT_MODE, HINT_MODES, next_provider
+from history_store import HistoryStore
+from leaderboard import Leaderboard, player_name, range_bucket, range_bucket_label
+from profiling import RerunProfile, profiler, profiling_enabled
+from race_server import RaceError, RaceServer
+from session_store import SessionManager
+from solver import CandidateSet
+from verify import LiveVerifier
+from styles import STYLE_TAG
 
 # Page configuration
 st.set_page_config(
@@ -13,173 +33,154 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for a pure white background with appropriate text colors
-st.markdown("""
-<style>
-    /* Global white background */
-    .stApp, .main, .block-container, .css-1d391kg, .stSidebar, .css-1wrcr25, .css-18e3th9, .css-1kyxreq {
-        background-color: white !important;
-    }
-    
-    /* Override all Streamlit containers to have white backgrounds */
-    div[data-testid="stVerticalBlock"], div[data-testid="stHorizontalBlock"], 
-    div[data-testid="stExpander"], div[data-testid="stMetric"], 
-    div[data-testid="stForm"], div[data-testid="stSelectbox"],
-    div[data-testid="stNumberInput"], div[data-testid="stButton"],
-    div[data-testid="stProgress"], div[data-testid="stMarkdown"] {
-        background-color: white !important;
-    }
-    
-    /* Text styling */
-    .main-header {
-        font-size: 2.5rem;
-        color: #1E88E5;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.5rem;
-        color: #26A69A;
-        margin-bottom: 1rem;
-    }
-    .success-text {
-        color: #4CAF50;
-        font-weight: bold;
-    }
-    .warning-text {
-        color: #FF9800;
-        font-weight: bold;
-    }
-    .danger-text {
-        color: #F44336;
-        font-weight: bold;
-    }
-    .info-text {
-        color: #2196F3;
-        font-weight: bold;
-    }
-    
-    /* Container styling with white background */
-    .stat-container {
-        background-color: white;
-        border: 1px solid #e0e0e0;
-        border-radius: 10px;
-        padding: 10px;
-        margin: 10px 0;
-    }
-    .emoji-large {
-        font-size: 2rem;
-    }
-    .footer {
-        text-align: center;
-        margin-top: 3rem;
-        color: #9E9E9E;
-        font-size: 0.8rem;
-    }
-    .help-box {
-        background-color: white;
-        border-left: 5px solid #2196F3;
-        padding: 10px 15px;
-        border-radius: 5px;
-        margin: 10px 0;
-    }
-    .tip-box {
-        background-color: white;
-        border-left: 5px solid #4CAF50;
-        padding: 10px 15px;
-        border-radius: 5px;
-        margin: 10px 0;
-    }
-    
-    /* Override Streamlit's default styles */
-    .stButton>button {
-        background-color: white;
-        border: 1px solid #e0e0e0;
-        border-radius: 8px;
-    }
-    .stProgress>div>div {
-        background-color: #4CAF50;
-    }
-    
-    /* Override expander styling */
-    .streamlit-expanderHeader {
-        background-color: white !important;
-        color: #333333 !important;
-    }
-    .streamlit-expanderContent {
-        background-color: white !important;
-    }
-    
-    /* Override sidebar */
-    section[data-testid="stSidebar"] {
-        background-color: white !important;
-    }
-    
-    /* Override select slider */
-    div[data-testid="stSelectSlider"] {
-        background-color: white !important;
-    }
-    
-    /* Override info, error, success boxes but keep their border colors */
-    div.stAlert {
-        background-color: white !important;
-    }
-    
-    /* Make sure charts have white backgrounds */
-    .vega-embed {
-        background-color: white !important;
-    }
-    
-    /* Override any remaining elements */
-    * {
-        background-color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Opt-in profiling (NUMBER_MASTER_PROFILE=1 or ?profile=1). A rerun cut short by
+# st.rerun(), st.stop() or an error is recorded when the session's next rerun starts.
+profile = profiler.start(profiling_enabled(st.query_params), st.session_state)
 
-# Initialize session state variables
-if 'game_active' not in st.session_state:
-    st.session_state.game_active = False
-if 'target_number' not in st.session_state:
-    st.session_state.target_number = None
-if 'attempts' not in st.session_state:
-    st.session_state.attempts = 0
-if 'max_attempts' not in st.session_state:
-    st.session_state.max_attempts = float('inf')
-if 'min_range' not in st.session_state:
-    st.session_state.min_range = 1
-if 'max_range' not in st.session_state:
-    st.session_state.max_range = 100
-if 'game_history' not in st.session_state:
-    st.session_state.game_history = []
-if 'high_score' not in st.session_state:
-    st.session_state.high_score = float('inf')
-if 'start_time' not in st.session_state:
-    st.session_state.start_time = None
-if 'hints_used' not in st.session_state:
-    st.session_state.hints_used = 0
-if 'hint_penalty' not in st.session_state:
-    st.session_state.hint_penalty = 2
-if 'game_won' not in st.session_state:
-    st.session_state.game_won = False
-if 'guesses' not in st.session_state:
-    st.session_state.guesses = []
-if 'current_tab' not in st.session_state:
-    st.session_state.current_tab = "Game"
-if 'first_time_user' not in st.session_state:
-    st.session_state.first_time_user = True
+# Page styling (minified once per process in styles.py)
+st.markdown(STYLE_TAG, unsafe_allow_html=True)
+profile.mark("css")
+
+# Initialize session state variables (once, on the session's first run)
+if 'session_initialized' not in st.session_state:
+    for key, value in {
+        'game_active': False,
+        'target_number': None,
+        'game_seed': None,
+        'game_rng': None,
+        'attempts': 0,
+        'max_attempts': float('inf'),
+        'min_range': 1,
+        'max_range': 100,
+        'big_range': False,
+        'difficulty': "Medium 😐",
+        # Sessions opened without ?player= each get their own id
+        'player_id': st.query_params.get("player") or uuid4().hex,
+        'high_score': float('inf'),
+        'start_time': None,
+        'hints_used': 0,
+        'hint_cost': 0,
+        'hint_facts': [],
+        'hint_mode': DEFAULT_HINT_MODE,
+        'selected_hint_mode': DEFAULT_HINT_MODE,
+        'hint_penalty': 2,
+        'game_won': False,
+        'guesses': [],
+        'current_tab': "Game",
+        'first_time_user': True,
+        'race_room': None,
+        'race_name': None,
+        'daily_challenge': None,
+    }.items():
+        st.session_state.setdefault(key, value)
+    # Keep the id in the URL, so reloading or bookmarking the page finds the same history
+    st.query_params["player"] = st.session_state.player_id
+    st.session_state.session_initialized = True
+
+# Shared, persistent game history (one SQLite database for all sessions)
+@st.cache_resource
+def get_history_store():
+    return HistoryStore()
+
+history_store = get_history_store()
 
-# Function to start a new game
-def start_new_game():
-    st.session_state.target_number = random.randint(
-        st.session_state.min_range, st.session_state.max_range
+# Shared global leaderboard (same database, indexed for top-K and rank queries)
+@st.cache_resource
+def get_leaderboard():
+    return Leaderboard()
+
+leaderboard = get_leaderboard()
+
+# Shared daily challenge results (same database), with each day's statistics kept in memory
+@st.cache_resource
+def get_daily_board():
+    return DailyBoard()
+
+daily_board = get_daily_board()
+
+# Shared achievement engine (progress and unlocks saved in the same database)
+@st.cache_resource
+def get_achievement_engine():
+    return AchievementEngine()
+
+achievement_engine = get_achievement_engine()
+
+# Shared race server, running its event loop on a background thread
+@st.cache_resource
+def get_race_server():
+    return RaceServer().start_background()
+
+# Per-session running statistics, capped in memory and evicted when idle
+@st.cache_resource
+def get_session_manager():
+    return SessionManager(history_store)
+
+session_manager = get_session_manager()
+
+# Shared score verifier, so each player's win-rate test sees all their games
+@st.cache_resource
+def get_verifier():
+    return LiveVerifier(history_store)
+
+verifier = get_verifier()
+
+if 'history_session' not in st.session_state:
+    st.session_state.history_session = session_manager.open(st.session_state.player_id)
+    # Grant achievements for history saved before the engine tracked this player
+    if (session_manager.stats(st.session_state.history_session).games
+            and not achievement_engine.has_progress(st.session_state.player_id)):
+        achievement_engine.award_history(
+            (st.session_state.player_id, record)
+            for record in history_store.iter_records(st.session_state.player_id)
+        )
+session_manager.touch(st.session_state.history_session)
+profile.mark("session_state")
+
+# Function to check and save a finished game; returns its verification flags
+def record_game(record):
+    # Checked first, as the verifier reads the player's saved games
+    flags = verifier.check(st.session_state.player_id, record)
+    game_id = history_store.append(record, st.session_state.player_id)
+    session_manager.record(st.session_state.history_session, record)
+    for rule in achievement_engine.record_game(st.session_state.player_id, record, game_id):
+        st.toast(f"Achievement unlocked! {rule.label}", icon="🏆")
+    return flags
+
+# Function to start a new game, or a daily challenge. The range, difficulty
+# and mode are fixed here for the rest of the game, so the saved record
+# matches what was played.
+def start_new_game(min_range, max_range, difficulty, big_range=False, challenge=None):
+    st.session_state.daily_challenge = challenge
+    st.session_state.min_range = min_range
+    st.session_state.max_range = max_range
+    st.session_state.difficulty = difficulty
+    st.session_state.big_range = big_range
+    st.session_state.max_attempts, st.session_state.hint_penalty = difficulty_settings(
+        difficulty, min_range, max_range, big_range
+    )
+    if challenge is None:
+        # Each game gets its own seeded RNG, saved with the game so it can be replayed
+        st.session_state.game_seed = new_seed()
+        hint_mode = st.session_state.selected_hint_mode
+    else:
+        # Everyone gets the same target and hints for the day
+        st.session_state.game_seed = challenge.seed
+        hint_mode = challenge.hint_mode
+    game, st.session_state.game_rng = seeded_game(
+        st.session_state.game_seed, min_range, max_range, difficulty, big_range, hint_mode
+    )
+    st.session_state.hint_mode = game.hint_mode
+    st.session_state.target_number = game.target
+    st.session_state.guesses = GuessLog(
+        st.session_state.target_number, st.session_state.min_range, st.session_state.max_range
     )
     st.session_state.attempts = 0
     st.session_state.game_active = True
     st.session_state.start_time = time.time()
     st.session_state.hints_used = 0
+    st.session_state.hint_cost = 0
+    st.session_state.hint_facts = []
     st.session_state.game_won = False
-    st.session_state.guesses = []
     st.session_state.current_tab = "Game"
 
 # Function to reset the game
@@ -189,50 +190,79 @@ def reset_game():
     st.session_state.attempts = 0
     st.session_state.start_time = None
     st.session_state.hints_used = 0
+    st.session_state.hint_cost = 0
+    st.session_state.hint_facts = []
     st.session_state.game_won = False
     st.session_state.guesses = []
+    st.session_state.daily_challenge = None
 
-# Function to calculate score
-def calculate_score(attempts, max_range, min_range, time_taken, hints_used, hint_penalty):
-    range_factor = (max_range - min_range) / 100
-    base_score = 1000 * range_factor
-    attempt_penalty = attempts * 50
-    time_penalty = time_taken * 5
-    hint_penalty_total = hints_used * hint_penalty * 25
-    
-    score = max(0, base_score - attempt_penalty - time_penalty - hint_penalty_total)
-    return int(score)
+# Function to tell whether a game is still being played
+def game_in_progress():
+    return (st.session_state.game_active and not st.session_state.game_won
+            and st.session_state.attempts < st.session_state.max_attempts)
+
+# Function to count a finished daily challenge; returns the line shown to the player
+def submit_daily(record, flags):
+    challenge = st.session_state.daily_challenge
+    if flags:
+        return f"📅 Not counted in the daily challenge: {', '.join(flags)}"
+    standing = daily_board.submit(
+        st.session_state.player_id,
+        challenge.day,
+        record['score'],
+        record['attempts'],
+        record['score'] > 0,
+        record['date']
+    )
+    line = f"📅 Daily Challenge {challenge.day}: you beat {standing['beaten']:.0%} of {standing['players']} players"
+    if not standing['counted']:
+        line += " (only your first game of the day counts)"
+    return line
 
 # Function to provide a hint
 def get_hint():
-    if st.session_state.hints_used < 3:
+    provider = None
+    if st.session_state.hints_used < MAX_HINTS:
+        provider = next_provider(
+            st.session_state.hint_mode,
+            tuple(st.session_state.hint_facts),
+            st.session_state.min_range,
+            st.session_state.max_range
+        )
+    if provider is not None:
         st.session_state.hints_used += 1
-        target = st.session_state.target_number
-        if st.session_state.hints_used == 1:
-            # First hint: Even or Odd
-            return f"Hint #{st.session_state.hints_used}: The number is {'even 🔢' if target % 2 == 0 else 'odd 🔢'}."
-        elif st.session_state.hints_used == 2:
-            # Second hint: Divisibility
-            divisors = [3, 5, 7]
-            for div in divisors:
-                if target % div == 0:
-                    return f"Hint #{st.session_state.hints_used}: The number is divisible by {div} ✖️."
-            return f"Hint #{st.session_state.hints_used}: The number is not divisible by 3, 5, or 7 ❌."
-        elif st.session_state.hints_used == 3:
-            # Third hint: Closer range
-            range_size = (st.session_state.max_range - st.session_state.min_range) // 4
-            lower = target - random.randint(1, range_size)
-            upper = target + random.randint(1, range_size)
-            lower = max(lower, st.session_state.min_range)
-            upper = min(upper, st.session_state.max_range)
-            return f"Hint #{st.session_state.hints_used}: The number is between {lower} and {upper} 🔍."
+        st.session_state.hint_cost += provider.cost
+        fact = provider.fact(
+            st.session_state.target_number,
+            st.session_state.min_range,
+            st.session_state.max_range,
+            st.session_state.game_rng
+        )
+        st.session_state.hint_facts.append(fact)
+        return format_hint(st.session_state.hints_used, fact)
     else:
         return "You've used all your hints! 🚫"
 
+# History tab paging
+HISTORY_PAGE_SIZE = 10
+HISTORY_SORT_ORDERS = {
+    "Most Recent": 'recent',
+    "Highest Score": 'score',
+    "Fewest Attempts": 'attempts',
+}
+
 # Function to change tab
 def change_tab(tab_name):
     st.session_state.current_tab = tab_name
 
+# Function to get a chart spec, cached per player and history length. The
+# chart's data is only read from the stats, by data_fn, on a cache miss.
+def history_chart(name, spec_fn, stats, data_fn, *args):
+    return chart_cache.get(
+        (name, st.session_state.player_id, stats.games),
+        lambda: spec_fn(data_fn(), *args)
+    )
+
 # Main app header
 st.markdown("<h1 class='main-header'>Number Master Pro 🎮</h1>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center;'>The ultimate number guessing challenge!</p>", unsafe_allow_html=True)
@@ -241,48 +271,72 @@ st.markdown("<p style='text-align: center;'>The ultimate number guessing challen
 with st.sidebar:
     st.markdown("<h2 class='sub-header'>Game Settings ⚙️</h2>", unsafe_allow_html=True)
     
+    # Settings for the next game. They are locked while a game is in
+    # progress, which keeps the range and difficulty it started with.
+    settings_locked = game_in_progress()
+
     # Number range settings
     st.markdown("### Set Your Number Range 📏")
-    min_range = st.number_input("Minimum Value", value=1, min_value=1, max_value=9999)
-    max_range = st.number_input("Maximum Value", value=100, min_value=2, max_value=10000)
+    big_range = st.checkbox(
+        "Big Range Mode 🌌",
+        help="Play with ranges up to 2^63 and beyond. Attempt limits follow log2 of the range size.",
+        disabled=settings_locked
+    )
+    if big_range:
+        # Text inputs, since number inputs cannot hold integers this large
+        min_range = parse_number(st.text_input("Minimum Value", value="1", disabled=settings_locked))
+        max_range = parse_number(st.text_input(
+            "Maximum Value", value=str(BIG_RANGE_DEFAULT_MAX), disabled=settings_locked
+        ))
+    else:
+        min_range = st.number_input("Minimum Value", value=1, min_value=RANGE_LIMITS[0],
+                                    max_value=RANGE_LIMITS[1] - 1, disabled=settings_locked)
+        max_range = st.number_input("Maximum Value", value=100, min_value=RANGE_LIMITS[0] + 1,
+                                    max_value=RANGE_LIMITS[1], disabled=settings_locked)
     
-    if min_range >= max_range:
-        st.error("Minimum value must be less than maximum value!")
+    settings_valid = False
+    if min_range is None or max_range is None:
+        st.error("Please enter whole numbers, e.g. 1000000 or 2^63.")
+    elif range_error(min_range, max_range, big_range):
+        st.error(range_error(min_range, max_range, big_range))
     else:
-        st.session_state.min_range = min_range
-        st.session_state.max_range = max_range
+        settings_valid = True
     
     # Difficulty settings
     st.markdown("### Select Difficulty 🔥")
     difficulty = st.select_slider(
         "Difficulty Level",
-        options=["Easy 😊", "Medium 😐", "Hard 😓", "Expert 🥵", "Unlimited ♾️"]
+        options=list(DIFFICULTIES),
+        disabled=settings_locked
     )
     
-    # Set max attempts based on difficulty
-    range_size = max_range - min_range + 1
-    if difficulty == "Easy 😊":
-        st.session_state.max_attempts = int(range_size * 0.3)
-        st.session_state.hint_penalty = 1
-    elif difficulty == "Medium 😐":
-        st.session_state.max_attempts = int(range_size * 0.2)
-        st.session_state.hint_penalty = 2
-    elif difficulty == "Hard 😓":
-        st.session_state.max_attempts = int(range_size * 0.1)
-        st.session_state.hint_penalty = 3
-    elif difficulty == "Expert 🥵":
-        st.session_state.max_attempts = int(range_size * 0.05)
-        st.session_state.hint_penalty = 4
-    else:  # Unlimited
-        st.session_state.max_attempts = float('inf')
-        st.session_state.hint_penalty = 2
-    
-    if difficulty != "Unlimited ♾️":
-        st.info(f"You'll have {st.session_state.max_attempts} attempts to guess the number.")
+    # Hint mode, applied from the next new game
+    st.session_state.selected_hint_mode = st.selectbox(
+        "Hint Mode 💡",
+        list(HINT_MODES),
+        help="classic: parity, then divisibility, then a closer range. "
+             "adaptive: always the most informative hint left, including remainders, digit sums and binary digits."
+    )
+    
+    # Max attempts for these settings
+    if settings_valid and difficulty != "Unlimited ♾️":
+        max_attempts, _ = difficulty_settings(difficulty, min_range, max_range, big_range)
+        st.info(f"You'll have {max_attempts} attempts to guess the number.")
+    if settings_locked:
+        st.caption("Settings are locked until this game ends or is reset.")
     
     # Start game button
-    if st.button("Start New Game 🎮", use_container_width=True):
-        start_new_game()
+    if st.button("Start New Game 🎮", use_container_width=True, disabled=not settings_valid):
+        start_new_game(min_range, max_range, difficulty, big_range)
+    
+    # Daily challenge button
+    if st.button("Daily Challenge 📅", use_container_width=True):
+        challenge = daily_board.challenge()
+        # One daily game a day: an abandoned one still counts as played
+        if daily_board.start(st.session_state.player_id, challenge.day):
+            start_new_game(challenge.min_range, challenge.max_range, challenge.difficulty, challenge=challenge)
+        else:
+            st.warning("You've already played today's challenge. Come back tomorrow! 📅")
     
     # Reset game button
     if st.button("Reset Game 🔄", use_container_width=True):
@@ -306,6 +360,14 @@ with st.sidebar:
         if st.button("Stats 📈", use_container_width=True):
             change_tab("Stats")
     
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Race Mode 🏁", use_container_width=True):
+            change_tab("Race")
+    with col2:
+        if st.button("Leaderboard 🏅", use_container_width=True):
+            change_tab("Leaderboard")
+    
     # High score
     if st.session_state.high_score != float('inf'):
         st.markdown("### High Score 🏆")
@@ -314,8 +376,10 @@ with st.sidebar:
             <span class='emoji-large'>🏆</span> {st.session_state.high_score} points
         </div>
         """, unsafe_allow_html=True)
+profile.mark("sidebar")
 
 # Main content area with tabs
+profile.tab = st.session_state.current_tab
 if st.session_state.current_tab == "Game":
     # Game tab content
     if not st.session_state.game_active:
@@ -345,39 +409,43 @@ if st.session_state.current_tab == "Game":
         with col1:
             st.markdown(f"<h2 class='sub-header'>Guess the Number! 🤔</h2>", unsafe_allow_html=True)
             st.markdown(f"I'm thinking of a number between **{st.session_state.min_range}** and **{st.session_state.max_range}**.")
+            challenge = st.session_state.daily_challenge
+            if challenge is not None:
+                st.markdown(f"📅 **Daily Challenge** for {challenge.day} ({challenge.difficulty}): everyone gets this number today.")
             
             # User input for guess
-            guess = st.number_input(
-                "Enter your guess:",
-                min_value=st.session_state.min_range,
-                max_value=st.session_state.max_range,
-                step=1,
-                key="guess_input"
-            )
+            if st.session_state.big_range:
+                guess = parse_number(st.text_input("Enter your guess:", key="guess_text"))
+            else:
+                guess = st.number_input(
+                    "Enter your guess:",
+                    min_value=st.session_state.min_range,
+                    max_value=st.session_state.max_range,
+                    step=1,
+                    key="guess_input"
+                )
             
             # Submit guess button
             if st.button("Submit Guess 🚀", use_container_width=True):
-                if not st.session_state.game_won:
+                if guess is None or not st.session_state.min_range <= guess <= st.session_state.max_range:
+                    st.error(f"Please enter a whole number between {st.session_state.min_range} and {st.session_state.max_range}.")
+                elif game_in_progress():
                     st.session_state.attempts += 1
                     
                     # Record the guess
-                    st.session_state.guesses.append({
-                        'attempt': st.session_state.attempts,
-                        'guess': guess,
-                        'target': st.session_state.target_number,
-                        'result': 'correct' if guess == st.session_state.target_number else 'too low' if guess < st.session_state.target_number else 'too high'
-                    })
+                    result = st.session_state.guesses.append(guess)
                     
-                    if guess == st.session_state.target_number:
+                    if result == CORRECT:
                         # Player wins
                         st.session_state.game_won = True
                         time_taken = time.time() - st.session_state.start_time
-                        score = calculate_score(
+                        score_fn = calculate_big_range_score if st.session_state.big_range else calculate_score
+                        score = score_fn(
                             st.session_state.attempts,
                             st.session_state.max_range,
                             st.session_state.min_range,
                             time_taken,
-                            st.session_state.hints_used,
+                            st.session_state.hint_cost,
                             st.session_state.hint_penalty
                         )
                         
@@ -386,18 +454,43 @@ if st.session_state.current_tab == "Game":
                             st.session_state.high_score = score
                         
                         # Add to game history
-                        st.session_state.game_history.append({
+                        game_record = {
                             'min_range': st.session_state.min_range,
                             'max_range': st.session_state.max_range,
                             'attempts': st.session_state.attempts,
                             'score': score,
                             'time_taken': time_taken,
-                            'difficulty': difficulty,
+                            'difficulty': st.session_state.difficulty,
                             'target': st.session_state.target_number,
                             'hints_used': st.session_state.hints_used,
                             'date': datetime.now().strftime("%Y-%m-%d %H:%M"),
-                            'guesses': st.session_state.guesses.copy()
-                        })
+                            'guesses': st.session_state.guesses,
+                            'seed': st.session_state.game_seed,
+                            'big_range': st.session_state.big_range,
+                            'hint_mode': st.session_state.hint_mode,
+                            'daily': getattr(st.session_state.daily_challenge, 'day', None)
+                        }
+                        flags = record_game(game_record)
+                        
+                        # Submit to the global leaderboard, if the game passes verification
+                        if flags:
+                            rank = None
+                        else:
+                            rank = leaderboard.submit(
+                                st.session_state.player_id,
+                                score,
+                                st.session_state.difficulty,
+                                st.session_state.min_range,
+                                st.session_state.max_range,
+                                big_range=st.session_state.big_range
+                            )
+                        bucket = range_bucket(
+                            st.session_state.min_range, st.session_state.max_range, st.session_state.big_range
+                        )
+                        if rank:
+                            rank_line = f"🏅 Leaderboard Rank: #{rank} of {leaderboard.count(st.session_state.difficulty, bucket)} ({st.session_state.difficulty}, ranges {range_bucket_label(bucket)})"
+                        else:
+                            rank_line = f"🚫 Not ranked: {', '.join(flags)}"
                         
                         st.balloons()
                         st.success(f"🎉 CONGRATULATIONS! 🎉 You guessed the number in {st.session_state.attempts} attempts!")
@@ -409,10 +502,13 @@ if st.session_state.current_tab == "Game":
                             <p>⏱️ Time: {time_taken:.2f} seconds</p>
                             <p>💡 Hints Used: {st.session_state.hints_used}</p>
                             <p>🏆 Score: {score} points</p>
+                            <p>{rank_line}</p>
                         </div>
                         """, unsafe_allow_html=True)
+                        if st.session_state.daily_challenge is not None:
+                            st.markdown(f"<p class='info-text'>{submit_daily(game_record, flags)}</p>", unsafe_allow_html=True)
                         
-                    elif guess < st.session_state.target_number:
+                    elif result == TOO_LOW:
                         st.markdown("<p class='info-text'>📈 Too low! Try a higher number.</p>", unsafe_allow_html=True)
                     else:
                         st.markdown("<p class='info-text'>📉 Too high! Try a lower number.</p>", unsafe_allow_html=True)
@@ -424,25 +520,43 @@ if st.session_state.current_tab == "Game":
                         
                         # Add to game history
                         time_taken = time.time() - st.session_state.start_time
-                        st.session_state.game_history.append({
+                        game_record = {
                             'min_range': st.session_state.min_range,
                             'max_range': st.session_state.max_range,
                             'attempts': st.session_state.attempts,
                             'score': 0,
                             'time_taken': time_taken,
-                            'difficulty': difficulty,
+                            'difficulty': st.session_state.difficulty,
                             'target': st.session_state.target_number,
                             'hints_used': st.session_state.hints_used,
                             'date': datetime.now().strftime("%Y-%m-%d %H:%M"),
-                            'guesses': st.session_state.guesses.copy()
-                        })
+                            'guesses': st.session_state.guesses,
+                            'seed': st.session_state.game_seed,
+                            'big_range': st.session_state.big_range,
+                            'hint_mode': st.session_state.hint_mode,
+                            'daily': getattr(st.session_state.daily_challenge, 'day', None)
+                        }
+                        flags = record_game(game_record)
+                        if st.session_state.daily_challenge is not None:
+                            st.markdown(f"<p class='info-text'>{submit_daily(game_record, flags)}</p>", unsafe_allow_html=True)
+                else:
+                    st.info("This game is over. Start a new game to keep playing.")
             
             # Hint button
-            if st.button("Get a Hint 💡", use_container_width=True) and not st.session_state.game_won:
+            if st.button("Get a Hint 💡", use_container_width=True) and game_in_progress():
                 hint = get_hint()
                 st.markdown(f"<p class='warning-text'>{hint}</p>", unsafe_allow_html=True)
                 st.markdown(f"<p class='danger-text'>Note: Using hints reduces your final score!</p>", unsafe_allow_html=True)
             
+            # Suggested guess from the solver, using the feedback and hints so far
+            if st.button("Suggest a Guess 🤖", use_container_width=True) and game_in_progress():
+                candidates = CandidateSet(st.session_state.min_range, st.session_state.max_range)
+                for value, result in zip(st.session_state.guesses.values, st.session_state.guesses.codes):
+                    candidates.apply_feedback(value, result)
+                for fact in st.session_state.hint_facts:
+                    candidates.apply_hint(fact)
+                st.markdown(f"<p class='info-text'>🤖 Try {candidates.best_guess()} ({candidates.count()} numbers still possible).</p>", unsafe_allow_html=True)
+            
             # Show guess history for current game
             if st.session_state.guesses:
                 st.markdown("<h3>Your Guesses This Game:</h3>", unsafe_allow_html=True)
@@ -471,7 +585,7 @@ if st.session_state.current_tab == "Game":
             <div class='stat-container'>
                 <p><strong>🔢 Attempts:</strong> {st.session_state.attempts}</p>
                 <p><strong>🎚️ Range:</strong> {st.session_state.min_range} - {st.session_state.max_range}</p>
-                <p><strong>💡 Hints Used:</strong> {st.session_state.hints_used}/3</p>
+                <p><strong>💡 Hints Used:</strong> {st.session_state.hints_used}/{MAX_HINTS}</p>
                 <p><strong>⏱️ Time:</strong> {time.time() - st.session_state.start_time:.1f}s</p>
             </div>
             """, unsafe_allow_html=True)
@@ -509,36 +623,35 @@ elif st.session_state.current_tab == "History":
     # History tab content
     st.markdown("<h2 class='sub-header'>Game History 📜</h2>", unsafe_allow_html=True)
     
-    if not st.session_state.game_history:
+    stats = session_manager.stats(st.session_state.history_session)
+    if stats.games == 0:
         st.info("You haven't played any games yet. Start a new game to build your history!")
     else:
-        # Convert game history to DataFrame for easier manipulation
-        history_df = pd.DataFrame(st.session_state.game_history)
-        
         # Add some filters
         col1, col2 = st.columns(2)
         with col1:
-            if 'difficulty' in history_df.columns:
-                difficulties = ['All'] + list(history_df['difficulty'].unique())
-                selected_difficulty = st.selectbox("Filter by Difficulty", difficulties)
+            difficulties = ['All'] + list(stats.by_difficulty)
+            selected_difficulty = st.selectbox("Filter by Difficulty", difficulties)
         with col2:
-            sort_by = st.selectbox("Sort by", ["Most Recent", "Highest Score", "Fewest Attempts"])
+            sort_by = st.selectbox("Sort by", list(HISTORY_SORT_ORDERS))
         
-        # Apply filters
-        filtered_df = history_df.copy()
-        if 'difficulty' in filtered_df.columns and selected_difficulty != 'All':
-            filtered_df = filtered_df[filtered_df['difficulty'] == selected_difficulty]
-        
-        # Apply sorting
-        if sort_by == "Highest Score":
-            filtered_df = filtered_df.sort_values(by='score', ascending=False)
-        elif sort_by == "Fewest Attempts":
-            filtered_df = filtered_df.sort_values(by='attempts')
-        else:  # Most Recent
-            filtered_df = filtered_df.iloc[::-1].reset_index(drop=True)
+        # Only the visible page of games is loaded from the store
+        difficulty_filter = None if selected_difficulty == 'All' else selected_difficulty
+        total = stats.games if difficulty_filter is None else stats.by_difficulty[difficulty_filter].games
+        pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
+        st.caption(f"Page {page} of {pages} ({total} games)")
+        offset = (page - 1) * HISTORY_PAGE_SIZE
+        page_games = history_store.records(
+            st.session_state.player_id,
+            offset=offset,
+            limit=HISTORY_PAGE_SIZE,
+            order=HISTORY_SORT_ORDERS[sort_by],
+            difficulty=difficulty_filter
+        )
         
         # Display history
-        for i, game in enumerate(filtered_df.to_dict('records')):
+        for i, game in enumerate(page_games, start=offset):
             with st.expander(f"Game {i+1}: {game['date']} - Score: {game['score']}"):
                 st.markdown(f"""
                 <div class='stat-container'>
@@ -555,35 +668,17 @@ elif st.session_state.current_tab == "History":
                 """, unsafe_allow_html=True)
                 
                 # Show guesses for this game if available
-                if 'guesses' in game and game['guesses']:
+                if game['guesses']:
                     st.markdown("<h4>Guess History:</h4>", unsafe_allow_html=True)
-                    guesses_df = pd.DataFrame(game['guesses'])
                     
-                    # Create a chart of guesses
-                    if len(guesses_df) > 1:
-                        chart = alt.Chart(guesses_df).mark_line(point=True).encode(
-                            x=alt.X('attempt:Q', title='Attempt Number'),
-                            y=alt.Y('guess:Q', title='Guess Value', scale=alt.Scale(domain=[game['min_range'], game['max_range']])),
-                            tooltip=['attempt', 'guess', 'result']
-                        ).properties(
-                            title='Guess Progression',
-                            width=500,
-                            height=300
-                        ).configure_view(
-                            fill="white"
-                        ).configure_axis(
-                            labelColor="#333333",
-                            titleColor="#333333"
-                        )
-                        
-                        # Add a horizontal line for the target
-                        target_line = alt.Chart(pd.DataFrame({'target': [game['target']]})).mark_rule(color='red').encode(
-                            y='target:Q'
-                        )
-                        
-                        st.altair_chart(chart + target_line)
+                    # The guess chart is only built when asked for
+                    if len(game['guesses']) > 1 and st.checkbox("Show guess chart 📈", key=f"guess_chart_{game['id']}"):
+                        st.vega_lite_chart(chart_cache.get(
+                            ('guesses', game['id']), guess_progression_spec, game
+                        ))
                     
-                    # Show guess list
+                    # Show guess list as a single block
+                    guess_lines = []
                     for g in game['guesses']:
                         if g['result'] == 'correct':
                             emoji = "✅"
@@ -592,45 +687,26 @@ elif st.session_state.current_tab == "History":
                         else:  # too high
                             emoji = "⬇️"
                         
-                        st.markdown(f"Attempt #{g['attempt']}: {g['guess']} {emoji}")
+                        guess_lines.append(f"Attempt #{g['attempt']}: {g['guess']} {emoji}")
+                    st.markdown("  \n".join(guess_lines))
         
         # Summary statistics
         st.markdown("<h3>Your Gaming Statistics</h3>", unsafe_allow_html=True)
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Games", len(history_df))
+            st.metric("Total Games", stats.games)
         with col2:
-            win_rate = (history_df['score'] > 0).mean() * 100
-            st.metric("Win Rate", f"{win_rate:.1f}%")
+            st.metric("Win Rate", f"{stats.win_rate:.1f}%")
         with col3:
-            avg_attempts = history_df['attempts'].mean()
-            st.metric("Avg. Attempts", f"{avg_attempts:.1f}")
+            st.metric("Avg. Attempts", f"{stats.avg_attempts:.1f}")
         
         # Visualizations
-        if len(history_df) >= 3:
+        if stats.games >= 3:
             st.markdown("<h3>Performance Over Time</h3>", unsafe_allow_html=True)
             
-            # Add game number for tracking
-            history_df['game_number'] = range(1, len(history_df) + 1)
-            
             # Score over time
-            score_chart = alt.Chart(history_df).mark_line(point=True).encode(
-                x=alt.X('game_number:Q', title='Game Number'),
-                y=alt.Y('score:Q', title='Score'),
-                tooltip=['date', 'score', 'attempts']
-            ).properties(
-                title='Score Progression',
-                width=700,
-                height=300
-            ).configure_view(
-                fill="white"
-            ).configure_axis(
-                labelColor="#333333",
-                titleColor="#333333"
-            )
-            
-            st.altair_chart(score_chart)
+            st.vega_lite_chart(history_chart('score_progression', score_progression_spec, stats, stats.chart_columns))
 
 elif st.session_state.current_tab == "How to Play":
     # How to Play tab content
@@ -716,6 +792,7 @@ elif st.session_state.current_tab == "How to Play":
             <li><strong>History:</strong> View detailed records of all your past games, including guess patterns and statistics</li>
             <li><strong>Stats:</strong> See your overall performance metrics and achievements</li>
             <li><strong>How to Play:</strong> This guide with rules and tips</li>
+            <li><strong>Race Mode:</strong> Create or join a room and race other players to the same number</li>
         </ul>
     </div>
     """, unsafe_allow_html=True)
@@ -744,151 +821,219 @@ elif st.session_state.current_tab == "Stats":
     # Stats tab content
     st.markdown("<h2 class='sub-header'>Your Gaming Statistics 📈</h2>", unsafe_allow_html=True)
 
-    if not st.session_state.game_history:
+    stats = session_manager.stats(st.session_state.history_session)
+    if stats.games == 0:
         st.info("You haven't played any games yet. Start playing to see your statistics!")
     else:
-        # Convert game history to DataFrame
-        history_df = pd.DataFrame(st.session_state.game_history)
-        
         # Overall stats
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Games", len(history_df))
+            st.metric("Total Games", stats.games)
         with col2:
-            wins = (history_df['score'] > 0).sum()
-            st.metric("Games Won", wins)
+            st.metric("Games Won", stats.wins)
         with col3:
-            win_rate = (wins / len(history_df)) * 100
-            st.metric("Win Rate", f"{win_rate:.1f}%")
+            st.metric("Win Rate", f"{stats.win_rate:.1f}%")
         with col4:
-            avg_score = history_df['score'].mean()
-            st.metric("Avg. Score", f"{avg_score:.1f}")
+            st.metric("Avg. Score", f"{stats.avg_score:.1f}")
         
         # More detailed stats
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("<h3>Attempt Statistics</h3>", unsafe_allow_html=True)
-            avg_attempts = history_df['attempts'].mean()
-            min_attempts = history_df['attempts'].min()
-            max_attempts = history_df['attempts'].max()
-            
             st.markdown(f"""
             <div class='stat-container'>
-                <p><strong>Average Attempts:</strong> {avg_attempts:.1f}</p>
-                <p><strong>Best Game:</strong> {min_attempts} attempts</p>
-                <p><strong>Most Challenging Game:</strong> {max_attempts} attempts</p>
+                <p><strong>Average Attempts:</strong> {stats.avg_attempts:.1f}</p>
+                <p><strong>Best Game:</strong> {stats.min_attempts} attempts</p>
+                <p><strong>Most Challenging Game:</strong> {stats.max_attempts} attempts</p>
             </div>
             """, unsafe_allow_html=True)
         
         with col2:
             st.markdown("<h3>Score Statistics</h3>", unsafe_allow_html=True)
-            high_score = history_df['score'].max()
-            recent_avg = history_df.iloc[-5:]['score'].mean() if len(history_df) >= 5 else history_df['score'].mean()
-            
             st.markdown(f"""
             <div class='stat-container'>
-                <p><strong>High Score:</strong> {high_score}</p>
-                <p><strong>Recent Average (last 5 games):</strong> {recent_avg:.1f}</p>
-                <p><strong>Total Points Earned:</strong> {history_df['score'].sum()}</p>
+                <p><strong>High Score:</strong> {stats.high_score}</p>
+                <p><strong>Recent Average (last 5 games):</strong> {stats.recent_avg_score:.1f}</p>
+                <p><strong>Total Points Earned:</strong> {stats.total_score}</p>
             </div>
             """, unsafe_allow_html=True)
         
         # Visualizations
-        if len(history_df) >= 3:
-            # Add game number for tracking
-            history_df['game_number'] = range(1, len(history_df) + 1)
-            
+        if stats.games >= 3:
             # Attempts distribution
             st.markdown("<h3>Attempts Distribution</h3>", unsafe_allow_html=True)
-            attempts_chart = alt.Chart(history_df).mark_bar().encode(
-                x=alt.X('attempts:Q', bin=True, title='Number of Attempts'),
-                y=alt.Y('count()', title='Frequency')
-            ).properties(
-                title='Distribution of Attempts per Game',
-                width=700,
-                height=300
-            ).configure_view(
-                fill="white"
-            ).configure_axis(
-                labelColor="#333333",
-                titleColor="#333333"
-            )
-            
-            st.altair_chart(attempts_chart)
+            st.vega_lite_chart(history_chart('attempts_histogram', attempts_histogram_spec, stats, stats.attempt_counts.copy))
             
             # Performance by difficulty
-            if 'difficulty' in history_df.columns:
-                st.markdown("<h3>Performance by Difficulty</h3>", unsafe_allow_html=True)
-                diff_chart = alt.Chart(history_df).mark_boxplot().encode(
-                    x=alt.X('difficulty:N', title='Difficulty Level'),
-                    y=alt.Y('score:Q', title='Score')
-                ).properties(
-                    title='Score Distribution by Difficulty',
-                    width=700,
-                    height=300
-                ).configure_view(
-                    fill="white"
-                ).configure_axis(
-                    labelColor="#333333",
-                    titleColor="#333333"
-                )
-                
-                st.altair_chart(diff_chart)
+            st.markdown("<h3>Performance by Difficulty</h3>", unsafe_allow_html=True)
+            st.vega_lite_chart(history_chart('difficulty_boxplot', difficulty_boxplot_spec, stats, stats.score_quartiles))
             
             # Learning curve
             st.markdown("<h3>Your Learning Curve</h3>", unsafe_allow_html=True)
             
-            # Calculate moving average
-            window_size = min(5, len(history_df))
-            history_df['moving_avg_attempts'] = history_df['attempts'].rolling(window=window_size).mean()
-            
-            learning_chart = alt.Chart(history_df).mark_line(point=True).encode(
-                x=alt.X('game_number:Q', title='Game Number'),
-                y=alt.Y('moving_avg_attempts:Q', title=f'{window_size}-Game Moving Average of Attempts')
-            ).properties(
-                title='Learning Curve (Lower is Better)',
-                width=700,
-                height=300
-            ).configure_view(
-                fill="white"
-            ).configure_axis(
-                labelColor="#333333",
-                titleColor="#333333"
-            )
+            window_size = stats.moving_avg_window
             
-            st.altair_chart(learning_chart)
+            st.vega_lite_chart(history_chart('learning_curve', learning_curve_spec, stats, stats.chart_columns, window_size))
             
             # Achievement section
             st.markdown("<h3>🏆 Achievements</h3>", unsafe_allow_html=True)
             
-            achievements = []
-            
-            # Check for achievements
-            if len(history_df) >= 10:
-                achievements.append("🎮 Dedicated Player: Played 10+ games")
+            unlocked = achievement_engine.unlocked(st.session_state.player_id)
+            if not unlocked:
+                st.markdown("<div class='stat-container success-text'>Keep playing to unlock achievements!</div>", unsafe_allow_html=True)
             
-            if wins >= 5:
-                achievements.append("🏅 Winner: Won 5+ games")
-            
-            if win_rate >= 70:
-                achievements.append("🌟 Master Guesser: 70%+ win rate")
-            
-            if min_attempts <= 3:
-                achievements.append("🔍 Sharp Eye: Guessed correctly in 3 or fewer attempts")
-            
-            if high_score >= 500:
-                achievements.append("💯 High Scorer: Scored 500+ points in a single game")
-            
-            if 'hints_used' in history_df.columns and (history_df['hints_used'] == 0).any():
-                achievements.append("🧠 Pure Skill: Won a game without using hints")
-            
-            if not achievements:
-                achievements.append("Keep playing to unlock achievements!")
-            
-            for achievement in achievements:
-                st.markdown(f"<div class='stat-container success-text'>{achievement}</div>", unsafe_allow_html=True)
+            for rule, unlocked_at in unlocked:
+                st.markdown(f"<div class='stat-container success-text'>{rule.label} <small>({unlocked_at})</small></div>", unsafe_allow_html=True)
+
+elif st.session_state.current_tab == "Race":
+    # Race tab content
+    st.markdown("<h2 class='sub-header'>Race Mode 🏁</h2>", unsafe_allow_html=True)
+    st.markdown("Everyone in a room guesses the same number. The first player to find it wins!")
+    
+    race = get_race_server()
+    
+    if st.session_state.race_room is None:
+        # Not the player id, which is the key to the player's history
+        race_name = st.text_input("Your Name", value=player_name(st.session_state.player_id))
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("<h3>Create a Room</h3>", unsafe_allow_html=True)
+            st.markdown(f"Uses your sidebar settings: **{min_range} - {max_range}**, **{difficulty}**.")
+            # Races have no big range mode, so rooms keep to the normal limits
+            room_error = range_error(min_range, max_range) if settings_valid else None
+            if room_error:
+                st.warning(room_error)
+            if st.button("Create Room 🏗️", use_container_width=True, disabled=not settings_valid or bool(room_error)):
+                try:
+                    room_id = race.call('create_room', min_range, max_range, difficulty)
+                    race.call('join', room_id, race_name)
+                    st.session_state.race_room = room_id
+                    st.session_state.race_name = race_name
+                    st.rerun()
+                except RaceError as e:
+                    st.error(str(e))
+        with col2:
+            st.markdown("<h3>Join a Room</h3>", unsafe_allow_html=True)
+            room_code = st.text_input("Room Code").strip().upper()
+            if st.button("Join Room 🚪", use_container_width=True):
+                try:
+                    race.call('join', room_code, race_name)
+                    st.session_state.race_room = room_code
+                    st.session_state.race_name = race_name
+                    st.rerun()
+                except RaceError as e:
+                    st.error(str(e))
+    else:
+        try:
+            room = race.call('standings', st.session_state.race_room)
+        except RaceError:
+            # The room expired
+            st.session_state.race_room = None
+            st.rerun()
+        
+        st.markdown(f"""
+        <div class='stat-container'>
+            <p><strong>🏷️ Room Code:</strong> {room['room']} (share it with your friends!)</p>
+            <p><strong>🎚️ Range:</strong> {room['min_range']} - {room['max_range']}</p>
+            <p><strong>🔥 Difficulty:</strong> {room['difficulty']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if room['winner'] is None:
+            race_guess = st.number_input(
+                "Enter your guess:",
+                min_value=room['min_range'],
+                max_value=room['max_range'],
+                step=1,
+                key="race_guess_input"
+            )
+            if st.button("Submit Race Guess 🚀", use_container_width=True):
+                try:
+                    if race_guess is None:
+                        raise RaceError("Please enter a whole number.")
+                    event = race.call('guess', room['room'], st.session_state.race_name, race_guess)
+                    if event['result'] == 'correct':
+                        st.balloons()
+                        st.success(f"🎉 You won the race in {event['attempt']} attempts!")
+                    elif event['result'] == 'too low':
+                        st.markdown("<p class='info-text'>📈 Too low! Try a higher number.</p>", unsafe_allow_html=True)
+                    else:
+                        st.markdown("<p class='info-text'>📉 Too high! Try a lower number.</p>", unsafe_allow_html=True)
+                    room = race.call('standings', room['room'])
+                except RaceError as e:
+                    st.error(str(e))
+        
+        if room['winner'] is not None:
+            st.markdown(f"<div class='stat-container success-text'>🏆 {room['winner']} won the race!</div>", unsafe_allow_html=True)
+        
+        # Standings
+        st.markdown("<h3>Players</h3>", unsafe_allow_html=True)
+        for p in sorted(room['players'], key=lambda p: (not p['won'], p['attempts'])):
+            you = " (you)" if p['name'] == st.session_state.race_name else ""
+            st.markdown(f"{'🏆' if p['won'] else '🏃'} **{p['name']}**{you}: {p['attempts']} attempts")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Refresh 🔄", use_container_width=True):
+                st.rerun()
+        with col2:
+            if st.button("Leave Room 🚪", use_container_width=True):
+                st.session_state.race_room = None
+                st.rerun()
+
+elif st.session_state.current_tab == "Leaderboard":
+    # Leaderboard tab content
+    st.markdown("<h2 class='sub-header'>Global Leaderboard 🏅</h2>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        board_difficulty = st.selectbox("Difficulty", ["All"] + list(DIFFICULTIES))
+    with col2:
+        board_bucket = st.selectbox(
+            "Range Size",
+            ["All"] + leaderboard.buckets(),
+            format_func=lambda b: b if b == "All" else range_bucket_label(b)
+        )
+    board_difficulty = None if board_difficulty == "All" else board_difficulty
+    board_bucket = None if board_bucket == "All" else board_bucket
+    
+    entries = leaderboard.top(10, board_difficulty, board_bucket)
+    if not entries:
+        st.info("No scores yet. Win a game to claim the top spot!")
+    else:
+        st.markdown(f"Top {len(entries)} of {leaderboard.count(board_difficulty, board_bucket)} winning games")
+        medals = {1: "🥇", 2: "🥈", 3: "🥉"}
+        st.markdown("\n".join(
+            f"- {medals.get(i, f'{i}.')} **{e['player']}**: {e['score']} points "
+            f"({e['difficulty']}, ranges {range_bucket_label(e['range_bucket'])}, {e['date']})"
+            for i, e in enumerate(entries, start=1)
+        ))
+    st.caption(f"Your games are listed as {player_name(st.session_state.player_id)}.")
+    
+    # Today's daily challenge, from the running statistics rather than the stored results
+    challenge = daily_board.challenge()
+    summary = daily_board.summary(challenge.day)
+    st.markdown(f"### 📅 Daily Challenge {challenge.day}")
+    st.markdown(f"{challenge.min_range} to {challenge.max_range}, {challenge.difficulty}")
+    if not summary['players']:
+        st.info("Nobody has finished today's challenge yet. Click \"Daily Challenge\" in the sidebar to be the first!")
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Players", summary['players'])
+        with col2:
+            st.metric("Win Rate", f"{summary['win_rate']:.1f}%")
+        with col3:
+            st.metric("Median Score", summary['score_percentiles'][50])
+        st.markdown("Scores: " + ", ".join(
+            f"{p}th percentile {value}" for p, value in summary['score_percentiles'].items()
+        ))
+        st.vega_lite_chart(chart_cache.get(
+            ('daily_attempts', challenge.day, summary['players']), daily_attempts_spec, summary['attempts']
+        ))
+profile.mark(f"tab:{profile.tab}")
 
 # Footer
 st.markdown("""
@@ -897,3 +1042,19 @@ st.markdown("""
 <p>© 2023 Number Master Games</p>
 </div>
 """, unsafe_allow_html=True)
+profile.mark("footer")
+profiler.finish(profile, st.session_state)
+
+# Profiler debug panel: this rerun's sections, plus averages over recent reruns
+if isinstance(profile, RerunProfile):
+    with st.sidebar.expander("⏱️ Profiler", expanded=True):
+        st.markdown(f"**This rerun:** {profile.total * 1000:.1f} ms, {profile.elements} elements")
+        if profiler.serve_error:
+            st.warning(profiler.serve_error)
+        averages = profiler.averages()
+        rows = ["| Section | This rerun | Average | Max |", "|---|---|---|---|"]
+        for section, seconds in profile.sections:
+            average, peak = averages.get(section, (seconds, seconds))
+            rows.append(f"| {section} | {seconds * 1000:.1f} ms | {average * 1000:.1f} ms | {peak * 1000:.1f} ms |")
+        st.markdown("\n".join(rows))
+        st.caption(f"{profiler.reruns} profiled reruns; each is appended to the JSONL profile log.")
@@ -0,0 +1,304 @@
+# Bulk export and import of game history for Number Master Pro.
+#
+# An archive is a directory holding two tables:
+#   games.<ext>    one row per game: the history record minus its guesses
+#   guesses.<ext>  one row per guess: game_id, attempt, guess, result
+# Both are written in game id order and are streamed in chunks in both
+# directions, so an archive never has to fit in memory. The formats are
+# Parquet and Arrow IPC (pyarrow, imported only when used) and CSV (standard
+# library only, the fallback when pyarrow is not installed).
+#
+# Integers beyond 64 bits (big range mode) cannot go in an int64 column. For
+# those, the int64 column is left empty and the exact value is written as
+# text to the matching *_big column.
+#
+#   python archive.py export history/ --format parquet
+#   python archive.py import history/ --db other.db
+import argparse
+import csv
+import os
+
+from guess_log import GuessLog
+from history_store import HistoryStore, INT64_MAX, INT64_MIN
+
+FORMATS = ('parquet', 'arrow', 'csv')
+CHUNK_SIZE = 50_000
+
+GAME_COLUMNS = (
+    'game_id', 'player', 'min_range', 'max_range', 'attempts', 'score', 'time_taken',
+    'difficulty', 'target', 'hints_used', 'date', 'seed', 'big_range',
+    'min_range_big', 'max_range_big', 'target_big', 'hint_mode', 'daily',
+)
+GUESS_COLUMNS = ('game_id', 'attempt', 'guess', 'result', 'guess_big')
+
+# Columns whose values may exceed int64, and where the overflow goes
+BIG_COLUMNS = {'min_range': 'min_range_big', 'max_range': 'max_range_big', 'target': 'target_big'}
+
+CSV_TYPES = {
+    'game_id': int, 'min_range': int, 'max_range': int, 'attempts': int, 'score': int,
+    'time_taken': float, 'target': int, 'hints_used': int, 'seed': int,
+    'big_range': lambda text: text == 'True',
+    'attempt': int, 'guess': int,
+}
+
+
+# Function to load pyarrow, with a hint towards the CSV fallback
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Parquet and Arrow archives need pyarrow (pip install pyarrow); "
+                          "use --format csv without it") from None
+    return pa
+
+
+def _schemas():
+    pa = _pyarrow()
+    games = pa.schema([
+        ('game_id', pa.int64()), ('player', pa.string()),
+        ('min_range', pa.int64()), ('max_range', pa.int64()),
+        ('attempts', pa.int64()), ('score', pa.int64()), ('time_taken', pa.float64()),
+        ('difficulty', pa.string()), ('target', pa.int64()), ('hints_used', pa.int64()),
+        ('date', pa.string()), ('seed', pa.int64()), ('big_range', pa.bool_()),
+        ('min_range_big', pa.string()), ('max_range_big', pa.string()), ('target_big', pa.string()),
+        ('hint_mode', pa.string()), ('daily', pa.string()),
+    ])
+    guesses = pa.schema([
+        ('game_id', pa.int64()), ('attempt', pa.int32()), ('guess', pa.int64()),
+        ('result', pa.string()), ('guess_big', pa.string()),
+    ])
+    return games, guesses
+
+
+# Function to split a value into (int64 column value, *_big column value)
+def _split_int(value):
+    if value is None or INT64_MIN <= value <= INT64_MAX:
+        return value, None
+    return None, str(value)
+
+
+def _join_int(value, big):
+    return int(big) if big not in (None, '') else value
+
+
+# Writers: each takes one chunk at a time as a dict of column lists
+
+class _CsvWriter:
+    def __init__(self, path, columns, schema=None):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+        self._columns = columns
+
+    def write(self, chunk):
+        self._writer.writerows(zip(*(chunk[c] for c in self._columns)))
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path, columns, schema):
+        import pyarrow.parquet as pq
+        self._schema = schema
+        self._writer = pq.ParquetWriter(path, schema)
+
+    def write(self, chunk):
+        pa = _pyarrow()
+        self._writer.write_table(pa.Table.from_pydict(chunk, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class _ArrowWriter:
+    def __init__(self, path, columns, schema):
+        pa = _pyarrow()
+        self._schema = schema
+        self._sink = pa.OSFile(path, 'wb')
+        self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def write(self, chunk):
+        pa = _pyarrow()
+        self._writer.write_batch(pa.RecordBatch.from_pydict(chunk, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+        self._sink.close()
+
+
+WRITERS = {'parquet': _ParquetWriter, 'arrow': _ArrowWriter, 'csv': _CsvWriter}
+
+
+# Readers: each yields rows as dicts, one chunk at a time
+
+def _read_csv(path, chunk_size):
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            for column, value in row.items():
+                if value == '':
+                    row[column] = None
+                elif column in CSV_TYPES:
+                    row[column] = CSV_TYPES[column](value)
+            yield row
+
+
+def _read_parquet(path, chunk_size):
+    import pyarrow.parquet as pq
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield from batch.to_pylist()
+
+
+def _read_arrow(path, chunk_size):
+    pa = _pyarrow()
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield from reader.get_batch(i).to_pylist()
+
+
+READERS = {'parquet': _read_parquet, 'arrow': _read_arrow, 'csv': _read_csv}
+
+
+def _paths(directory, fmt):
+    return os.path.join(directory, f"games.{fmt}"), os.path.join(directory, f"guesses.{fmt}")
+
+
+# Function to export history to an archive directory; returns the game count.
+# With player=None every player's games are exported.
+def export_history(store, directory, fmt='parquet', player=None, chunk_size=CHUNK_SIZE):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown archive format: {fmt}")
+    games_schema = guesses_schema = None
+    if fmt != 'csv':
+        games_schema, guesses_schema = _schemas()
+    os.makedirs(directory, exist_ok=True)
+    games_path, guesses_path = _paths(directory, fmt)
+    if player is None:
+        source = store.iter_games(chunk_size)
+    else:
+        source = ((player, record) for record in store.iter_records(player, chunk_size))
+
+    games_out = WRITERS[fmt](games_path, GAME_COLUMNS, games_schema)
+    guesses_out = WRITERS[fmt](guesses_path, GUESS_COLUMNS, guesses_schema)
+    count = 0
+    try:
+        games = {c: [] for c in GAME_COLUMNS}
+        guesses = {c: [] for c in GUESS_COLUMNS}
+        for player_id, record in source:
+            games['game_id'].append(record['id'])
+            games['player'].append(player_id)
+            for column in ('attempts', 'score', 'time_taken', 'difficulty', 'hints_used', 'date', 'seed',
+                           'hint_mode', 'daily'):
+                games[column].append(record.get(column))
+            games['big_range'].append(bool(record.get('big_range')))
+            for column, big_column in BIG_COLUMNS.items():
+                value, big = _split_int(record.get(column))
+                games[column].append(value)
+                games[big_column].append(big)
+            for row in record['guesses']:
+                value, big = _split_int(row['guess'])
+                guesses['game_id'].append(record['id'])
+                guesses['attempt'].append(row['attempt'])
+                guesses['guess'].append(value)
+                guesses['result'].append(row['result'])
+                guesses['guess_big'].append(big)
+            count += 1
+            if count % chunk_size == 0:
+                games_out.write(games)
+                guesses_out.write(guesses)
+                games = {c: [] for c in GAME_COLUMNS}
+                guesses = {c: [] for c in GUESS_COLUMNS}
+        if games['game_id'] or count == 0:
+            games_out.write(games)
+            guesses_out.write(guesses)
+    finally:
+        games_out.close()
+        guesses_out.close()
+    return count
+
+
+# Function to read an archive back as (player, record) pairs, streaming both
+# tables side by side; guesses are matched to games by game_id
+def iter_archive(directory, fmt=None, chunk_size=CHUNK_SIZE):
+    fmt = fmt or detect_format(directory)
+    games_path, guesses_path = _paths(directory, fmt)
+    guesses = READERS[fmt](guesses_path, chunk_size)
+    pending = next(guesses, None)
+    for row in READERS[fmt](games_path, chunk_size):
+        game_id = row['game_id']
+        values = []
+        # Skip guesses whose game is missing from the games table
+        while pending is not None and pending['game_id'] < game_id:
+            pending = next(guesses, None)
+        while pending is not None and pending['game_id'] == game_id:
+            values.append(_join_int(pending['guess'], pending['guess_big']))
+            pending = next(guesses, None)
+        min_range = _join_int(row['min_range'], row['min_range_big'])
+        max_range = _join_int(row['max_range'], row['max_range_big'])
+        target = _join_int(row['target'], row['target_big'])
+        record = {
+            'id': game_id,
+            'min_range': min_range,
+            'max_range': max_range,
+            'attempts': row['attempts'],
+            'score': row['score'],
+            'time_taken': row['time_taken'],
+            'difficulty': row['difficulty'],
+            'target': target,
+            'hints_used': row['hints_used'],
+            'date': row['date'],
+            'guesses': GuessLog.from_values(target, values, min_range, max_range),
+            'seed': row['seed'],
+            'big_range': row['big_range'],
+            # Missing from archives written before hint modes and daily challenges
+            'hint_mode': row.get('hint_mode'),
+            'daily': row.get('daily'),
+        }
+        yield row['player'], record
+
+
+# Function to import an archive into a store; returns the number of games added
+def import_history(store, directory, fmt=None, chunk_size=CHUNK_SIZE):
+    count = 0
+    batch = []
+    for item in iter_archive(directory, fmt, chunk_size):
+        batch.append(item)
+        if len(batch) >= chunk_size:
+            count += store.append_many(batch)
+            batch = []
+    if batch:
+        count += store.append_many(batch)
+    return count
+
+
+# Function to work out an archive's format from the files in it
+def detect_format(directory):
+    for fmt in FORMATS:
+        if all(os.path.exists(path) for path in _paths(directory, fmt)):
+            return fmt
+    raise FileNotFoundError(f"No games/guesses archive found in {directory}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or import Number Master Pro game history.")
+    parser.add_argument("action", choices=("export", "import"))
+    parser.add_argument("directory", help="archive directory")
+    parser.add_argument("--db", help="history database (default: NUMBER_MASTER_DB or number_master.db)")
+    parser.add_argument("--format", choices=sorted(FORMATS), help="archive format (default: parquet "
+                        "for export, detected for import)")
+    parser.add_argument("--player", help="export only this player's games")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    if args.action == "export":
+        count = export_history(store, args.directory, args.format or 'parquet', args.player, args.chunk_size)
+        print(f"Exported {count} games to {args.directory}")
+    else:
+        count = import_history(store, args.directory, args.format, args.chunk_size)
+        print(f"Imported {count} games from {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
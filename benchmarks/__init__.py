@@ -0,0 +1,13 @@
+# Benchmark suite for Number Master Pro; see benchmarks/run.py for usage.
+
+BENCHMARKS = []
+
+
+# Decorator to register a benchmark. The decorated function does any setup
+# and returns the callable to be timed, or yields it and cleans up once the
+# timing is done.
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
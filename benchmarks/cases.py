@@ -0,0 +1,219 @@
+# Benchmarks for the engine, scoring, hints, history analytics and a full
+# Streamlit rerun. Run them with python -m benchmarks.run.
+import os
+import random
+import shutil
+import tempfile
+
+from benchmarks import benchmark
+from daily import DailyStats
+from engine import (
+    DIFFICULTIES, RESULT_NAMES, GameState, binary_search, calculate_score,
+    hint_fact, play_many, seeded_game
+)
+from hints import next_provider
+from history_store import HistoryStore
+from stats import HistoryStats
+
+HISTORY_SIZES = (10, 1_000, 100_000)
+# The player whose history the Streamlit rerun benchmarks render
+RERUN_PLAYER = "bench"
+
+
+# Function to generate n finished game records, as the app writes them
+def make_records(n, seed=0):
+    rng = random.Random(seed)
+    difficulties = list(DIFFICULTIES)
+    records = []
+    for i in range(n):
+        difficulty = rng.choice(difficulties)
+        game_seed = rng.getrandbits(63)
+        game, _ = seeded_game(game_seed, 1, 100, difficulty)
+        guesses = []
+        while not game.finished and game.attempts < 100:
+            guess = rng.randint(game.low, game.high)
+            result = game.guess(guess)
+            guesses.append({'attempt': game.attempts, 'guess': guess,
+                            'target': game.target, 'result': RESULT_NAMES[result]})
+        time_taken = rng.uniform(5, 120)
+        records.append({
+            'min_range': 1,
+            'max_range': 100,
+            'attempts': game.attempts,
+            'score': game.score(time_taken),
+            'time_taken': time_taken,
+            'difficulty': difficulty,
+            'target': game.target,
+            'hints_used': game.hints_used,
+            'date': f"2024-01-{i % 28 + 1:02d} 12:00",
+            'guesses': guesses,
+            'seed': game_seed,
+            'big_range': False,
+        })
+    return records
+
+
+# Scoring and rules
+
+@benchmark("calculate_score")
+def bench_calculate_score():
+    return lambda: calculate_score(7, 100, 1, 42.5, 1, 2)
+
+
+@benchmark("calculate_scores[numpy, 100k games]")
+def bench_calculate_scores():
+    import numpy as np
+    from vectorized import calculate_scores
+    rng = np.random.default_rng(0)
+    n = 100_000
+    attempts = rng.integers(1, 30, n)
+    min_range = rng.integers(1, 1000, n)
+    max_range = min_range + rng.integers(1, 9000, n)
+    time_taken = rng.uniform(1, 300, n)
+    hints_used = rng.integers(0, 4, n)
+    hint_penalty = rng.integers(1, 5, n)
+    return lambda: calculate_scores(attempts, max_range, min_range, time_taken, hints_used, hint_penalty)
+
+
+@benchmark("get_hint[all three hints]")
+def bench_get_hint():
+    rng = random.Random(0)
+
+    def run():
+        for hint_number in (1, 2, 3):
+            hint_fact(hint_number, 4242, 1, 10_000, rng)
+    return run
+
+
+@benchmark("daily standing[100k players]")
+def bench_daily_standing():
+    # What each finished daily game costs: add the result, then look up how
+    # it stands. Neither should grow with the number of players.
+    rng = random.Random(0)
+    stats = DailyStats()
+    for _ in range(100_000):
+        stats.add(rng.randint(0, 10_000), rng.randint(1, 20), True)
+
+    def run():
+        score = rng.randint(0, 10_000)
+        stats.add(score, 7, True)
+        stats.beaten(score)
+    return run
+
+
+@benchmark("next_provider[adaptive, 1-2^63]")
+def bench_next_provider():
+    # The residue tables are cached after the first call, so this measures
+    # ranking alone; it shouldn't grow with the range
+    rng = random.Random(0)
+    target, max_range = rng.randint(1, 2 ** 63), 2 ** 63
+
+    def run():
+        facts = []
+        while (provider := next_provider('adaptive', facts, 1, max_range)) is not None:
+            facts.append(provider.fact(target, 1, max_range, rng))
+    return run
+
+
+@benchmark("guess evaluation[binary search game, 1-10000]")
+def bench_guess_path():
+    def run():
+        game = GameState(1, 10_000, 7777)
+        while not game.won:
+            game.guess((game.low + game.high) // 2)
+    return run
+
+
+@benchmark("play_many[binary search, 1000 games]")
+def bench_play_many():
+    return lambda: play_many(binary_search, 1000, seed=0)
+
+
+# History analytics, at several history sizes
+
+def _register_history_benchmarks(n):
+    @benchmark(f"history DataFrame[{n} games]")
+    def bench_dataframe():
+        import pandas as pd
+        records = make_records(n)
+        return lambda: pd.DataFrame(records)
+
+    @benchmark(f"HistoryStats.from_records[{n} games]")
+    def bench_stats_build():
+        records = make_records(n)
+        return lambda: HistoryStats.from_records(records)
+
+    @benchmark(f"HistoryStats.add[{n} games]")
+    def bench_stats_add():
+        records = make_records(n)
+        stats = HistoryStats.from_records(records)
+        record = records[-1]
+        return lambda: stats.add(record)
+
+    @benchmark(f"stats chart DataFrame[{n} games]")
+    def bench_chart_frame():
+        import pandas as pd
+        stats = HistoryStats.from_records(make_records(n))
+        return lambda: pd.DataFrame(stats.chart_columns())
+
+    @benchmark(f"HistoryStore page[{n} games]")
+    def bench_store_page():
+        store = HistoryStore(":memory:")
+        for record in make_records(n):
+            store.append(record)
+        return lambda: store.records(offset=0, limit=10, order='score')
+
+
+for _n in HISTORY_SIZES:
+    _register_history_benchmarks(_n)
+
+
+@benchmark("Verifier.run[10000 games]")
+def bench_verify():
+    from verify import Verifier
+    store = HistoryStore(":memory:")
+    for record in make_records(10_000):
+        store.append(record)
+    games = list(store.iter_games())
+    return lambda: sum(1 for _ in Verifier().run(games))
+
+
+# Full Streamlit reruns via AppTest, against a store seeded with history
+
+def _register_rerun_benchmark(tab, n):
+    @benchmark(f"streamlit rerun[{tab} tab, {n} games]")
+    def bench_rerun():
+        import streamlit as st
+        from streamlit.testing.v1 import AppTest
+
+        db_dir = tempfile.mkdtemp(prefix="number_master_bench_")
+        saved_db = os.environ.get("NUMBER_MASTER_DB")
+        try:
+            store = HistoryStore(os.path.join(db_dir, "history.db"))
+            for record in make_records(n):
+                store.append(record, RERUN_PLAYER)
+            store.close()
+            os.environ["NUMBER_MASTER_DB"] = store.path
+            st.cache_resource.clear()
+
+            app_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+            at = AppTest.from_file(app_path, default_timeout=60)
+            # Sessions without ?player= get a fresh id and would see no history
+            at.query_params["player"] = RERUN_PLAYER
+            at.session_state["current_tab"] = tab
+            at.run()
+            yield at.run
+        finally:
+            if saved_db is None:
+                os.environ.pop("NUMBER_MASTER_DB", None)
+            else:
+                os.environ["NUMBER_MASTER_DB"] = saved_db
+            # The cached stores still point into db_dir
+            st.cache_resource.clear()
+            shutil.rmtree(db_dir, ignore_errors=True)
+    return bench_rerun
+
+
+for _tab in ("Game", "History", "Stats"):
+    for _n in (10, 1_000):
+        _register_rerun_benchmark(_tab, _n)
@@ -0,0 +1,280 @@
+# Load test for the Streamlit app.
+#
+# Usage, from the repository root:
+#   python -m benchmarks.loadtest --sessions 200 --games 5
+#   python -m benchmarks.loadtest --strategy hint_first --difficulty "Hard 😓" --format json
+#   python -m benchmarks.loadtest --daily --sessions 500 --games 1
+#
+# Each simulated session is its own AppTest of app.py, with its own session
+# state and player id, running on its own thread. As in a real server process,
+# every session shares the cache_resource objects (history store, leaderboard,
+# achievement engine). AppTest swaps a process-wide runtime in for each run,
+# so script runs take turns on a lock. Each rerun is therefore timed twice:
+# the run itself, with the lock held (the render time a real server would
+# see), and the wait for the lock before it, which grows with the number of
+# sessions and says nothing about the app. A session clicks "Start New Game",
+# then plays through "Submit Guess" (and "Get a Hint" when its strategy takes
+# one) until the game ends. Every click is one timed rerun. With --daily, sessions click "Daily
+# Challenge" instead, once each as players get one daily game a day, so every
+# player races for the same target, as at the peak of a real day.
+#
+# Strategies are the engine's strategy(game, rng) functions, or any bot
+# tournament.py accepts. Each session keeps a mirror of its game, rebuilt
+# from the seed the app drew, so a strategy sees the same feedback and hint
+# facts as the player would.
+#
+# The report gives percentiles per action of render time, lock wait and
+# end-to-end latency (wait plus render, as a session saw it under this
+# serialisation), reruns and games per second, and resident memory per
+# session, measured once every session has loaded the page.
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+from engine import DIFFICULTIES, seeded_game
+from hints import DEFAULT_HINT_MODE, HINT_MODES
+from tournament import STRATEGIES, load_strategy
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+ACTIONS = ('load', 'start', 'hint', 'guess')
+PERCENTILES = (50, 90, 99)
+# Report sections: title, and how each is worked out from a rerun's (wait, run) seconds
+LATENCIES = {
+    'render': ("render time (ms)", lambda wait, run: run),
+    'lock_wait': ("lock wait (ms)", lambda wait, run: wait),
+    'end_to_end': ("end-to-end (ms)", lambda wait, run: wait + run),
+}
+
+START_LABEL = "Start New Game 🎮"
+DAILY_LABEL = "Daily Challenge 📅"
+SUBMIT_LABEL = "Submit Guess 🚀"
+HINT_LABEL = "Get a Hint 💡"
+
+
+# AppTest installs a global Runtime for the length of each run
+_run_lock = threading.Lock()
+
+
+class SessionResult:
+    __slots__ = ('timings', 'games', 'wins', 'error')
+
+    def __init__(self):
+        # action -> (seconds waiting for the run lock, seconds running) per rerun
+        self.timings = {action: [] for action in ACTIONS}
+        self.games = 0
+        self.wins = 0
+        self.error = None
+
+
+# Function to read this process's resident memory in bytes
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # Peak rather than current usage, but close enough while load only grows
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Function to get the p-th percentile of a sorted list (nearest rank)
+def percentile(values, p):
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, -(-len(values) * p // 100) - 1))]
+
+
+def _rerun(at, timings):
+    started = time.perf_counter()
+    with _run_lock:
+        running = time.perf_counter()
+        at.run()
+        finished = time.perf_counter()
+    timings.append((running - started, finished - running))
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def _click(at, container, label, timings, think_time=0.0):
+    if think_time:
+        # A player reads the page before clicking
+        time.sleep(think_time)
+    next(button for button in container.button if button.label == label).click()
+    _rerun(at, timings)
+
+
+def run_session(index, strategy, n_games, difficulty, max_range, seed, timeout, loaded, think_time=0.0,
+                hint_mode=DEFAULT_HINT_MODE, daily=False):
+    # One simulated player; `loaded` is a barrier every session waits at once
+    # its page has loaded
+    from streamlit.testing.v1 import AppTest
+
+    result = SessionResult()
+    rng = random.Random(f"{seed}/{index}")
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.query_params["player"] = f"loadtest-{index}"
+    try:
+        _rerun(at, result.timings['load'])
+    except Exception as e:
+        result.error = repr(e)
+    loaded.wait()
+    if result.error:
+        return result
+
+    try:
+        at.sidebar.select_slider[0].set_value(difficulty)
+        next(s for s in at.sidebar.selectbox if s.label == "Hint Mode 💡").set_value(hint_mode)
+        next(n for n in at.sidebar.number_input if n.label == "Maximum Value").set_value(max_range)
+        # Each player only gets one daily game a day
+        for _ in range(1 if daily else n_games):
+            _click(at, at.sidebar, DAILY_LABEL if daily else START_LABEL, result.timings['start'], think_time)
+            state = at.session_state
+            game, _ = seeded_game(state['game_seed'], state['min_range'], state['max_range'],
+                                  state['difficulty'], state['big_range'], state['hint_mode'])
+            guess_limit = min(game.max_attempts, game.max_range - game.min_range + 1)
+            while not game.won and game.attempts < guess_limit:
+                hints_used = game.hints_used
+                value = strategy(game, rng)
+                if game.hints_used > hints_used:
+                    for _ in range(game.hints_used - hints_used):
+                        _click(at, at, HINT_LABEL, result.timings['hint'], think_time)
+                    # Use the facts the app drew, not the mirror's
+                    game.hints = tuple(at.session_state['hint_facts'])
+                at.number_input(key="guess_input").set_value(value)
+                _click(at, at, SUBMIT_LABEL, result.timings['guess'], think_time)
+                game.guess(value)
+            result.games += 1
+            result.wins += game.won
+    except Exception as e:
+        result.error = repr(e)
+    return result
+
+
+# Function to run a load test; returns the report as a dict
+def run_load_test(strategy, sessions=100, n_games=3, difficulty="Medium 😐", max_range=100,
+                  seed=0, timeout=60, think_time=0.0, hint_mode=DEFAULT_HINT_MODE, daily=False):
+    # Warm up imports and the shared resources, so they aren't counted as
+    # per-session memory
+    warmup = run_session(-1, strategy, 0, difficulty, max_range, seed, timeout, threading.Barrier(1))
+    if warmup.error:
+        raise RuntimeError(f"app.py failed to load: {warmup.error}")
+    baseline = rss_bytes()
+
+    memory = {}
+
+    def measure():
+        memory['loaded'] = rss_bytes()
+
+    loaded = threading.Barrier(sessions, action=measure)
+    results = [None] * sessions
+
+    def worker(index):
+        results[index] = run_session(index, strategy, n_games, difficulty, max_range, seed, timeout, loaded,
+                                     think_time, hint_mode, daily)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    timings = {action: [t for r in results for t in r.timings[action]] for action in ACTIONS}
+    timings['all'] = [t for action in ACTIONS for t in timings[action]]
+    errors = [r.error for r in results if r.error]
+    games = sum(r.games for r in results)
+    return {
+        'sessions': sessions,
+        'games': games,
+        'wins': sum(r.wins for r in results),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'elapsed': elapsed,
+        'reruns_per_second': len(timings['all']) / elapsed,
+        'games_per_second': games / elapsed,
+        'memory_per_session': (memory.get('loaded', baseline) - baseline) / sessions,
+        **{name: _latency(timings, measure) for name, (_, measure) in LATENCIES.items()},
+    }
+
+
+# Function to summarise one kind of latency, per action
+def _latency(timings, measure):
+    summary = {}
+    for action, pairs in timings.items():
+        values = sorted(measure(wait, run) for wait, run in pairs)
+        summary[action] = {
+            'count': len(values),
+            **{f"p{p}": percentile(values, p) for p in PERCENTILES},
+            'max': values[-1] if values else None,
+        }
+    return summary
+
+
+def print_report(report, out=sys.stdout):
+    out.write(f"{report['sessions']} sessions, {report['games']} games ({report['wins']} won), "
+              f"{report['errors']} failed sessions in {report['elapsed']:.1f}s\n")
+    if report['first_error']:
+        out.write(f"First error: {report['first_error']}\n")
+    out.write(f"Throughput: {report['reruns_per_second']:.1f} reruns/s, {report['games_per_second']:.2f} games/s\n")
+    out.write(f"Memory: {report['memory_per_session'] / 2 ** 20:.2f} MiB per session\n")
+    for name, (title, _) in LATENCIES.items():
+        out.write(f"\n{title:<20}{'count':>8}" + "".join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'max':>10}\n")
+        for action, stats in report[name].items():
+            if not stats['count']:
+                continue
+            out.write(f"{action:<20}{stats['count']:>8}" + "".join(
+                f"{stats[f'p{p}'] * 1000:>10.1f}" for p in PERCENTILES
+            ) + f"{stats['max'] * 1000:>10.1f}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test app.py with many concurrent simulated sessions.")
+    parser.add_argument("--sessions", type=int, default=100, help="concurrent sessions (default 100)")
+    parser.add_argument("--games", type=int, default=3, help="games per session (default 3)")
+    parser.add_argument("--strategy", default="binary_search",
+                        help=f"guessing strategy: {', '.join(STRATEGIES)} or module:function")
+    parser.add_argument("--difficulty", choices=list(DIFFICULTIES), default="Medium 😐")
+    parser.add_argument("--max", type=int, default=100, dest="max_range", help="range maximum (2 to 10000)")
+    parser.add_argument("--hint-mode", choices=list(HINT_MODES), default=DEFAULT_HINT_MODE)
+    parser.add_argument("--daily", action="store_true",
+                        help="play today's daily challenge once per session (its range and difficulty override "
+                             "--max and --difficulty, and --games is ignored)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="seconds each session waits before every click (default 0: as fast as possible)")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per rerun")
+    parser.add_argument("--db", help="history database to play into (default: a fresh temporary one)")
+    parser.add_argument("--format", choices=("table", "json"), default="table")
+    args = parser.parse_args(argv)
+
+    # Play into a throwaway database unless told otherwise
+    os.environ["NUMBER_MASTER_DB"] = args.db or os.path.join(
+        tempfile.mkdtemp(prefix="number_master_load_"), "history.db"
+    )
+    # AppTest logs a warning for every session started off a script thread.
+    # Streamlit resets its loggers' levels on startup, so filter instead.
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: record.levelno >= logging.ERROR
+    )
+
+    report = run_load_test(load_strategy(args.strategy), args.sessions, args.games, args.difficulty,
+                           args.max_range, args.seed, args.timeout, args.think_time, args.hint_mode,
+                           args.daily)
+    if args.format == "json":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print_report(report)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
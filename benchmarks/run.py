@@ -0,0 +1,109 @@
+# Benchmark runner for Number Master Pro.
+#
+# Usage, from the repository root:
+#   python -m benchmarks.run                          # run everything
+#   python -m benchmarks.run -k score --out new.json  # filter by name, save results
+#   python -m benchmarks.run --compare old.json       # flag regressions vs a saved run
+#
+# Each benchmark is timed with timeit (auto-ranged loop count, several
+# repeats) and reported as seconds per call; results are stored as JSON so
+# runs can be compared across commits.
+import argparse
+import inspect
+import json
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime
+
+from benchmarks import BENCHMARKS
+
+
+# Function to time one benchmark
+def run_one(setup, repeat):
+    fn = cleanup = setup()
+    if inspect.isgenerator(cleanup):
+        fn = next(cleanup)
+    try:
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    finally:
+        if inspect.isgenerator(cleanup):
+            # Runs the setup's own cleanup, after its yield
+            cleanup.close()
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'loops': number,
+        'repeat': repeat,
+    }
+
+
+# Function to format seconds per call with a readable unit
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Number Master Pro benchmarks.")
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per benchmark (default 5)")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against results from an earlier --out file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    # Registers the benchmarks
+    from benchmarks import cases  # noqa: F401
+
+    selected = [(name, setup) for name, setup in BENCHMARKS if args.pattern in name]
+    if args.list:
+        for name, _ in selected:
+            print(name)
+        return 0
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    regressions = []
+    for name, setup in selected:
+        result = run_one(setup, args.repeat)
+        results[name] = result
+        line = f"{name:<45} {format_time(result['min']):>12}"
+        if name in baseline:
+            ratio = result['min'] / baseline[name]['min']
+            line += f"   {ratio:5.2f}x"
+            if ratio > 1 + args.threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line, flush=True)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'platform': platform.platform(),
+                    'date': datetime.now().isoformat(timespec="seconds"),
+                },
+                'results': results,
+            }, f, indent=2)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# Chart builders for the History and Stats tabs.
+#
+# Each builder returns a Vega-Lite spec (a plain dict) rather than an Altair
+# chart. Specs go through a small LRU cache keyed by the caller, e.g. by
+# (player, number of games), so unchanged charts are never rebuilt through
+# Altair on a rerun. Only spec building is cached: st.vega_lite_chart() still
+# serialises the cached dict to JSON each time it is drawn.
+#
+# altair and pandas are imported inside the builders, so they are only loaded
+# the first time a History or Stats chart is built, not at app startup.
+import threading
+from collections import OrderedDict
+
+CHART_CACHE_SIZE = 128
+
+
+class ChartCache:
+    # Least-recently-used cache of chart specs, shared by all sessions
+    def __init__(self, maxsize=CHART_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build, *args):
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is not None:
+                self._specs.move_to_end(key)
+                return spec
+        spec = build(*args)
+        with self._lock:
+            self._specs[key] = spec
+            self._specs.move_to_end(key)
+            while len(self._specs) > self.maxsize:
+                self._specs.popitem(last=False)
+        return spec
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+
+    def __len__(self):
+        return len(self._specs)
+
+
+chart_cache = ChartCache()
+
+
+# Function to apply the app's chart styling and turn the chart into a spec dict
+def _to_spec(chart):
+    return chart.configure_view(
+        fill="white"
+    ).configure_axis(
+        labelColor="#333333",
+        titleColor="#333333"
+    ).to_dict()
+
+
+# Score over time (History tab)
+def score_progression_spec(columns):
+    import altair as alt
+    import pandas as pd
+
+    chart = alt.Chart(pd.DataFrame(columns)).mark_line(point=True).encode(
+        x=alt.X('game_number:Q', title='Game Number'),
+        y=alt.Y('score:Q', title='Score'),
+        tooltip=['date', 'score', 'attempts']
+    ).properties(
+        title='Score Progression',
+        width=700,
+        height=300
+    )
+    return _to_spec(chart)
+
+
+# Attempts distribution, already counted per number of attempts (Stats tab)
+def attempts_histogram_spec(attempt_counts):
+    import altair as alt
+    import pandas as pd
+
+    data = pd.DataFrame({'attempts': list(attempt_counts), 'games': list(attempt_counts.values())})
+    chart = alt.Chart(data).mark_bar().encode(
+        x=alt.X('attempts:Q', bin=True, title='Number of Attempts'),
+        y=alt.Y('sum(games):Q', title='Frequency')
+    ).properties(
+        title='Distribution of Attempts per Game',
+        width=700,
+        height=300
+    )
+    return _to_spec(chart)
+
+
+# Performance by difficulty, from each difficulty's score quartiles (Stats tab)
+def difficulty_boxplot_spec(quartiles):
+    import altair as alt
+    import pandas as pd
+
+    data = pd.DataFrame(
+        [(difficulty, *values) for difficulty, values in quartiles.items()],
+        columns=['difficulty', 'min', 'q1', 'median', 'q3', 'max']
+    )
+    base = alt.Chart(data).encode(
+        x=alt.X('difficulty:N', title='Difficulty Level'),
+        tooltip=['difficulty', 'min', 'q1', 'median', 'q3', 'max']
+    )
+    whiskers = base.mark_rule().encode(y=alt.Y('min:Q', title='Score'), y2='max:Q')
+    boxes = base.mark_bar(size=40).encode(y='q1:Q', y2='q3:Q')
+    medians = base.mark_tick(color='white', size=40).encode(y='median:Q')
+    chart = (whiskers + boxes + medians).properties(
+        title='Score Distribution by Difficulty',
+        width=700,
+        height=300
+    )
+    return _to_spec(chart)
+
+
+# Learning curve (Stats tab)
+def learning_curve_spec(columns, window_size):
+    import altair as alt
+    import pandas as pd
+
+    data = pd.DataFrame({
+        'game_number': columns['game_number'],
+        'moving_avg_attempts': columns['moving_avg_attempts'],
+    })
+    chart = alt.Chart(data).mark_line(point=True).encode(
+        x=alt.X('game_number:Q', title='Game Number'),
+        y=alt.Y('moving_avg_attempts:Q', title=f'{window_size}-Game Moving Average of Attempts')
+    ).properties(
+        title='Learning Curve (Lower is Better)',
+        width=700,
+        height=300
+    )
+    return _to_spec(chart)
+
+
+# Guess progression for a single game (History tab)
+def guess_progression_spec(game):
+    import altair as alt
+    import pandas as pd
+
+    chart = alt.Chart(pd.DataFrame(game['guesses'].columns())).mark_line(point=True).encode(
+        x=alt.X('attempt:Q', title='Attempt Number'),
+        y=alt.Y('guess:Q', title='Guess Value', scale=alt.Scale(domain=[game['min_range'], game['max_range']])),
+        tooltip=['attempt', 'guess', 'result']
+    ).properties(
+        title='Guess Progression',
+        width=500,
+        height=300
+    )
+
+    # Add a horizontal line for the target
+    target_line = alt.Chart(pd.DataFrame({'target': [game['target']]})).mark_rule(color='red').encode(
+        y='target:Q'
+    )
+    return _to_spec(chart + target_line)
+
+
+# A daily challenge's attempts, already counted per number of attempts (Leaderboard tab)
+def daily_attempts_spec(attempts):
+    import altair as alt
+    import pandas as pd
+
+    data = pd.DataFrame({'attempts': list(attempts), 'players': list(attempts.values())})
+    chart = alt.Chart(data).mark_bar().encode(
+        x=alt.X('attempts:O', title='Number of Attempts'),
+        y=alt.Y('players:Q', title='Players'),
+        tooltip=['attempts', 'players']
+    ).properties(
+        title="Today's Attempts",
+        width=700,
+        height=300
+    )
+    return _to_spec(chart)
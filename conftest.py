@@ -0,0 +1,26 @@
+import pytest
+
+from engine import binary_search, seeded_game
+from guess_log import GuessLog
+
+
+# Function to play a seeded 1-100 game; a lucky player guesses the target first time
+def _make_record(seed, lucky=True, time_taken=30.0):
+    game, rng = seeded_game(seed, 1, 100)
+    guesses = GuessLog(game.target, 1, 100)
+    while not game.finished:
+        value = game.target if lucky else binary_search(game, rng)
+        game.guess(value)
+        guesses.append(value)
+    return {
+        'min_range': 1, 'max_range': 100, 'attempts': game.attempts,
+        'score': game.score(time_taken), 'time_taken': time_taken,
+        'difficulty': "Medium 😐", 'target': game.target, 'hints_used': 0,
+        'date': "2024-01-01 12:00", 'guesses': guesses, 'seed': seed,
+        'big_range': False, 'hint_mode': None,
+    }
+
+
+@pytest.fixture
+def make_record():
+    return _make_record
@@ -0,0 +1,296 @@
+# Daily challenge for Number Master Pro.
+#
+# Every player gets the same puzzle each day. The range, difficulty and target
+# all come from a seed derived from the date (UTC, so the day rolls over at
+# the same moment for everyone) and a secret, which keeps the target from
+# being worked out in advance from this source. The secret is
+# NUMBER_MASTER_DAILY_SECRET if set; otherwise a random one is generated once
+# and kept in the database, so every process sharing it agrees on the puzzle.
+# A daily game is an ordinary seeded game, so replay.py and verify.py check it
+# as usual.
+#
+# Each player gets one daily game a day: starting it is recorded, and a
+# second start is refused, so a bad game can't be abandoned and replayed.
+# Each player's verified result of the day counts toward that day's
+# global statistics. They are kept in memory and updated as results come in:
+#   - an exact histogram of attempts;
+#   - a log-bucketed sketch of scores (as in DDSketch), whose bucket counts
+#     sit in a Fenwick tree. "You beat 83% of players" and any percentile
+#     cost O(log buckets), a handful of steps however many players there are.
+# Results are also saved in SQLite. A day's statistics are rebuilt from there
+# once, the first time a process needs them; no request reads raw rows.
+#
+#   python daily.py                  today's challenge and statistics
+#   python daily.py --day 2024-05-01
+import argparse
+import math
+import os
+import random
+import secrets
+import sqlite3
+import threading
+from array import array
+from datetime import date, datetime, timezone
+
+from history_store import DEFAULT_PATH
+from leaderboard import ScoreIndex
+from stats import SKETCH_ACCURACY, ScoreBuckets
+
+DAILY_RANGES = (100, 500, 1_000, 5_000, 10_000)
+DAILY_DIFFICULTIES = ("Easy 😊", "Medium 😐", "Hard 😓", "Expert 🥵")
+DAILY_HINT_MODE = 'classic'
+PERCENTILES = (25, 50, 75, 90, 99)
+# Days whose statistics are kept in memory (today, plus the days before it
+# that players in other time zones may still be finishing)
+KEEP_DAYS = 3
+
+SECRET_ENV = "NUMBER_MASTER_DAILY_SECRET"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_secret (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    secret TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_starts (
+    day TEXT NOT NULL,
+    player TEXT NOT NULL,
+    date TEXT,
+    PRIMARY KEY (day, player)
+);
+CREATE TABLE IF NOT EXISTS daily_results (
+    day TEXT NOT NULL,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    date TEXT,
+    PRIMARY KEY (day, player)
+);
+"""
+
+
+class DailyChallenge:
+    __slots__ = ('day', 'seed', 'min_range', 'max_range', 'difficulty', 'hint_mode')
+
+    def __init__(self, day, seed, min_range, max_range, difficulty, hint_mode=DAILY_HINT_MODE):
+        self.day = day
+        self.seed = seed
+        self.min_range = min_range
+        self.max_range = max_range
+        self.difficulty = difficulty
+        self.hint_mode = hint_mode
+
+    def to_json(self):
+        # Everything but the seed, which gives the target away
+        return {
+            'day': self.day,
+            'min_range': self.min_range,
+            'max_range': self.max_range,
+            'difficulty': self.difficulty,
+            'hint_mode': self.hint_mode,
+        }
+
+
+# Function to get today's date in UTC, as YYYY-MM-DD
+def today():
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+# Function to derive a day's game seed; str seeds hash deterministically
+def daily_seed(day, secret):
+    if not secret:
+        raise ValueError("A daily secret is required, or anyone could work out the target")
+    return random.Random(f"daily/{secret}/{day}").getrandbits(63)
+
+
+# Function to get the challenge for a day (a date or YYYY-MM-DD; default
+# today). DailyBoard.challenge() supplies the server's secret.
+def daily_challenge(secret, day=None):
+    if day is None:
+        day = today()
+    elif isinstance(day, date):
+        day = day.isoformat()
+    seed = daily_seed(day, secret)
+    # The range and difficulty use their own RNG, so the game's RNG draws
+    # the target first, as in every other seeded game
+    rules = random.Random(f"{seed}/rules")
+    return DailyChallenge(day, seed, 1, rules.choice(DAILY_RANGES), rules.choice(DAILY_DIFFICULTIES))
+
+
+class ScoreSketch(ScoreBuckets):
+    # ScoreBuckets whose counts sit in a Fenwick tree, so ranks and
+    # percentiles cost O(log buckets) rather than a pass over the buckets
+    __slots__ = ()
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        super().__init__(accuracy)
+        self.counts = ScoreIndex()
+
+    def add(self, score):
+        self.counts.add(self.bucket(score))
+        self.total += 1
+
+    def count_below(self, score):
+        # Scores in a lower bucket; those sharing the bucket count as ties
+        bucket = self.bucket(score)
+        return self.counts.count_at_most(bucket - 1) if bucket else 0
+
+    def quantile(self, q):
+        if not self.total:
+            return None
+        return self.value(self.counts.find(max(1, math.ceil(q * self.total))))
+
+
+class DailyStats:
+    # One day's results, updated one result at a time
+    __slots__ = ('players', 'wins', 'attempts', 'scores', '_summary')
+
+    def __init__(self):
+        self.players = 0
+        self.wins = 0
+        # attempts[n] = players who took n attempts
+        self.attempts = array('q')
+        self.scores = ScoreSketch()
+        self._summary = None
+
+    def add(self, score, attempts, won):
+        self.players += 1
+        self.wins += bool(won)
+        if attempts >= len(self.attempts):
+            self.attempts.extend(array('q', bytes(8 * (attempts + 1 - len(self.attempts)))))
+        self.attempts[attempts] += 1
+        self.scores.add(score)
+        self._summary = None
+
+    def beaten(self, score):
+        # Fraction of the day's players with a lower score
+        return self.scores.count_below(score) / self.players if self.players else 0.0
+
+    def summary(self):
+        # Built once per new result, however often it is asked for
+        if self._summary is None:
+            self._summary = {
+                'players': self.players,
+                'wins': self.wins,
+                'win_rate': self.wins / self.players * 100 if self.players else 0.0,
+                'attempts': {n: count for n, count in enumerate(self.attempts) if count},
+                'score_percentiles': {p: self.scores.quantile(p / 100) for p in PERCENTILES},
+            }
+        return self._summary
+
+
+class DailyBoard:
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get("NUMBER_MASTER_DB", DEFAULT_PATH)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self.secret = os.environ.get(SECRET_ENV) or self._stored_secret()
+        # day -> DailyStats, for KEEP_DAYS days: the last one asked about and
+        # the most recent others
+        self._days = {}
+
+    def _stored_secret(self):
+        # The database's secret, generated on first use. INSERT OR IGNORE
+        # keeps the first one if several processes race to create it.
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO daily_secret (id, secret) VALUES (0, ?)", (secrets.token_hex(32),)
+            )
+        return self._conn.execute("SELECT secret FROM daily_secret WHERE id = 0").fetchone()[0]
+
+    def challenge(self, day=None):
+        return daily_challenge(self.secret, day)
+
+    def start(self, player, day, date=None):
+        # Record that a player started the day's game; False if they already
+        # had, in which case they don't get another
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with self._lock:
+            with self._conn:
+                return self._conn.execute(
+                    "INSERT OR IGNORE INTO daily_starts (day, player, date) VALUES (?, ?, ?)",
+                    (day, player, date)
+                ).rowcount == 1
+
+    def _stats(self, day):
+        # Call with the lock held
+        stats = self._days.get(day)
+        if stats is None:
+            stats = self._days[day] = DailyStats()
+            for score, attempts, won in self._conn.execute(
+                "SELECT score, attempts, won FROM daily_results WHERE day = ?", (day,)
+            ):
+                stats.add(score, attempts, won)
+            # Drop the oldest other days (ISO dates sort by age). The day just
+            # asked for stays, however old, so asking again doesn't reload it.
+            others = sorted(d for d in self._days if d != day)
+            for old in others[:len(others) - (KEEP_DAYS - 1)]:
+                del self._days[old]
+        return stats
+
+    def submit(self, player, day, score, attempts, won, date=None):
+        # Record a finished daily game. Only a player's first game of the day
+        # counts; either way, returns how the score stands against the day.
+        score = int(score)
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with self._lock:
+            # Load the day before adding to it, so the new row isn't read back
+            stats = self._stats(day)
+            with self._conn:
+                counted = self._conn.execute(
+                    "INSERT OR IGNORE INTO daily_results (day, player, score, attempts, won, date) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (day, player, score, attempts, int(bool(won)), date)
+                ).rowcount == 1
+            if counted:
+                stats.add(score, attempts, won)
+            return {'day': day, 'counted': counted, 'beaten': stats.beaten(score), 'players': stats.players}
+
+    def played(self, player, day):
+        # Whether the player has started the day's game, finished or not
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM daily_starts WHERE day = ? AND player = ?", (day, player)
+            ).fetchone() is not None
+
+    def standing(self, day, score):
+        # Fraction of the day's players a score beats
+        with self._lock:
+            return self._stats(day).beaten(score)
+
+    def summary(self, day):
+        with self._lock:
+            return dict(self._stats(day).summary(), day=day)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show a day's challenge and its global statistics.")
+    parser.add_argument("--day", help="YYYY-MM-DD (default: today, UTC)")
+    parser.add_argument("--db", help="history database (default: NUMBER_MASTER_DB or number_master.db)")
+    args = parser.parse_args(argv)
+
+    board = DailyBoard(args.db)
+    challenge = board.challenge(args.day)
+    summary = board.summary(challenge.day)
+    print(f"Daily challenge {challenge.day}: {challenge.min_range} to {challenge.max_range}, "
+          f"{challenge.difficulty}")
+    print(f"{summary['players']} players, {summary['win_rate']:.1f}% won")
+    if summary['players']:
+        print("Scores: " + ", ".join(f"p{p} {value}" for p, value in summary['score_percentiles'].items()))
+        print("Attempts: " + ", ".join(f"{n}: {count}" for n, count in summary['attempts'].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+# Headless game engine for Number Master Pro.
+#
+# Holds the game rules (difficulty limits, guess evaluation, hints and scoring)
+# without any Streamlit, pandas or altair dependency, so games can be played
+# from app.py, from scripts, or simulated in bulk with play_many().
+import random
+from array import array
+
+from hints import DEFAULT_HINT_MODE, HINT_MODES, format_fact, next_provider
+
+# Difficulty levels: (max attempts as a fraction of the range size, hint penalty)
+DIFFICULTIES = {
+    "Easy 😊": (0.3, 1),
+    "Medium 😐": (0.2, 2),
+    "Hard 😓": (0.1, 3),
+    "Expert 🥵": (0.05, 4),
+    "Unlimited ♾️": (None, 2),
+}
+
+# Big range mode: max attempts as a multiple of the binary-search bound
+# ceil(log2(range size)), so limits stay sensible for ranges in the billions
+BIG_RANGE_DIFFICULTIES = {
+    "Easy 😊": 3,
+    "Medium 😐": 2,
+    "Hard 😓": 1.5,
+    "Expert 🥵": 1,
+    "Unlimited ♾️": None,
+}
+BIG_RANGE_DEFAULT_MAX = 2 ** 63
+
+# Smallest minimum and largest maximum allowed outside big range mode, whose
+# attempt limits grow with the range size itself
+RANGE_LIMITS = (1, 10_000)
+
+MAX_HINTS = 3
+
+# Guess results, encoded as the sign of (guess - target)
+TOO_LOW = -1
+CORRECT = 0
+TOO_HIGH = 1
+RESULT_NAMES = {TOO_LOW: 'too low', CORRECT: 'correct', TOO_HIGH: 'too high'}
+RESULT_CODES = {name: code for code, name in RESULT_NAMES.items()}
+
+
+# Function to get max attempts and hint penalty for a difficulty level
+def difficulty_settings(difficulty, min_range, max_range, big_range=False):
+    fraction, hint_penalty = DIFFICULTIES[difficulty]
+    range_size = max_range - min_range + 1
+    if big_range:
+        multiple = BIG_RANGE_DIFFICULTIES[difficulty]
+        if multiple is None:
+            return float('inf'), hint_penalty
+        return max(1, int(range_bits(range_size) * multiple)), hint_penalty
+    if fraction is None:
+        return float('inf'), hint_penalty
+    return int(range_size * fraction), hint_penalty
+
+
+# Function to check a range before a game starts; returns why it can't be
+# played, or None if it can
+def range_error(min_range, max_range, big_range=False):
+    if min_range >= max_range:
+        return "Minimum value must be less than maximum value!"
+    low, high = RANGE_LIMITS
+    if not big_range and (min_range < low or max_range > high):
+        return f"Outside big range mode, ranges must be within {low:,} to {high:,}."
+    return None
+
+
+# Function to get ceil(log2(range_size)), exactly, for any size of integer
+def range_bits(range_size):
+    return (range_size - 1).bit_length()
+
+
+# Function to parse a number typed by the player, e.g. "1,000,000" or "2^63"
+def parse_number(text):
+    text = text.strip().replace(',', '').replace('_', '').replace(' ', '')
+    try:
+        if '^' in text:
+            base, exponent = text.split('^')
+            exponent = int(exponent)
+            # Keep the power cheap to compute and to display
+            if not 0 <= exponent <= 4096:
+                return None
+            return int(base) ** exponent
+        return int(text)
+    except ValueError:
+        return None
+
+
+# Function to calculate score
+def calculate_score(attempts, max_range, min_range, time_taken, hints_used, hint_penalty):
+    range_factor = (max_range - min_range) / 100
+    base_score = 1000 * range_factor
+    attempt_penalty = attempts * 50
+    time_penalty = time_taken * 5
+    hint_penalty_total = hints_used * hint_penalty * 25
+
+    score = max(0, base_score - attempt_penalty - time_penalty - hint_penalty_total)
+    return int(score)
+
+
+# Function to calculate score in big range mode, where the base score grows
+# with log2 of the range instead of linearly
+def calculate_big_range_score(attempts, max_range, min_range, time_taken, hints_used, hint_penalty):
+    base_score = 100 * range_bits(max_range - min_range + 1)
+    attempt_penalty = attempts * 50
+    time_penalty = time_taken * 5
+    hint_penalty_total = hints_used * hint_penalty * 25
+
+    score = max(0, base_score - attempt_penalty - time_penalty - hint_penalty_total)
+    return int(score)
+
+
+# Function to compare a guess with the target
+def evaluate_guess(guess, target):
+    if guess == target:
+        return CORRECT
+    return TOO_LOW if guess < target else TOO_HIGH
+
+
+# Function to work out what a classic hint reveals, as a small tuple:
+#   ('parity', 0 or 1), ('divisor', 3/5/7 or None), ('range', lower, upper)
+# Other hint modes are in hints.py.
+def hint_fact(hint_number, target, min_range, max_range, rng=random):
+    return HINT_MODES['classic'][hint_number - 1].fact(target, min_range, max_range, rng)
+
+
+# Function to turn a hint fact into the message shown to the player
+format_hint = format_fact
+
+
+class GameState:
+    # One game in progress. low/high track the interval still consistent with
+    # the too-low/too-high feedback given so far. hint_cost is the hints'
+    # total cost, which the score is charged for (one per classic hint).
+    __slots__ = (
+        'min_range', 'max_range', 'target', 'max_attempts', 'hint_penalty',
+        'attempts', 'hints_used', 'hints', 'won', 'low', 'high', 'big_range',
+        'hint_mode', 'hint_cost',
+    )
+
+    def __init__(self, min_range, max_range, target, max_attempts=float('inf'), hint_penalty=2,
+                 big_range=False, hint_mode=DEFAULT_HINT_MODE):
+        self.min_range = min_range
+        self.max_range = max_range
+        self.target = target
+        self.max_attempts = max_attempts
+        self.hint_penalty = hint_penalty
+        self.attempts = 0
+        self.hints_used = 0
+        self.hints = ()
+        self.won = False
+        self.low = min_range
+        self.high = max_range
+        self.big_range = big_range
+        self.hint_mode = hint_mode
+        self.hint_cost = 0
+
+    @property
+    def finished(self):
+        return self.won or self.attempts >= self.max_attempts
+
+    def guess(self, value):
+        self.attempts += 1
+        result = evaluate_guess(value, self.target)
+        if result == CORRECT:
+            self.won = True
+        elif result == TOO_LOW:
+            if value >= self.low:
+                self.low = value + 1
+        elif value <= self.high:
+            self.high = value - 1
+        return result
+
+    def take_hint(self, rng=random):
+        if self.hints_used >= MAX_HINTS:
+            return None
+        provider = next_provider(self.hint_mode, self.hints, self.min_range, self.max_range)
+        if provider is None:
+            return None
+        self.hints_used += 1
+        self.hint_cost += provider.cost
+        fact = provider.fact(self.target, self.min_range, self.max_range, rng)
+        self.hints += (fact,)
+        return fact
+
+    def score(self, time_taken=0):
+        if not self.won:
+            return 0
+        score_fn = calculate_big_range_score if self.big_range else calculate_score
+        return score_fn(
+            self.attempts, self.max_range, self.min_range,
+            time_taken, self.hint_cost, self.hint_penalty
+        )
+
+
+# Function to start a new game with a random target
+def new_game(min_range, max_range, difficulty="Medium 😐", rng=random, big_range=False,
+             hint_mode=DEFAULT_HINT_MODE):
+    max_attempts, hint_penalty = difficulty_settings(difficulty, min_range, max_range, big_range)
+    target = rng.randint(min_range, max_range)
+    return GameState(min_range, max_range, target, max_attempts, hint_penalty, big_range, hint_mode)
+
+
+_seed_source = random.SystemRandom()
+
+
+# Function to draw a seed for a new game; 63 bits, so it fits a SQLite INTEGER
+def new_seed():
+    return _seed_source.getrandbits(63)
+
+
+# Function to start a game from its own seeded RNG. The target is the first
+# draw and hint #3 uses the draws after it, so the seed, the guesses and the
+# number of hints taken (with the hint mode) reproduce the whole game.
+# Returns (game, rng).
+def seeded_game(seed, min_range, max_range, difficulty="Medium 😐", big_range=False,
+                hint_mode=DEFAULT_HINT_MODE):
+    rng = random.Random(seed)
+    return new_game(min_range, max_range, difficulty, rng, big_range, hint_mode), rng
+
+
+# Built-in strategies. A strategy is called as strategy(game, rng) and returns
+# the next guess; it may call game.take_hint(rng) first.
+def binary_search(game, rng):
+    return (game.low + game.high) // 2
+
+
+def random_guess(game, rng):
+    return rng.randint(game.low, game.high)
+
+
+class BatchResult:
+    # Totals from play_many(); per-game arrays are only filled when collected
+    __slots__ = ('games', 'wins', 'attempts', 'hints', 'score', 'game_attempts', 'game_scores')
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.attempts = 0
+        self.hints = 0
+        self.score = 0
+        self.game_attempts = array('l')
+        self.game_scores = array('l')
+
+    def merge(self, other):
+        # Add another batch's totals (e.g. from a worker process)
+        self.games += other.games
+        self.wins += other.wins
+        self.attempts += other.attempts
+        self.hints += other.hints
+        self.score += other.score
+        self.game_attempts.extend(other.game_attempts)
+        self.game_scores.extend(other.game_scores)
+        return self
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games * 100 if self.games else 0.0
+
+    @property
+    def avg_attempts(self):
+        return self.attempts / self.games if self.games else 0.0
+
+    @property
+    def avg_score(self):
+        return self.score / self.games if self.games else 0.0
+
+    def __repr__(self):
+        return (f"BatchResult(games={self.games}, wins={self.wins}, "
+                f"win_rate={self.win_rate:.1f}%, avg_attempts={self.avg_attempts:.2f}, "
+                f"avg_score={self.avg_score:.1f})")
+
+
+# Function to simulate many games with one strategy
+def play_many(strategy, n_games, min_range=1, max_range=100, difficulty="Medium 😐",
+              seed=None, time_per_guess=0.0, collect=False, big_range=False, hint_mode=DEFAULT_HINT_MODE):
+    rng = random.Random(seed)
+    result = BatchResult()
+    max_attempts, hint_penalty = difficulty_settings(difficulty, min_range, max_range, big_range)
+    # A strategy that never repeats a guess cannot need more than the range size
+    guess_limit = min(max_attempts, max_range - min_range + 1)
+
+    for _ in range(n_games):
+        game = GameState(min_range, max_range, rng.randint(min_range, max_range),
+                         max_attempts, hint_penalty, big_range, hint_mode)
+        while not game.won and game.attempts < guess_limit:
+            game.guess(strategy(game, rng))
+
+        score = game.score(game.attempts * time_per_guess)
+        result.games += 1
+        result.wins += game.won
+        result.attempts += game.attempts
+        result.hints += game.hints_used
+        result.score += score
+        if collect:
+            result.game_attempts.append(game.attempts)
+            result.game_scores.append(score)
+
+    return result
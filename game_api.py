@@ -0,0 +1,520 @@
+# Headless HTTP/JSON API for Number Master Pro.
+#
+# Plays the same games as app.py (seeded targets, hints, scoring, history,
+# achievements, verification and the leaderboard) without Streamlit, for the
+# mobile client and load tests. It is a small HTTP/1.1 server on one asyncio
+# event loop, in the same style as race_server.py: games in progress live in
+# memory and each update runs on the loop thread without awaiting, so a guess
+# or a hint is answered without touching the database. Connections are kept
+# alive (HTTP/1.1 default, or Connection: keep-alive for HTTP/1.0), and
+# pipelined requests are answered in order. SQLite work (saving a finished
+# game, reading history and stats) runs on a worker thread so it never stalls
+# other connections. Players' stats are kept by a SessionManager and evicted
+# once they have been idle for its TTL. Daily challenge results go to a
+# DailyBoard, whose running statistics answer "you beat N% of players" without
+# reading stored results.
+#
+#   POST /games                        {"player", "min_range", "max_range", "difficulty", "big_range", "hint_mode"}
+#   GET  /games/<id>                   state of a game
+#   POST /games/<id>/guess             {"value": 50}
+#   POST /games/<id>/hint
+#   POST /daily                        {"player"}: start today's daily challenge
+#   GET  /daily                        today's challenge and its global statistics
+#   GET  /players/<player>/history     ?offset=0&limit=10&order=recent&difficulty=...
+#   GET  /players/<player>/stats
+#   GET  /leaderboard                  ?k=10&difficulty=...&bucket=...
+#
+#   python game_api.py --port 8080
+import argparse
+import asyncio
+import json
+import logging
+import secrets
+import threading
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from achievements import AchievementEngine
+from daily import DailyBoard
+from engine import (
+    CORRECT, DIFFICULTIES, RESULT_NAMES, format_hint, new_seed,
+    parse_number, range_error, seeded_game
+)
+from guess_log import GuessLog
+from hints import DEFAULT_HINT_MODE, HINT_MODES
+from history_store import ORDERS, HistoryStore
+from leaderboard import Leaderboard, range_bucket
+from session_store import SessionManager
+from verify import LiveVerifier
+
+GAME_TTL = 60 * 60
+CLEANUP_INTERVAL = 60
+MAX_BODY = 64 * 1024
+MAX_HISTORY_PAGE = 100
+
+log = logging.getLogger(__name__)
+
+STATUS_TEXT = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiGame:
+    __slots__ = (
+        'game_id', 'player', 'difficulty', 'seed', 'rng', 'state', 'guesses',
+        'started', 'last_active', 'finished', 'record', 'daily',
+    )
+
+    def __init__(self, game_id, player, difficulty, seed, state, rng, daily=None):
+        self.game_id = game_id
+        self.player = player
+        self.difficulty = difficulty
+        self.seed = seed
+        self.rng = rng
+        self.state = state
+        self.guesses = GuessLog(state.target, state.min_range, state.max_range)
+        self.started = self.last_active = time.time()
+        self.finished = False
+        # The history record, once the game is over
+        self.record = None
+        # The daily challenge's day, for a daily challenge game
+        self.daily = daily
+
+    def snapshot(self):
+        state = self.state
+        snapshot = {
+            'game': self.game_id,
+            'player': self.player,
+            'min_range': state.min_range,
+            'max_range': state.max_range,
+            'difficulty': self.difficulty,
+            'big_range': state.big_range,
+            'hint_mode': state.hint_mode,
+            'max_attempts': None if state.max_attempts == float('inf') else state.max_attempts,
+            'attempts': state.attempts,
+            'hints_used': state.hints_used,
+            'won': state.won,
+            'finished': self.finished,
+            'daily': self.daily,
+        }
+        if self.finished:
+            snapshot['target'] = state.target
+            snapshot['score'] = self.record['score']
+        return snapshot
+
+
+class GameApi:
+    def __init__(self, history_store=None, leaderboard=None, achievement_engine=None, daily_board=None):
+        self.history_store = history_store or HistoryStore()
+        self.leaderboard = leaderboard or Leaderboard()
+        self.achievement_engine = achievement_engine or AchievementEngine()
+        self.daily_board = daily_board or DailyBoard()
+        self.games = {}
+        # player -> SessionData holding the player's stats, which are built
+        # on first use and updated as games finish. The API draws no charts,
+        # so no per-game columns are kept. Saving a game and building or
+        # updating stats happen together under this lock, on worker threads.
+        self.sessions = SessionManager(self.history_store, hot_games=0)
+        self.players = {}
+        self._stats_lock = threading.Lock()
+        # Checks every finished game, so each player's win-rate test sees all their games
+        self.verifier = LiveVerifier(self.history_store)
+        self.loop = None
+
+    # Game operations (run on the event loop thread)
+
+    def start_game(self, player="default", min_range=1, max_range=100, difficulty="Medium 😐", big_range=False,
+                   hint_mode=DEFAULT_HINT_MODE):
+        # The same limits as the app's sidebar
+        error = range_error(min_range, max_range, big_range)
+        if error:
+            raise ApiError(400, error)
+        # Checked as strings first: JSON lists and objects aren't hashable
+        if not isinstance(difficulty, str) or difficulty not in DIFFICULTIES:
+            raise ApiError(400, f"Unknown difficulty: {difficulty!r}")
+        if not isinstance(hint_mode, str) or hint_mode not in HINT_MODES:
+            raise ApiError(400, f"Unknown hint mode: {hint_mode!r}")
+        seed = new_seed()
+        state, rng = seeded_game(seed, min_range, max_range, difficulty, big_range, hint_mode)
+        game_id = secrets.token_hex(8)
+        game = self.games[game_id] = ApiGame(game_id, player, difficulty, seed, state, rng)
+        return game.snapshot()
+
+    def claim_daily(self, player):
+        # Today's challenge, recording that the player started it; each
+        # player gets one daily game a day
+        challenge = self.daily_board.challenge()
+        if not self.daily_board.start(player, challenge.day):
+            raise ApiError(409, "You've already played today's challenge")
+        return challenge
+
+    def start_daily(self, challenge, player="default"):
+        state, rng = seeded_game(challenge.seed, challenge.min_range, challenge.max_range,
+                                 challenge.difficulty, hint_mode=challenge.hint_mode)
+        game_id = secrets.token_hex(8)
+        game = self.games[game_id] = ApiGame(
+            game_id, player, challenge.difficulty, challenge.seed, state, rng, challenge.day
+        )
+        return game.snapshot()
+
+    def guess(self, game_id, value):
+        # Returns (reply, finished); finished is (player, record, daily day)
+        # for a game that just ended, to save, or None
+        game = self._game(game_id)
+        state = game.state
+        if game.finished:
+            raise ApiError(409, "The game is over")
+        if not state.min_range <= value <= state.max_range:
+            raise ApiError(400, f"Guess must be between {state.min_range} and {state.max_range}")
+
+        result = state.guess(value)
+        game.guesses.append(value)
+        game.last_active = time.time()
+        reply = {
+            'game': game_id,
+            'attempt': state.attempts,
+            'guess': value,
+            'result': RESULT_NAMES[result],
+            'won': result == CORRECT,
+        }
+        if state.finished:
+            game.finished = True
+            time_taken = game.last_active - game.started
+            game.record = {
+                'min_range': state.min_range,
+                'max_range': state.max_range,
+                'attempts': state.attempts,
+                'score': state.score(time_taken),
+                'time_taken': time_taken,
+                'difficulty': game.difficulty,
+                'target': state.target,
+                'hints_used': state.hints_used,
+                'date': datetime.now().strftime("%Y-%m-%d %H:%M"),
+                'guesses': game.guesses,
+                'seed': game.seed,
+                'big_range': state.big_range,
+                'hint_mode': state.hint_mode,
+                'daily': game.daily,
+            }
+            reply.update(finished=True, target=state.target, score=game.record['score'],
+                         time_taken=time_taken)
+            return reply, (game.player, game.record, game.daily)
+        reply['finished'] = False
+        return reply, None
+
+    def hint(self, game_id):
+        game = self._game(game_id)
+        if game.finished:
+            raise ApiError(409, "The game is over")
+        fact = game.state.take_hint(game.rng)
+        if fact is None:
+            raise ApiError(409, "You've used all your hints! 🚫")
+        game.last_active = time.time()
+        hint_number = game.state.hints_used
+        return {
+            'game': game_id,
+            'hint_number': hint_number,
+            'fact': list(fact),
+            'hint': format_hint(hint_number, fact),
+        }
+
+    def state(self, game_id):
+        return self._game(game_id).snapshot()
+
+    def expire_games(self, ttl=GAME_TTL):
+        # Drop games nobody has touched for `ttl` seconds
+        cutoff = time.time() - ttl
+        for game_id in [g for g, game in self.games.items() if game.last_active < cutoff]:
+            del self.games[game_id]
+
+    def _game(self, game_id):
+        game = self.games.get(game_id)
+        if game is None:
+            raise ApiError(404, f"No game called {game_id}")
+        return game
+
+    # Database operations (run on worker threads)
+
+    def save_game(self, player, record, daily=None):
+        # Save a finished game as app.py does; returns what the player earned.
+        # It is checked first, as the verifier reads the player's saved games.
+        flags = self.verifier.check(player, record)
+        with self._stats_lock:
+            game_id = self.history_store.append(record, player)
+            session = self.players.get(player)
+            if session is not None:
+                self.sessions.record(session, record)
+        unlocked = self.achievement_engine.record_game(player, record, game_id)
+        reply = {'achievements': [rule.label for rule in unlocked]}
+        # Flags keep wins off the leaderboard, and daily games out of the day's statistics
+        if flags and (record['score'] > 0 or daily is not None):
+            reply['flags'] = flags
+        if daily is not None and not flags:
+            reply['daily'] = self.daily_board.submit(
+                player, daily, record['score'], record['attempts'], record['score'] > 0, record['date']
+            )
+        if record['score'] > 0 and not flags:
+            reply['rank'] = self.leaderboard.submit(
+                player, record['score'], record['difficulty'],
+                record['min_range'], record['max_range'], record['date'], record['big_range']
+            )
+            reply['ranked_games'] = self.leaderboard.count(
+                record['difficulty'],
+                range_bucket(record['min_range'], record['max_range'], record['big_range'])
+            )
+        return reply
+
+    def history(self, player, offset=0, limit=10, order='recent', difficulty=None):
+        if order not in ORDERS:
+            raise ApiError(400, f"Unknown order: {order}")
+        limit = max(0, min(limit, MAX_HISTORY_PAGE))
+        games = self.history_store.records(player, offset, limit, order, difficulty)
+        for record in games:
+            if record['daily']:
+                # Anyone can read any history, and a daily game's seed,
+                # target or winning guess would give the day's target away
+                record.update(seed=None, target=None, guesses=[])
+            else:
+                record['guesses'] = list(record['guesses'].values)
+        return {
+            'player': player,
+            'total': self.history_store.count(player, difficulty),
+            'games': games,
+        }
+
+    def player_stats(self, player):
+        with self._stats_lock:
+            session = self.players.get(player)
+            if session is None:
+                session = self.players[player] = self.sessions.open(player)
+            self.sessions.touch(session)
+            stats = self.sessions.stats(session)
+            reply = _stats_json(stats)
+            reply['by_difficulty'] = {
+                difficulty: _stats_json(by_difficulty)
+                for difficulty, by_difficulty in stats.by_difficulty.items()
+            }
+        reply['player'] = player
+        reply['achievements'] = [
+            {'key': rule.key, 'label': rule.label, 'unlocked_at': when}
+            for rule, when in self.achievement_engine.unlocked(player)
+        ]
+        return reply
+
+    def top(self, k=10, difficulty=None, bucket=None):
+        return {'entries': self.leaderboard.top(max(1, min(k, MAX_HISTORY_PAGE)), difficulty, bucket)}
+
+    def daily_summary(self):
+        challenge = self.daily_board.challenge()
+        reply = challenge.to_json()
+        reply.update(self.daily_board.summary(challenge.day))
+        return reply
+
+    # HTTP
+
+    async def dispatch(self, method, path, query, body):
+        # Returns (status, reply) for one request
+        parts = [unquote(part) for part in path.strip('/').split('/')]
+        if parts == ['games']:
+            _allow(method, 'POST')
+            return 201, self.start_game(
+                _text(body.get('player', "default"), 'player'),
+                _int(body.get('min_range', 1)),
+                _int(body.get('max_range', 100)),
+                body.get('difficulty', "Medium 😐"),
+                _bool(body.get('big_range', False), 'big_range'),
+                body.get('hint_mode', DEFAULT_HINT_MODE),
+            )
+        if len(parts) == 2 and parts[0] == 'games':
+            _allow(method, 'GET')
+            return 200, self.state(parts[1])
+        if len(parts) == 3 and parts[0] == 'games' and parts[2] == 'guess':
+            _allow(method, 'POST')
+            reply, finished = self.guess(parts[1], _int(body.get('value')))
+            if finished is not None:
+                reply.update(await self._in_thread(self.save_game, *finished))
+            return 200, reply
+        if len(parts) == 3 and parts[0] == 'games' and parts[2] == 'hint':
+            _allow(method, 'POST')
+            return 200, self.hint(parts[1])
+        if len(parts) == 3 and parts[0] == 'players' and parts[2] == 'history':
+            _allow(method, 'GET')
+            return 200, await self._in_thread(
+                self.history, parts[1], _int(query.get('offset', 0)), _int(query.get('limit', 10)),
+                query.get('order', 'recent'), query.get('difficulty')
+            )
+        if len(parts) == 3 and parts[0] == 'players' and parts[2] == 'stats':
+            _allow(method, 'GET')
+            return 200, await self._in_thread(self.player_stats, parts[1])
+        if parts == ['daily']:
+            if method == 'POST':
+                player = _text(body.get('player', "default"), 'player')
+                challenge = await self._in_thread(self.claim_daily, player)
+                return 201, self.start_daily(challenge, player)
+            _allow(method, 'GET')
+            return 200, await self._in_thread(self.daily_summary)
+        if parts == ['leaderboard']:
+            _allow(method, 'GET')
+            bucket = query.get('bucket')
+            return 200, await self._in_thread(
+                self.top, _int(query.get('k', 10)), query.get('difficulty'),
+                None if bucket is None else _int(bucket)
+            )
+        raise ApiError(404, f"No route for {path}")
+
+    async def _in_thread(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        self.loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self._handle, host, port)
+        asyncio.ensure_future(self._cleanup())
+        async with server:
+            await server.serve_forever()
+
+    async def _cleanup(self):
+        while True:
+            await asyncio.sleep(CLEANUP_INTERVAL)
+            self.expire_games()
+            await self._in_thread(self.evict_players)
+
+    def evict_players(self):
+        # Forget players whose stats the session manager has evicted
+        with self._stats_lock:
+            self.sessions.evict_idle()
+            for player in [p for p, session in self.players.items() if session.stats is None]:
+                del self.players[player]
+
+    async def _handle(self, reader, writer):
+        # One TCP connection, answering requests until either side closes it
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(413, {'error': "Request headers too large"}, False))
+                    break
+                request_line, *header_lines = head.decode('latin-1').split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ")
+                except ValueError:
+                    writer.write(_response(400, {'error': "Malformed request line"}, False))
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == "HTTP/1.0" else connection != 'close'
+
+                length = headers.get('content-length') or "0"
+                if not length.isdigit():
+                    writer.write(_response(400, {'error': "Bad Content-Length"}, False))
+                    break
+                length = int(length)
+                if length > MAX_BODY:
+                    writer.write(_response(413, {'error': "Request body too large"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    url = urlsplit(target)
+                    payload = json.loads(body) if body else {}
+                    if not isinstance(payload, dict):
+                        raise ApiError(400, "Request body must be a JSON object")
+                    status, reply = await self.dispatch(method, url.path, dict(parse_qsl(url.query)), payload)
+                except ApiError as e:
+                    status, reply = e.status, {'error': str(e)}
+                except ValueError as e:
+                    status, reply = 400, {'error': str(e)}
+                except Exception:
+                    # A bug or a store error: answer, and keep the connection
+                    log.exception("Error handling %s %s", method, target)
+                    status, reply = 500, {'error': "Internal server error"}
+                writer.write(_response(status, reply, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _allow(method, allowed):
+    if method != allowed:
+        raise ApiError(405, f"Use {allowed}")
+
+
+# Function to read an integer sent as a JSON number or as text, e.g. "2^63"
+def _int(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    number = parse_number(value) if isinstance(value, str) else None
+    if number is None:
+        raise ApiError(400, f"Expected a whole number, got {value!r}")
+    return number
+
+
+# Function to read a JSON true/false field; "false" or 0 is an error, not a truthy value
+def _bool(value, name):
+    if not isinstance(value, bool):
+        raise ApiError(400, f"Expected true or false for {name}, got {value!r}")
+    return value
+
+
+# Function to read a JSON string field
+def _text(value, name):
+    if not isinstance(value, str):
+        raise ApiError(400, f"Expected text for {name}, got {value!r}")
+    return value
+
+
+def _stats_json(stats):
+    return {
+        'games': stats.games,
+        'wins': stats.wins,
+        'win_rate': stats.win_rate,
+        'avg_attempts': stats.avg_attempts,
+        'min_attempts': stats.min_attempts,
+        'max_attempts': stats.max_attempts,
+        'avg_score': stats.avg_score,
+        'high_score': stats.high_score,
+        'recent_avg_score': stats.recent_avg_score,
+        'hintless_games': stats.hintless_games,
+    }
+
+
+def _response(status, reply, keep_alive):
+    body = json.dumps(reply, ensure_ascii=False).encode()
+    return (
+        f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode() + body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Number Master Pro HTTP/JSON game API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", help="history database (default: NUMBER_MASTER_DB or number_master.db)")
+    args = parser.parse_args(argv)
+    api = GameApi(HistoryStore(args.db), Leaderboard(args.db), AchievementEngine(args.db), DailyBoard(args.db))
+    asyncio.run(api.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
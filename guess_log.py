@@ -0,0 +1,80 @@
+# Compact guess log for one game.
+#
+# Guesses are kept in a typed array (int32 when the range allows it) with a
+# parallel array of one-byte result codes, and the target is stored once,
+# instead of one dict per guess repeating the target and result text.
+# Iterating a GuessLog still yields the {'attempt', 'guess', 'target',
+# 'result'} dicts the History tab renders.
+from array import array
+
+from engine import RESULT_NAMES, evaluate_guess
+
+INT32_MIN = -2 ** 31
+INT32_MAX = 2 ** 31 - 1
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+# Function to pick the smallest storage that holds every value in the range
+def _storage_for(min_range, max_range):
+    if min_range is None or max_range is None:
+        return array('q')
+    if INT32_MIN <= min_range and max_range <= INT32_MAX:
+        return array('i')
+    if INT64_MIN <= min_range and max_range <= INT64_MAX:
+        return array('q')
+    # Big range mode: plain Python ints
+    return []
+
+
+class GuessLog:
+    __slots__ = ('target', 'values', 'codes')
+
+    def __init__(self, target, min_range=None, max_range=None):
+        self.target = target
+        self.values = _storage_for(min_range, max_range)
+        self.codes = array('b')
+
+    @classmethod
+    def from_values(cls, target, values, min_range=None, max_range=None):
+        log = cls(target, min_range, max_range)
+        for value in values:
+            log.append(value)
+        return log
+
+    @classmethod
+    def from_dicts(cls, target, guesses, min_range=None, max_range=None):
+        # Convert the older list-of-dicts guess format
+        return cls.from_values(target, (g['guess'] for g in guesses), min_range, max_range)
+
+    def append(self, guess):
+        result = evaluate_guess(guess, self.target)
+        self.values.append(guess)
+        self.codes.append(result)
+        return result
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.codes)
+        return {
+            'attempt': i + 1,
+            'guess': self.values[i],
+            'target': self.target,
+            'result': RESULT_NAMES[self.codes[i]],
+        }
+
+    def __iter__(self):
+        target = self.target
+        for i, (value, code) in enumerate(zip(self.values, self.codes), start=1):
+            yield {'attempt': i, 'guess': value, 'target': target, 'result': RESULT_NAMES[code]}
+
+    def columns(self):
+        # Column data for a guess chart, ready for pd.DataFrame()
+        return {
+            'attempt': range(1, len(self.codes) + 1),
+            'guess': self.values,
+            'result': [RESULT_NAMES[code] for code in self.codes],
+        }
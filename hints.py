@@ -0,0 +1,327 @@
+# Hint providers for Number Master Pro.
+#
+# Each kind of hint is a HintProvider with:
+#   - a key, and a cost in hints charged against the score;
+#   - fact(): what it reveals about a target, as a small tuple, e.g.
+#     ('parity', 1), ('divisor', 5), ('range', 40, 60), ('residue', 7, 3),
+#     ('digit_root', 4) or ('bits', 3, 5);
+#   - gain(): the information (bits) it is expected to give about the
+#     feasible set, i.e. the entropy of its answer over the numbers still
+#     possible;
+#   - describe(): the message shown to the player.
+#
+# Every hint except the range hint restricts the target's residue modulo some
+# small number, so a feasible set is an interval plus a residue pattern (see
+# solver.CandidateSet). For each (pattern, provider) pair, the pattern after
+# each possible answer is computed once and cached. A provider's gain then
+# costs one O(log period) count per answer, whatever the size of the range.
+#
+# A hint mode is a tuple of providers. 'classic' gives them in a fixed order
+# (parity, divisor, range). 'adaptive' offers the provider with the highest
+# gain per cost that hasn't been used yet. It decides from the range and the
+# earlier hints, not from guess feedback, so a game is still reproduced by its
+# seed and the number of hints taken (see replay.py).
+import math
+import random
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from functools import lru_cache
+
+HINT_DIVISORS = (3, 5, 7)
+DEFAULT_HINT_MODE = 'classic'
+
+
+class HintProvider(ABC):
+    key = None
+    cost = 1
+
+    @abstractmethod
+    def fact(self, target, min_range, max_range, rng=random):
+        pass
+
+    @abstractmethod
+    def gain(self, feasible, min_range, max_range):
+        pass
+
+    @abstractmethod
+    def describe(self, hint_number, fact):
+        pass
+
+    def available(self, min_range, max_range):
+        return True
+
+
+class ResidueHint(HintProvider):
+    # A hint that reveals the target's class modulo `modulus`; subclasses
+    # list every possible answer in answers()
+    modulus = None
+
+    @abstractmethod
+    def answers(self):
+        pass
+
+    @abstractmethod
+    def allowed(self, fact, r):
+        # Whether residue r (mod self.modulus) is consistent with fact
+        pass
+
+    def gain(self, feasible, min_range, max_range):
+        counts = [
+            count_between(feasible.low, feasible.high, modulus, residues)
+            for modulus, residues in outcome_table(self.key, feasible.modulus, feasible.residues)
+        ]
+        return entropy(counts)
+
+
+class ParityHint(ResidueHint):
+    key = 'parity'
+    modulus = 2
+
+    def fact(self, target, min_range, max_range, rng=random):
+        return ('parity', target % 2)
+
+    def answers(self):
+        return [('parity', 0), ('parity', 1)]
+
+    def allowed(self, fact, r):
+        return r % 2 == fact[1]
+
+    def describe(self, hint_number, fact):
+        return f"Hint #{hint_number}: The number is {'even 🔢' if fact[1] == 0 else 'odd 🔢'}."
+
+
+class DivisorHint(ResidueHint):
+    # The first of 3, 5 and 7 that divides the target, or None
+    key = 'divisor'
+    modulus = math.prod(HINT_DIVISORS)
+
+    def fact(self, target, min_range, max_range, rng=random):
+        for div in HINT_DIVISORS:
+            if target % div == 0:
+                return ('divisor', div)
+        return ('divisor', None)
+
+    def answers(self):
+        return [('divisor', div) for div in HINT_DIVISORS] + [('divisor', None)]
+
+    def allowed(self, fact, r):
+        # Naming a divisor also rules out the ones before it
+        value = fact[1]
+        ruled_out = HINT_DIVISORS if value is None else HINT_DIVISORS[:HINT_DIVISORS.index(value)]
+        return (value is None or r % value == 0) and all(r % d for d in ruled_out)
+
+    def describe(self, hint_number, fact):
+        if fact[1] is None:
+            return f"Hint #{hint_number}: The number is not divisible by 3, 5, or 7 ❌."
+        return f"Hint #{hint_number}: The number is divisible by {fact[1]} ✖️."
+
+
+class RangeHint(HintProvider):
+    # A window around the target, each side a random 1 to a quarter of the
+    # range wide, clipped to the range
+    key = 'range'
+
+    def fact(self, target, min_range, max_range, rng=random):
+        # At least 1, so ranges of fewer than 5 numbers still get a window
+        half_width = max(1, (max_range - min_range) // 4)
+        lower = target - rng.randint(1, half_width)
+        upper = target + rng.randint(1, half_width)
+        return ('range', max(lower, min_range), min(upper, max_range))
+
+    def gain(self, feasible, min_range, max_range):
+        # Estimate: the window averages half_width + 2 numbers, and the
+        # feasible numbers are assumed evenly spread over their interval
+        span = feasible.high - feasible.low + 1
+        if span <= 1:
+            return 0.0
+        window = min(span, max(1, (max_range - min_range) // 4) + 2)
+        return math.log2(span / window)
+
+    def describe(self, hint_number, fact):
+        return f"Hint #{hint_number}: The number is between {fact[1]} and {fact[2]} 🔍."
+
+
+class ModuloHint(ResidueHint):
+    cost = 2
+
+    def __init__(self, modulus):
+        self.modulus = modulus
+        self.key = f"residue{modulus}"
+
+    def fact(self, target, min_range, max_range, rng=random):
+        return ('residue', self.modulus, target % self.modulus)
+
+    def answers(self):
+        return [('residue', self.modulus, r) for r in range(self.modulus)]
+
+    def allowed(self, fact, r):
+        return r % fact[1] == fact[2]
+
+    def describe(self, hint_number, fact):
+        return f"Hint #{hint_number}: The number leaves a remainder of {fact[2]} when divided by {fact[1]} ➗."
+
+
+class DigitRootHint(ResidueHint):
+    # Repeated digit sum, which is the target mod 9 (with 9 for multiples of 9)
+    key = 'digit_root'
+    modulus = 9
+    cost = 2
+
+    def fact(self, target, min_range, max_range, rng=random):
+        return ('digit_root', 1 + (target - 1) % 9)
+
+    def answers(self):
+        return [('digit_root', k) for k in range(1, 10)]
+
+    def allowed(self, fact, r):
+        return r % 9 == fact[1] % 9
+
+    def available(self, min_range, max_range):
+        # Digit sums are only defined for positive numbers
+        return min_range >= 1
+
+    def describe(self, hint_number, fact):
+        return (f"Hint #{hint_number}: Adding up the number's digits, over and over until one digit "
+                f"is left, gives {fact[1]} 🔁.")
+
+
+class BitsHint(ResidueHint):
+    # The last `bits` binary digits
+    cost = 2
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.modulus = 2 ** bits
+        self.key = f"bits{bits}"
+
+    def fact(self, target, min_range, max_range, rng=random):
+        return ('bits', self.bits, target % self.modulus)
+
+    def answers(self):
+        return [('bits', self.bits, value) for value in range(self.modulus)]
+
+    def allowed(self, fact, r):
+        return r % (2 ** fact[1]) == fact[2]
+
+    def describe(self, hint_number, fact):
+        return f"Hint #{hint_number}: In binary, the number ends in {fact[2]:0{fact[1]}b} 💻."
+
+
+PARITY = ParityHint()
+DIVISOR = DivisorHint()
+RANGE = RangeHint()
+
+PROVIDERS = {
+    provider.key: provider
+    for provider in (PARITY, DIVISOR, RANGE, ModuloHint(7), DigitRootHint(), BitsHint(3))
+}
+
+HINT_MODES = {
+    'classic': (PARITY, DIVISOR, RANGE),
+    'adaptive': tuple(PROVIDERS.values()),
+}
+
+
+# Function to get the key of the provider that gave a fact
+def fact_key(fact):
+    kind = fact[0]
+    if kind == 'residue':
+        return f"residue{fact[1]}"
+    if kind == 'bits':
+        return f"bits{fact[1]}"
+    return kind
+
+
+# Function to turn a hint fact into the message shown to the player
+def format_fact(hint_number, fact):
+    return PROVIDERS[fact_key(fact)].describe(hint_number, fact)
+
+
+def fact_cost(fact):
+    return PROVIDERS[fact_key(fact)].cost
+
+
+# Residue patterns: the residues mod `modulus` a number may have, sorted
+
+# Function to restrict a residue pattern by a residue hint's fact
+@lru_cache(maxsize=4096)
+def restrict(modulus, residues, fact):
+    provider = PROVIDERS[fact_key(fact)]
+    new_modulus = math.lcm(modulus, provider.modulus)
+    residue_set = set(residues)
+    return new_modulus, tuple(
+        r for r in range(new_modulus)
+        if r % modulus in residue_set and provider.allowed(fact, r % provider.modulus)
+    )
+
+
+# Function to get the residue pattern implied by a tuple of hint facts
+@lru_cache(maxsize=None)
+def hint_residues(facts):
+    modulus, residues = 1, (0,)
+    for fact in facts:
+        if fact[0] != 'range':
+            modulus, residues = restrict(modulus, residues, fact)
+    return modulus, residues
+
+
+# Function to get, for a pattern, the pattern left by each of a provider's answers
+@lru_cache(maxsize=4096)
+def outcome_table(key, modulus, residues):
+    return tuple(restrict(modulus, residues, fact) for fact in PROVIDERS[key].answers())
+
+
+# Function to count the numbers in [low, high] matching a residue pattern
+def count_between(low, high, modulus, residues):
+    if low > high or not residues:
+        return 0
+
+    def rank(x):
+        q, r = divmod(x, modulus)
+        return q * len(residues) + bisect_left(residues, r)
+    return rank(high + 1) - rank(low)
+
+
+def entropy(counts):
+    total = sum(counts)
+    if not total:
+        return 0.0
+    return -sum(n / total * math.log2(n / total) for n in counts if n)
+
+
+class FeasibleSet:
+    # The numbers a range and some hint facts allow: an interval and a
+    # residue pattern, as in solver.CandidateSet
+    __slots__ = ('low', 'high', 'modulus', 'residues')
+
+    def __init__(self, min_range, max_range, facts=()):
+        self.low, self.high = min_range, max_range
+        for fact in facts:
+            if fact[0] == 'range':
+                self.low, self.high = max(self.low, fact[1]), min(self.high, fact[2])
+        self.modulus, self.residues = hint_residues(tuple(f for f in facts if f[0] != 'range'))
+
+
+# Function to rank a mode's unused providers for a game, most informative
+# (per hint of cost) first, as (provider, gain) pairs
+def rank_providers(mode, facts, min_range, max_range):
+    used = {fact_key(fact) for fact in facts}
+    feasible = FeasibleSet(min_range, max_range, facts)
+    ranked = [
+        (provider, provider.gain(feasible, min_range, max_range))
+        for provider in HINT_MODES[mode]
+        if provider.key not in used and provider.available(min_range, max_range)
+    ]
+    # Stable, so ties keep the mode's order
+    ranked.sort(key=lambda item: item[1] / item[0].cost, reverse=True)
+    return ranked
+
+
+# Function to pick the provider for a game's next hint, or None if the mode
+# has nothing left to offer
+def next_provider(mode, facts, min_range, max_range):
+    if mode == 'classic':
+        providers = HINT_MODES['classic']
+        return providers[len(facts)] if len(facts) < len(providers) else None
+    ranked = rank_providers(mode, facts, min_range, max_range)
+    return ranked[0][0] if ranked else None
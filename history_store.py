@@ -0,0 +1,244 @@
+# Persistent game history for Number Master Pro.
+#
+# Finished games are appended to a local SQLite database, one row per game,
+# and read back lazily in chunks so a long history never has to sit in memory.
+# Guesses are stored as a JSON list of values and come back as a GuessLog.
+import json
+import os
+import sqlite3
+import threading
+
+from guess_log import GuessLog
+
+DEFAULT_PATH = "number_master.db"
+
+# Record fields, in the order the app writes them
+FIELDS = (
+    'min_range', 'max_range', 'attempts', 'score', 'time_taken', 'difficulty',
+    'target', 'hints_used', 'date', 'guesses', 'seed', 'big_range', 'hint_mode', 'daily',
+)
+GUESSES_COLUMN = FIELDS.index('guesses')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    -- min_range, max_range and target have no declared type, so values
+    -- beyond 64 bits can be kept as text without being coerced to REAL
+    min_range,
+    max_range,
+    attempts INTEGER,
+    score INTEGER,
+    time_taken REAL,
+    difficulty TEXT,
+    target,
+    hints_used INTEGER,
+    date TEXT,
+    guesses TEXT,
+    -- per-game RNG seed (see engine.seeded_game), so the game can be replayed
+    seed INTEGER,
+    big_range INTEGER,
+    -- hints.HINT_MODES key; NULL for classic
+    hint_mode TEXT,
+    -- the daily challenge's day (YYYY-MM-DD); NULL for other games
+    daily TEXT
+);
+CREATE INDEX IF NOT EXISTS games_player ON games (player, id);
+CREATE INDEX IF NOT EXISTS games_player_difficulty ON games (player, difficulty, id);
+"""
+
+# Columns added after the first schema, added to older databases on open
+ADDED_COLUMNS = {
+    'seed': "INTEGER",
+    'big_range': "INTEGER",
+    'hint_mode': "TEXT",
+    'daily': "TEXT",
+}
+
+# Fields that may hold integers too large for SQLite (big range mode)
+BIG_INT_FIELDS = ('min_range', 'max_range', 'target')
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+INSERT_SQL = (
+    f"INSERT INTO games (player, {', '.join(FIELDS)}) "
+    f"VALUES (?, {', '.join('?' * len(FIELDS))})"
+)
+
+# Sort orders accepted by HistoryStore.records()
+ORDERS = {
+    'oldest': "id",
+    'recent': "id DESC",
+    'score': "score DESC, id",
+    'attempts': "attempts, id",
+}
+
+
+class HistoryStore:
+    # One connection shared by every session; sqlite3 calls are serialised
+    # with a lock since Streamlit runs each session on its own thread.
+    def __init__(self, path=None):
+        # NUMBER_MASTER_DB is read here rather than at import, so it can be
+        # changed per store (e.g. by the benchmarks)
+        if path is None:
+            path = os.environ.get("NUMBER_MASTER_DB", DEFAULT_PATH)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(games)")}
+        for name, declared_type in ADDED_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE games ADD COLUMN {name} {declared_type}")
+        self._conn.commit()
+
+    def append(self, record, player="default"):
+        with self._lock, self._conn:
+            cursor = self._conn.execute(INSERT_SQL, _to_row(player, record))
+        return cursor.lastrowid
+
+    def append_many(self, games):
+        # Bulk insert (player, record) pairs in one transaction; returns the count
+        rows = [_to_row(player, record) for player, record in games]
+        with self._lock, self._conn:
+            self._conn.executemany(INSERT_SQL, rows)
+        return len(rows)
+
+    def count(self, player="default", difficulty=None):
+        where, params = _where(player, difficulty)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM games WHERE {where}", params
+            ).fetchone()[0]
+
+    def records(self, player="default", offset=0, limit=None, order='oldest', difficulty=None):
+        # One page of records, optionally filtered by difficulty
+        where, params = _where(player, difficulty)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(FIELDS)} FROM games WHERE {where} "
+                f"ORDER BY {ORDERS[order]} LIMIT ? OFFSET ?",
+                params + (-1 if limit is None else limit, offset)
+            ).fetchall()
+        return [_to_record(row) for row in rows]
+
+    def iter_records(self, player="default", chunk_size=500):
+        # Keyset pagination, so each chunk is an index range scan
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {', '.join(FIELDS)} FROM games "
+                    f"WHERE player = ? AND id > ? ORDER BY id LIMIT ?",
+                    (player, last_id, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _to_record(row)
+            last_id = rows[-1][0]
+
+    def iter_columns(self, columns, first_id=1, last_id=None, chunk_size=5000, player=None):
+        # Raw (id, player, *columns) rows for games with first_id <= id <=
+        # last_id, in id order, without decoding guesses; for bulk analytics,
+        # or for one player's chart columns
+        for column in columns:
+            if column not in FIELDS:
+                raise ValueError(f"Unknown column: {column}")
+        if last_id is None:
+            last_id = INT64_MAX
+        where, params = "id >= ? AND id <= ?", ()
+        if player is not None:
+            where, params = "player = ? AND " + where, (player,)
+        while first_id <= last_id:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, player, {', '.join(columns)} FROM games "
+                    f"WHERE {where} ORDER BY id LIMIT ?",
+                    params + (first_id, last_id, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            first_id = rows[-1][0] + 1
+
+    def id_range(self):
+        # (smallest id, largest id), or (None, None) for an empty store
+        with self._lock:
+            return self._conn.execute("SELECT MIN(id), MAX(id) FROM games").fetchone()
+
+    def players(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT player FROM games")]
+
+    def iter_games(self, chunk_size=500):
+        # Every player's games in the order they were saved, as (player, record)
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, player, {', '.join(FIELDS)} FROM games "
+                    f"WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row[1], _to_record((row[0],) + row[2:])
+            last_id = rows[-1][0]
+
+    def get(self, game_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT id, {', '.join(FIELDS)} FROM games WHERE id = ?", (game_id,)
+            ).fetchone()
+        return _to_record(row) if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _where(player, difficulty):
+    if difficulty is None:
+        return "player = ?", (player,)
+    return "player = ? AND difficulty = ?", (player, difficulty)
+
+
+# Function to get the guessed values to store; results are re-derived from
+# the target when the record is read back
+def _guess_values(guesses):
+    if not guesses:
+        return []
+    if isinstance(guesses, GuessLog):
+        return list(guesses.values)
+    return [g['guess'] for g in guesses]
+
+
+def _to_row(player, record):
+    row = [_to_sql(record.get(field)) for field in FIELDS]
+    row[GUESSES_COLUMN] = json.dumps(_guess_values(record.get('guesses')))
+    return [player] + row
+
+
+def _to_sql(value):
+    if isinstance(value, int) and not INT64_MIN <= value <= INT64_MAX:
+        return str(value)
+    return value
+
+
+def _to_record(row):
+    record = dict(zip(FIELDS, row[1:]))
+    record['id'] = row[0]
+    record['big_range'] = bool(record['big_range'])
+    for field in BIG_INT_FIELDS:
+        if isinstance(record[field], str):
+            record[field] = int(record[field])
+    values = json.loads(record['guesses']) if record['guesses'] else []
+    if values and isinstance(values[0], dict):
+        record['guesses'] = GuessLog.from_dicts(record['target'], values, record['min_range'], record['max_range'])
+    else:
+        record['guesses'] = GuessLog.from_values(record['target'], values, record['min_range'], record['max_range'])
+    return record
@@ -0,0 +1,216 @@
+# Global leaderboard for Number Master Pro.
+#
+# Winning scores are stored in SQLite with indexes on (difficulty, range
+# bucket, score), so top-K queries read only K index entries. Ranks come from
+# in-memory Fenwick trees of score counts, one per leaderboard partition,
+# rebuilt from the table's per-score counts at startup. The trees only store
+# the nodes scores have touched, so memory follows the number of distinct
+# scores, not how large they are. Submitting a score and looking up a rank
+# are both O(log highest score): at most 64 steps for any SQLite integer.
+# Scores are listed under a name derived from the player id, never the id
+# itself, since the id is all it takes to open a player's history.
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from history_store import DEFAULT_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboard (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    difficulty TEXT,
+    range_bucket INTEGER,
+    date TEXT
+);
+CREATE INDEX IF NOT EXISTS leaderboard_score ON leaderboard (score DESC, id);
+CREATE INDEX IF NOT EXISTS leaderboard_difficulty ON leaderboard (difficulty, score DESC, id);
+CREATE INDEX IF NOT EXISTS leaderboard_bucket ON leaderboard (range_bucket, score DESC, id);
+CREATE INDEX IF NOT EXISTS leaderboard_difficulty_bucket ON leaderboard (difficulty, range_bucket, score DESC, id);
+"""
+
+
+# Function to bucket a range by its size: bucket k holds sizes up to 10^k.
+# Big range scores are on a log scale, so those games get buckets of their
+# own, -k, rather than being ranked against linear scores.
+def range_bucket(min_range, max_range, big_range=False):
+    bucket = len(str(max_range - min_range))
+    return -bucket if big_range else bucket
+
+
+# Function to get the name a player is listed under: a one-way hash of their id
+def player_name(player):
+    return f"Player {hashlib.sha256(player.encode()).hexdigest()[:8]}"
+
+
+# Function to describe a range bucket
+def range_bucket_label(bucket):
+    if bucket < 0:
+        return f"{range_bucket_label(-bucket)}, big range"
+    if bucket <= 6:
+        return f"up to {10 ** bucket:,}"
+    return f"up to 10^{bucket}"
+
+
+class ScoreIndex:
+    # Fenwick tree counting how many games scored each value, over scores
+    # 0 to size - 1. Nodes are kept in a dict, so only those on the paths of
+    # scores actually added take memory. size is a power of two, doubled when
+    # a higher score arrives: the new root covers every earlier score and
+    # the nodes under it are still empty, so growing costs O(1).
+    __slots__ = ('tree', 'size', 'total')
+
+    def __init__(self):
+        self.tree = {}
+        self.size = 1
+        self.total = 0
+
+    def add(self, score, count=1):
+        if score < 0:
+            raise ValueError(f"Scores can't be negative: {score}")
+        while score >= self.size:
+            if self.total:
+                self.tree[2 * self.size] = self.total
+            self.size *= 2
+        tree, size = self.tree, self.size
+        i = score + 1
+        try:
+            while i <= size:
+                tree[i] = tree.get(i, 0) + count
+                i += i & -i
+        except BaseException:
+            # Undo the nodes already updated, so the tree stays consistent
+            j = score + 1
+            while j < i:
+                tree[j] -= count
+                j += j & -j
+            raise
+        self.total += count
+
+    def count_at_most(self, score):
+        i = min(score + 1, self.size)
+        count = 0
+        tree = self.tree
+        while i > 0:
+            count += tree.get(i, 0)
+            i -= i & -i
+        return count
+
+    def count_above(self, score):
+        return self.total - self.count_at_most(score)
+
+    def find(self, k):
+        # Smallest score with count_at_most(score) >= k, for 1 <= k <= total:
+        # the k-th lowest score
+        tree = self.tree
+        pos, step = 0, self.size
+        while step:
+            node = tree.get(pos + step, 0)
+            if pos + step <= self.size and node < k:
+                pos += step
+                k -= node
+            step //= 2
+        # Node pos + 1 holds score pos
+        return pos
+
+
+class Leaderboard:
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get("NUMBER_MASTER_DB", DEFAULT_PATH)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        # (difficulty or None, range bucket or None) -> ScoreIndex
+        self._indexes = {}
+        # One add per distinct score in each partition, not one per game
+        for difficulty, bucket, score, count in self._conn.execute(
+            "SELECT difficulty, range_bucket, score, COUNT(*) FROM leaderboard "
+            "GROUP BY difficulty, range_bucket, score"
+        ):
+            self._index(score, difficulty, bucket, count)
+
+    def _index(self, score, difficulty, bucket, count=1):
+        # Add a score to each partition it belongs to: all of them, or, if
+        # one fails, none
+        indexes = []
+        for key in ((None, None), (difficulty, None), (None, bucket), (difficulty, bucket)):
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = ScoreIndex()
+            indexes.append(index)
+        added = []
+        try:
+            for index in indexes:
+                index.add(score, count)
+                added.append(index)
+        except BaseException:
+            for index in added:
+                index.add(score, -count)
+            raise
+
+    def submit(self, player, score, difficulty, min_range, max_range, date=None, big_range=False):
+        # Record a winning score; returns its rank among games with the same
+        # difficulty and range bucket
+        score = int(score)
+        bucket = range_bucket(min_range, max_range, big_range)
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with self._lock:
+            # Indexed inside the transaction, so a row is only kept if it was indexed
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO leaderboard (player, score, difficulty, range_bucket, date) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (player, score, difficulty, bucket, date)
+                )
+                self._index(score, difficulty, bucket)
+            return self._indexes[(difficulty, bucket)].count_above(score) + 1
+
+    def rank(self, score, difficulty=None, bucket=None):
+        # 1-based rank a score would have; ties share the better rank
+        with self._lock:
+            index = self._indexes.get((difficulty, bucket))
+            return (index.count_above(score) if index else 0) + 1
+
+    def count(self, difficulty=None, bucket=None):
+        with self._lock:
+            index = self._indexes.get((difficulty, bucket))
+            return index.total if index else 0
+
+    def top(self, k=10, difficulty=None, bucket=None):
+        where, params = [], []
+        if difficulty is not None:
+            where.append("difficulty = ?")
+            params.append(difficulty)
+        if bucket is not None:
+            where.append("range_bucket = ?")
+            params.append(bucket)
+        sql = "SELECT player, score, difficulty, range_bucket, date FROM leaderboard"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY score DESC, id LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [k]).fetchall()
+        return [
+            {'player': player_name(p), 'score': s, 'difficulty': d, 'range_bucket': b, 'date': t}
+            for p, s, d, b, t in rows
+        ]
+
+    def buckets(self):
+        with self._lock:
+            # Normal buckets first, then big range ones, each smallest first
+            return sorted(
+                {bucket for _, bucket in self._indexes if bucket is not None},
+                key=lambda bucket: (bucket < 0, abs(bucket))
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
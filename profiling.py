@@ -0,0 +1,228 @@
+# Opt-in rerun profiling for Number Master Pro.
+#
+# Enable with the NUMBER_MASTER_PROFILE=1 environment variable or the
+# ?profile=1 query parameter. app.py calls profile.mark(section) at the end of
+# each section (CSS, session state, sidebar, each tab), and every rerun's
+# timings and element count are kept in a rolling window, appended to a JSONL
+# log and, if NUMBER_MASTER_PROFILE_PORT is set, served in Prometheus text
+# format at http://localhost:<port>/metrics. If the port can't be bound, the
+# error is logged and shown in the debug panel, and profiling carries on
+# without the endpoint.
+#
+# A rerun cut short by st.rerun(), st.stop() or an error never reaches its
+# finish() call. Its profile waits in the session state, and the session's
+# next rerun records it, timing the section it stopped in as "interrupted"
+# (up to the last element it emitted).
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLE_ENV = "NUMBER_MASTER_PROFILE"
+LOG_ENV = "NUMBER_MASTER_PROFILE_LOG"
+PORT_ENV = "NUMBER_MASTER_PROFILE_PORT"
+DEFAULT_LOG_PATH = "number_master_profile.jsonl"
+HISTORY_SIZE = 200
+# Session state key holding the profile of the rerun in progress
+PENDING_KEY = "rerun_profile"
+
+log = logging.getLogger(__name__)
+
+
+# Function to decide whether this rerun should be profiled
+def profiling_enabled(query_params=None):
+    if os.environ.get(ENABLE_ENV, "") not in ("", "0"):
+        return True
+    return query_params is not None and query_params.get("profile", "") not in ("", "0")
+
+
+class RerunProfile:
+    __slots__ = ('started', 'last', 'active', 'sections', 'elements', 'tab')
+
+    def __init__(self):
+        self.started = self.last = self.active = time.perf_counter()
+        self.sections = []
+        self.elements = 0
+        self.tab = None
+
+    def mark(self, section, now=None):
+        # Record the time since the previous mark as `section`
+        if now is None:
+            now = time.perf_counter()
+        self.sections.append((section, now - self.last))
+        self.last = self.active = now
+
+    @property
+    def total(self):
+        return self.last - self.started
+
+    def to_dict(self):
+        return {
+            'time': time.time(),
+            'tab': self.tab,
+            'total': self.total,
+            'elements': self.elements,
+            'sections': dict(self.sections),
+        }
+
+
+class _NullProfile:
+    # Stand-in used when profiling is off, so marks cost almost nothing
+    __slots__ = ('tab',)
+
+    def __init__(self):
+        self.tab = None
+
+    def mark(self, section):
+        pass
+
+
+class Profiler:
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.recent = deque(maxlen=history_size)
+        self.reruns = 0
+        # section -> [count, total seconds, max seconds]
+        self.totals = {}
+        self.elements = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._server = None
+        # Why the metrics endpoint couldn't start, if it couldn't
+        self.serve_error = None
+
+    def start(self, enabled, state=None):
+        # `state` is the session state, where the profile waits until finish()
+        if state is not None:
+            unfinished = state.get(PENDING_KEY)
+            if unfinished is not None:
+                unfinished.mark("interrupted", unfinished.active)
+                self.finish(unfinished, state)
+        if not enabled:
+            # Don't let element counts land on a profile left by an earlier rerun
+            self._local.profile = None
+            return _NullProfile()
+        _count_elements(self)
+        port = os.environ.get(PORT_ENV)
+        if port:
+            with self._lock:
+                if self._server is None and self.serve_error is None:
+                    self.serve(int(port))
+        profile = RerunProfile()
+        self._local.profile = profile
+        if state is not None:
+            state[PENDING_KEY] = profile
+        return profile
+
+    def current(self):
+        return getattr(self._local, 'profile', None)
+
+    def finish(self, profile, state=None):
+        if not isinstance(profile, RerunProfile):
+            return
+        if state is not None and state.get(PENDING_KEY) is profile:
+            del state[PENDING_KEY]
+        if self.current() is profile:
+            self._local.profile = None
+        with self._lock:
+            self.reruns += 1
+            self.elements += profile.elements
+            for section, seconds in profile.sections + [('total', profile.total)]:
+                entry = self.totals.setdefault(section, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+            self.recent.append(profile.to_dict())
+        with open(os.environ.get(LOG_ENV, DEFAULT_LOG_PATH), "a") as f:
+            f.write(json.dumps(profile.to_dict()) + "\n")
+
+    def averages(self):
+        # Mean and max seconds per section over all profiled reruns
+        with self._lock:
+            return {
+                section: (total / count, peak)
+                for section, (count, total, peak) in self.totals.items()
+            }
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP number_master_reruns_total Profiled Streamlit reruns.",
+            "# TYPE number_master_reruns_total counter",
+            f"number_master_reruns_total {self.reruns}",
+            "# HELP number_master_elements_total Streamlit elements emitted in profiled reruns.",
+            "# TYPE number_master_elements_total counter",
+            f"number_master_elements_total {self.elements}",
+            "# HELP number_master_section_seconds Time spent per app section.",
+            "# TYPE number_master_section_seconds summary",
+        ]
+        with self._lock:
+            for section, (count, total, peak) in sorted(self.totals.items()):
+                label = section.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'number_master_section_seconds_sum{{section="{label}"}} {total}')
+                lines.append(f'number_master_section_seconds_count{{section="{label}"}} {count}')
+                lines.append(f'number_master_section_seconds_max{{section="{label}"}} {peak}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port):
+        # Local metrics endpoint: /metrics (Prometheus text) and /profiles
+        # (JSONL). Returns False, keeping the reason in serve_error, if the
+        # port can't be bound (e.g. another process already uses it).
+        profiler = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = profiler.prometheus_text()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/profiles":
+                    with profiler._lock:
+                        body = "".join(json.dumps(p) + "\n" for p in profiler.recent)
+                    content_type = "application/x-ndjson"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        except OSError as e:
+            self.serve_error = f"Can't serve profiler metrics on port {port}: {e.strerror or e}"
+            log.warning(self.serve_error)
+            return False
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return True
+
+
+# Function to count emitted Streamlit elements by wrapping DeltaGenerator._enqueue.
+# This is a private Streamlit API, so if it is missing element counts stay at 0.
+def _count_elements(profiler):
+    try:
+        from streamlit.delta_generator import DeltaGenerator
+    except ImportError:
+        return
+    enqueue = getattr(DeltaGenerator, '_enqueue', None)
+    if enqueue is None or getattr(enqueue, '_number_master_counted', False):
+        return
+
+    def counting_enqueue(self, *args, **kwargs):
+        profile = profiler.current()
+        if profile is not None:
+            profile.elements += 1
+            profile.active = time.perf_counter()
+        return enqueue(self, *args, **kwargs)
+
+    counting_enqueue._number_master_counted = True
+    DeltaGenerator._enqueue = counting_enqueue
+
+
+profiler = Profiler()
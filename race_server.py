@@ -0,0 +1,258 @@
+# Multiplayer race mode for Number Master Pro.
+#
+# Several players join a room, one target is drawn for the room, and the first
+# player to guess it wins. RaceServer keeps every room in memory and runs on a
+# single asyncio event loop: room updates never await, so each one is atomic
+# on the loop thread and no per-room lock is needed on the guess path.
+#
+# The server can be used in three ways:
+#   - directly from asyncio code, calling create_room/join/guess;
+#   - from other threads (e.g. Streamlit sessions) via start_background() and
+#     call(), which runs each call on the loop thread;
+#   - over TCP with newline-delimited JSON: python race_server.py --port 8765
+import argparse
+import asyncio
+import json
+import random
+import string
+import threading
+import time
+
+from engine import CORRECT, DIFFICULTIES, RESULT_NAMES, difficulty_settings, evaluate_guess, range_error
+
+ROOM_CODE_LENGTH = 6
+ROOM_TTL = 60 * 60
+CLEANUP_INTERVAL = 60
+
+
+class RaceError(Exception):
+    pass
+
+
+class Player:
+    __slots__ = ('name', 'attempts', 'won', 'finish_time')
+
+    def __init__(self, name):
+        self.name = name
+        self.attempts = 0
+        self.won = False
+        self.finish_time = None
+
+
+class Room:
+    __slots__ = (
+        'room_id', 'target', 'min_range', 'max_range', 'max_attempts', 'difficulty',
+        'players', 'winner', 'created', 'last_active', 'listeners',
+    )
+
+    def __init__(self, room_id, target, min_range, max_range, max_attempts, difficulty):
+        self.room_id = room_id
+        self.target = target
+        self.min_range = min_range
+        self.max_range = max_range
+        self.max_attempts = max_attempts
+        self.difficulty = difficulty
+        self.players = {}
+        self.winner = None
+        self.created = self.last_active = time.time()
+        # Callables receiving each broadcast event; created on first join
+        self.listeners = None
+
+    def snapshot(self):
+        return {
+            'type': 'room',
+            'room': self.room_id,
+            'min_range': self.min_range,
+            'max_range': self.max_range,
+            'difficulty': self.difficulty,
+            'max_attempts': None if self.max_attempts == float('inf') else self.max_attempts,
+            'winner': self.winner,
+            'players': [
+                {'name': p.name, 'attempts': p.attempts, 'won': p.won}
+                for p in self.players.values()
+            ],
+        }
+
+
+class RaceServer:
+    def __init__(self, seed=None):
+        self.rooms = {}
+        self.rng = random.Random(seed)
+        self.loop = None
+
+    # Room operations (run on the event loop thread)
+
+    def create_room(self, min_range=1, max_range=100, difficulty="Medium 😐"):
+        # Races have no big range mode, so rooms keep to the normal limits
+        error = range_error(min_range, max_range)
+        if error:
+            raise RaceError(error)
+        if difficulty not in DIFFICULTIES:
+            raise RaceError(f"Unknown difficulty: {difficulty}")
+        room_id = self._new_room_id()
+        max_attempts, _ = difficulty_settings(difficulty, min_range, max_range)
+        self.rooms[room_id] = Room(
+            room_id, self.rng.randint(min_range, max_range),
+            min_range, max_range, max_attempts, difficulty
+        )
+        return room_id
+
+    def join(self, room_id, name, listener=None):
+        room = self._room(room_id)
+        if name not in room.players:
+            room.players[name] = Player(name)
+            self._broadcast(room, {'type': 'join', 'room': room_id, 'player': name})
+        if listener is not None:
+            if room.listeners is None:
+                room.listeners = []
+            room.listeners.append(listener)
+        room.last_active = time.time()
+        return room.snapshot()
+
+    def leave(self, room_id, listener):
+        room = self.rooms.get(room_id)
+        if room is not None and room.listeners and listener in room.listeners:
+            room.listeners.remove(listener)
+
+    def guess(self, room_id, name, value):
+        room = self._room(room_id)
+        player = room.players.get(name)
+        if player is None:
+            raise RaceError(f"{name} has not joined room {room_id}")
+        if room.winner is not None:
+            raise RaceError(f"The race is over: {room.winner} won")
+        if player.attempts >= room.max_attempts:
+            raise RaceError("You've used all your attempts!")
+        if not room.min_range <= value <= room.max_range:
+            raise RaceError(f"Guess must be between {room.min_range} and {room.max_range}")
+
+        player.attempts += 1
+        result = evaluate_guess(value, room.target)
+        room.last_active = time.time()
+        event = {
+            'type': 'guess',
+            'room': room_id,
+            'player': name,
+            'attempt': player.attempts,
+            'guess': value,
+            'result': RESULT_NAMES[result],
+        }
+        if result == CORRECT:
+            player.won = True
+            player.finish_time = room.last_active
+            room.winner = name
+            event['winner'] = name
+        self._broadcast(room, event)
+        return event
+
+    def standings(self, room_id):
+        return self._room(room_id).snapshot()
+
+    def expire_rooms(self, ttl=ROOM_TTL):
+        # Drop rooms nobody has touched for `ttl` seconds
+        cutoff = time.time() - ttl
+        for room_id in [r for r, room in self.rooms.items() if room.last_active < cutoff]:
+            del self.rooms[room_id]
+
+    def _room(self, room_id):
+        room = self.rooms.get(room_id)
+        if room is None:
+            raise RaceError(f"No room called {room_id}")
+        return room
+
+    def _new_room_id(self):
+        alphabet = string.ascii_uppercase + string.digits
+        while True:
+            room_id = ''.join(self.rng.choice(alphabet) for _ in range(ROOM_CODE_LENGTH))
+            if room_id not in self.rooms:
+                return room_id
+
+    def _broadcast(self, room, event):
+        if room.listeners:
+            for listener in room.listeners:
+                listener(event)
+
+    # Running the server
+
+    def start_background(self):
+        # Run the event loop on a daemon thread; use call() from other threads
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._cleanup(), self.loop)
+        return self
+
+    def call(self, method, *args):
+        # Run a room operation on the loop thread and wait for its result
+        async def run():
+            return getattr(self, method)(*args)
+        return asyncio.run_coroutine_threadsafe(run(), self.loop).result()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        self.loop = asyncio.get_running_loop()
+        server = await asyncio.start_server(self._handle, host, port)
+        asyncio.ensure_future(self._cleanup())
+        async with server:
+            await server.serve_forever()
+
+    async def _cleanup(self):
+        while True:
+            await asyncio.sleep(CLEANUP_INTERVAL)
+            self.expire_rooms()
+
+    async def _handle(self, reader, writer):
+        # One TCP connection: newline-delimited JSON requests, each answered
+        # with one JSON line; room broadcasts are interleaved as they happen
+        room_id = name = None
+
+        def send(message):
+            writer.write((json.dumps(message) + "\n").encode())
+
+        try:
+            async for line in reader:
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise RaceError("Each request must be a JSON object")
+                    op = request.get('op')
+                    if op == 'create':
+                        reply = {'type': 'created', 'room': self.create_room(
+                            int(request.get('min_range', 1)),
+                            int(request.get('max_range', 100)),
+                            request.get('difficulty', "Medium 😐")
+                        )}
+                    elif op == 'join':
+                        # Join before leaving, so a rejected join keeps the
+                        # connection in the room it was in
+                        reply = self.join(request['room'], request['player'], send)
+                        if room_id is not None:
+                            self.leave(room_id, send)
+                        room_id, name = request['room'], request['player']
+                    elif op == 'guess':
+                        reply = self.guess(room_id, name, int(request['value']))
+                        reply = dict(reply, type='result')
+                    elif op == 'standings':
+                        reply = self.standings(request.get('room', room_id))
+                    else:
+                        raise RaceError(f"Unknown op: {op}")
+                except (RaceError, KeyError, TypeError, ValueError) as e:
+                    reply = {'type': 'error', 'message': str(e)}
+                send(reply)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if room_id is not None:
+                self.leave(room_id, send)
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Number Master Pro race server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    asyncio.run(RaceServer().serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Replaying stored games for Number Master Pro.
+#
+# Every game draws its target (and the range hint's window) from its own RNG,
+# seeded with the seed saved in its history record (see engine.seeded_game). A
+# record therefore holds everything needed to rebuild the game guess by guess:
+# the seed, the range, the difficulty, the hint mode, the guessed values and
+# the number of hints.
+# This is used to audit disputed scores and to re-score history in bulk under
+# new scoring rules:
+#
+#   python replay.py --player alice            # report scores that don't match
+#   python replay.py --db events.db --all      # every player's games
+import argparse
+
+from engine import DIFFICULTIES, RESULT_NAMES, seeded_game
+from hints import DEFAULT_HINT_MODE, HINT_MODES
+from history_store import HistoryStore
+
+
+class ReplayError(Exception):
+    pass
+
+
+# Function to rebuild a stored game's state before its first guess
+def start_replay(record):
+    if record.get('seed') is None:
+        raise ReplayError(f"Game {record.get('id')} has no seed and cannot be replayed")
+    if record.get('difficulty') not in DIFFICULTIES:
+        raise ReplayError(f"Game {record.get('id')}: unknown difficulty {record.get('difficulty')!r}")
+    hint_mode = record.get('hint_mode') or DEFAULT_HINT_MODE
+    if hint_mode not in HINT_MODES:
+        raise ReplayError(f"Game {record.get('id')}: unknown hint mode {hint_mode!r}")
+    game, rng = seeded_game(
+        record['seed'], record['min_range'], record['max_range'],
+        record['difficulty'], record.get('big_range', False), hint_mode
+    )
+    if record.get('target') is not None and game.target != record['target']:
+        raise ReplayError(
+            f"Game {record.get('id')}: seed {record['seed']} gives target {game.target}, "
+            f"record says {record['target']}"
+        )
+    # Only the range hint draws from the RNG, and only after the target, and
+    # no hint mode looks at guess feedback, so taking the hints up front
+    # yields the same facts as taking them between guesses
+    for _ in range(record.get('hints_used') or 0):
+        game.take_hint(rng)
+    return game
+
+
+# Function to step through a stored game, yielding the state after each guess
+def replay_steps(record):
+    game = start_replay(record)
+    for value in record['guesses'].values:
+        result = game.guess(value)
+        yield {
+            'attempt': game.attempts,
+            'guess': value,
+            'result': RESULT_NAMES[result],
+            'low': game.low,
+            'high': game.high,
+        }
+
+
+# Function to replay a stored game to the end; returns the finished GameState
+def replay(record):
+    game = start_replay(record)
+    for value in record['guesses'].values:
+        game.guess(value)
+    return game
+
+
+# Function to re-score stored games, yielding (record, score) pairs. score_fn
+# takes the same arguments as engine.calculate_score; by default each game is
+# scored with the current rules for its mode.
+def rescore(records, score_fn=None):
+    for record in records:
+        game = replay(record)
+        if score_fn is None:
+            score = game.score(record['time_taken'])
+        elif not game.won:
+            score = 0
+        else:
+            score = score_fn(
+                game.attempts, game.max_range, game.min_range,
+                record['time_taken'], game.hint_cost, game.hint_penalty
+            )
+        yield record, score
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay stored games and check their scores.")
+    parser.add_argument("--db", help="history database (default: NUMBER_MASTER_DB or number_master.db)")
+    parser.add_argument("--player", default="default")
+    parser.add_argument("--all", action="store_true", help="check every player's games")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    if args.all:
+        players = store.players()
+    else:
+        players = [args.player]
+
+    checked = skipped = mismatched = 0
+    for player in players:
+        for record in store.iter_records(player):
+            if record.get('seed') is None:
+                # Saved before games were seeded
+                skipped += 1
+                continue
+            checked += 1
+            try:
+                _, score = next(rescore([record]))
+            except ReplayError as e:
+                mismatched += 1
+                print(e)
+                continue
+            if score != record['score']:
+                mismatched += 1
+                print(f"Game {record['id']} ({player}): stored score {record['score']}, replayed {score}")
+    print(f"{checked} games replayed, {mismatched} score mismatches, {skipped} skipped")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+# Memory-bounded per-session state for Number Master Pro.
+#
+# Every session (a Streamlit tab, or a player of game_api.py) keeps a
+# HistoryStats for its player. The aggregates cover the whole history and
+# stay in memory, but per-game chart columns only cover the most recent
+# hot_games games; older games are charted from a bounded, downsampled
+# summary (see stats.py), so drawing a chart never reads the store.
+#
+# Sessions idle for longer than idle_ttl seconds lose their stats altogether.
+# The next time the session asks for them, they are rebuilt from the store,
+# reading only the columns the stats use. The manager holds sessions weakly,
+# so a session Streamlit has dropped is freed as usual.
+#
+#   NUMBER_MASTER_HOT_GAMES   per-game chart columns kept in memory (default 200)
+#   NUMBER_MASTER_IDLE_TTL    seconds before an idle session's stats are evicted (default 900)
+import os
+import threading
+import time
+import weakref
+
+from stats import HistoryStats
+
+HOT_GAMES = 200
+IDLE_TTL = 15 * 60
+SWEEP_INTERVAL = 60
+
+# Columns HistoryStats reads from a record
+STATS_COLUMNS = ('attempts', 'score', 'hints_used', 'date', 'difficulty')
+
+
+class SessionData:
+    __slots__ = ('player', 'stats', 'last_active', '__weakref__')
+
+    def __init__(self, player):
+        self.player = player
+        # None until first used, and again once evicted
+        self.stats = None
+        self.last_active = time.time()
+
+
+class SessionManager:
+    # Shared by every session; sessions register with open() and call
+    # touch() on each rerun
+    def __init__(self, history_store, hot_games=None, idle_ttl=None, sweep_interval=SWEEP_INTERVAL):
+        if hot_games is None:
+            hot_games = int(os.environ.get("NUMBER_MASTER_HOT_GAMES", HOT_GAMES))
+        if idle_ttl is None:
+            idle_ttl = float(os.environ.get("NUMBER_MASTER_IDLE_TTL", IDLE_TTL))
+        self.history_store = history_store
+        self.hot_games = hot_games
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        self._sessions = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+
+    def open(self, player):
+        session = SessionData(player)
+        with self._lock:
+            self._sessions.add(session)
+        return session
+
+    def touch(self, session):
+        # Mark a session active, evicting idle ones at most once per sweep_interval
+        now = session.last_active = time.time()
+        if now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            self.evict_idle(now)
+
+    def stats(self, session):
+        # The session's HistoryStats, rebuilt from the store if not in memory
+        stats = session.stats
+        if stats is None:
+            stats = session.stats = HistoryStats.from_records(
+                self._stats_records(session.player), hot_games=self.hot_games
+            )
+        return stats
+
+    def record(self, session, record):
+        # Add a finished game, already saved to the store. Evicted stats are
+        # left alone: the rebuild will read the game from the store.
+        stats = session.stats
+        if stats is not None:
+            stats.add(record)
+
+    def evict_idle(self, now=None):
+        # Drop the stats of sessions idle for longer than idle_ttl; returns
+        # the number evicted
+        cutoff = (now or time.time()) - self.idle_ttl
+        evicted = 0
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            if session.stats is not None and session.last_active < cutoff:
+                session.stats = None
+                evicted += 1
+        return evicted
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _stats_records(self, player):
+        for row in self.history_store.iter_columns(STATS_COLUMNS, player=player):
+            yield dict(zip(STATS_COLUMNS, row[2:]))
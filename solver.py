@@ -0,0 +1,96 @@
+# Optimal-guess solver for Number Master Pro.
+#
+# CandidateSet describes every number still consistent with what a player
+# knows: an interval narrowed by too-low/too-high feedback and by the range
+# hint, plus residue-class constraints from every other hint (see hints.py).
+# Numbers are never materialised; counting and indexing work on the residue
+# pattern, so every query is O(log modulus) whatever the range size.
+import math
+from bisect import bisect_left
+
+from engine import CORRECT, TOO_LOW
+from hints import hint_residues, restrict
+
+
+class CandidateSet:
+    __slots__ = ('low', 'high', 'modulus', 'residues')
+
+    def __init__(self, low, high, modulus=1, residues=(0,)):
+        self.low = low
+        self.high = high
+        self.modulus = modulus
+        self.residues = residues
+
+    @classmethod
+    def from_game(cls, game):
+        # Build from an engine.GameState, using its feedback interval and hints
+        candidates = cls(game.low, game.high)
+        for fact in game.hints:
+            if fact[0] == 'range':
+                candidates.apply_hint(fact)
+        candidates.modulus, candidates.residues = hint_residues(
+            tuple(fact for fact in game.hints if fact[0] != 'range')
+        )
+        return candidates
+
+    def apply_feedback(self, guess, result):
+        if result == CORRECT:
+            self.low = self.high = guess
+        elif result == TOO_LOW:
+            self.low = max(self.low, guess + 1)
+        else:
+            self.high = min(self.high, guess - 1)
+
+    def apply_hint(self, fact):
+        if fact[0] == 'range':
+            self.low = max(self.low, fact[1])
+            self.high = min(self.high, fact[2])
+        else:
+            self.modulus, self.residues = restrict(self.modulus, self.residues, fact)
+
+    # Number of candidates below x, counted from an arbitrary fixed origin
+    def _rank(self, x):
+        q, r = divmod(x, self.modulus)
+        return q * len(self.residues) + bisect_left(self.residues, r)
+
+    def count(self):
+        # Not __len__, which cannot return more than sys.maxsize
+        if self.low > self.high or not self.residues:
+            return 0
+        return self._rank(self.high + 1) - self._rank(self.low)
+
+    def __contains__(self, n):
+        return self.low <= n <= self.high and (n % self.modulus) in self.residues
+
+    def kth(self, k):
+        # k-th smallest candidate, 0-based
+        q, i = divmod(self._rank(self.low) + k, len(self.residues))
+        return q * self.modulus + self.residues[i]
+
+    def expected_entropy(self, guess):
+        # Expected information (bits) from the too-low/correct/too-high answer
+        total = self.count()
+        if total == 0:
+            return 0.0
+        below = self._rank(max(min(guess, self.high + 1), self.low)) - self._rank(self.low)
+        equal = 1 if guess in self else 0
+        above = total - below - equal
+        return -sum(n / total * math.log2(n / total) for n in (below, equal, above) if n)
+
+    def best_guess(self):
+        # The outcome entropy is maximised by the candidates either side of the
+        # median: any other guess leaves a less even split.
+        total = self.count()
+        if total == 0:
+            return None
+        lower = self.kth((total - 1) // 2)
+        upper = self.kth(total // 2)
+        if lower == upper:
+            return lower
+        return max((lower, upper), key=self.expected_entropy)
+
+
+# Strategy for engine.play_many(): always play the expected-entropy-maximising guess
+def optimal_guess(game, rng):
+    guess = CandidateSet.from_game(game).best_guess()
+    return guess if guess is not None else game.low
@@ -0,0 +1,242 @@
+# Running statistics over a player's game history.
+#
+# HistoryStats is updated once per finished game, in O(1), and holds every
+# number the Stats and History tabs display, so they never have to rebuild
+# a DataFrame from the full history on each rerun.
+#
+# With hot_games set, chart data stays bounded however long a history grows,
+# and still covers every game:
+#   - the line charts keep one point per game for the last hot_games games,
+#     in deques that drop their oldest game in O(1). Older games are folded
+#     into at most hot_games downsampled points, each the mean of a run of
+#     consecutive games; when there are too many, neighbours merge and runs
+#     double in length;
+#   - the attempts histogram is an exact count per number of attempts;
+#   - the score boxplots come from a log-bucketed histogram of scores per
+#     difficulty (ScoreBuckets).
+# The aggregates always cover every game. hot_games=0 keeps no chart data.
+import math
+from collections import deque
+
+RECENT_WINDOW = 5
+SKETCH_ACCURACY = 0.01
+# Quantiles drawn by the score boxplots: min, quartiles and max
+BOX_QUANTILES = (0, 0.25, 0.5, 0.75, 1)
+
+
+class ScoreBuckets:
+    # Histogram of scores in log-sized buckets (as in DDSketch): bucket i + 1
+    # holds the scores in (gamma^(i-1), gamma^i], so a quantile read back from
+    # it is within `accuracy` of a real score. Scores of 0 (lost games) get
+    # bucket 0.
+    __slots__ = ('gamma', 'log_gamma', 'counts', 'total')
+
+    def __init__(self, accuracy=SKETCH_ACCURACY):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        # bucket -> scores; a few hundred buckets cover any realistic score
+        self.counts = {}
+        self.total = 0
+
+    def bucket(self, score):
+        if score <= 0:
+            return 0
+        return 1 + max(0, math.ceil(math.log(score) / self.log_gamma))
+
+    def value(self, bucket):
+        # A score standing for a bucket, at most `accuracy` from any score in it
+        if bucket == 0:
+            return 0
+        return round(2 * self.gamma ** (bucket - 1) / (self.gamma + 1))
+
+    def add(self, score):
+        bucket = self.bucket(score)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+
+    def quantiles(self, qs):
+        # Scores at each of the ascending quantiles qs, in one pass over the buckets
+        values = []
+        seen = 0
+        buckets = iter(sorted(self.counts))
+        bucket = None
+        for rank in (max(1, math.ceil(q * self.total)) for q in qs):
+            while seen < rank:
+                bucket = next(buckets)
+                seen += self.counts[bucket]
+            values.append(self.value(bucket))
+        return values
+
+
+class HistoryStats:
+    def __init__(self, window=RECENT_WINDOW, by_difficulty=True, hot_games=None):
+        self.window = window
+        self.hot_games = hot_games
+        self.games = 0
+        self.wins = 0
+        self.total_attempts = 0
+        self.min_attempts = None
+        self.max_attempts = None
+        self.total_score = 0
+        self.high_score = None
+        self.hintless_games = 0
+        self.recent_scores = deque(maxlen=window)
+        self.recent_attempts = deque(maxlen=window)
+        self._recent_attempts_sum = 0
+        self.charts = hot_games != 0
+        # Per-game columns for the line charts, for the hot games only
+        self.attempts = deque(maxlen=hot_games)
+        self.scores = deque(maxlen=hot_games)
+        self.moving_avg_attempts = deque(maxlen=hot_games)
+        self.dates = deque(maxlen=hot_games)
+        # Downsampled games older than the hot ones: one [games, last game
+        # number, last date, attempts sum, score sum, moving average sum,
+        # moving averages] list per run of run_length games
+        self.runs = []
+        self.run_length = 1
+        # attempts -> games, over every game
+        self.attempt_counts = {}
+        self.score_buckets = {} if by_difficulty else None
+        self.by_difficulty = {} if by_difficulty else None
+
+    @classmethod
+    def from_records(cls, records, window=RECENT_WINDOW, hot_games=None):
+        stats = cls(window, hot_games=hot_games)
+        for record in records:
+            stats.add(record)
+        return stats
+
+    def add(self, record):
+        attempts = record['attempts']
+        score = record['score']
+
+        self.games += 1
+        # A game counts as won when it scored, as in the original Stats tab
+        self.wins += score > 0
+        self.total_attempts += attempts
+        self.total_score += score
+        if self.min_attempts is None or attempts < self.min_attempts:
+            self.min_attempts = attempts
+        if self.max_attempts is None or attempts > self.max_attempts:
+            self.max_attempts = attempts
+        if self.high_score is None or score > self.high_score:
+            self.high_score = score
+        if record.get('hints_used') == 0:
+            self.hintless_games += 1
+
+        self.recent_scores.append(score)
+        if len(self.recent_attempts) == self.window:
+            self._recent_attempts_sum -= self.recent_attempts[0]
+        self.recent_attempts.append(attempts)
+        self._recent_attempts_sum += attempts
+
+        if self.by_difficulty is not None:
+            difficulty = record.get('difficulty')
+            if difficulty not in self.by_difficulty:
+                # Only the totals are shown per difficulty, so keep no chart data
+                self.by_difficulty[difficulty] = HistoryStats(self.window, by_difficulty=False, hot_games=0)
+                self.score_buckets[difficulty] = ScoreBuckets()
+            self.by_difficulty[difficulty].add(record)
+            if self.charts:
+                self.score_buckets[difficulty].add(score)
+
+        if not self.charts:
+            return
+        self.attempt_counts[attempts] = self.attempt_counts.get(attempts, 0) + 1
+        if len(self.attempts) == self.hot_games:
+            # The deques are about to drop their oldest game
+            self._fold(self.attempts[0], self.scores[0], self.moving_avg_attempts[0], self.dates[0])
+        self.attempts.append(attempts)
+        self.scores.append(score)
+        self.dates.append(record.get('date'))
+        if self.games >= self.window:
+            self.moving_avg_attempts.append(self._recent_attempts_sum / self.window)
+        else:
+            self.moving_avg_attempts.append(float('nan'))
+
+    def _fold(self, attempts, score, moving_avg, date):
+        # Add the game leaving the hot window to the downsampled runs
+        game_number = self.games - len(self.attempts)
+        if not self.runs or self.runs[-1][0] == self.run_length:
+            self.runs.append([0, 0, None, 0, 0, 0.0, 0])
+        run = self.runs[-1]
+        run[0] += 1
+        run[1] = game_number
+        run[2] = date
+        run[3] += attempts
+        run[4] += score
+        if not math.isnan(moving_avg):
+            run[5] += moving_avg
+            run[6] += 1
+        if len(self.runs) > self.hot_games:
+            self._merge_runs()
+
+    def _merge_runs(self):
+        # Halve the number of runs by merging neighbours; amortised O(1) per
+        # game, as it happens once every hot_games * run_length games
+        merged = []
+        for i in range(0, len(self.runs), 2):
+            run = self.runs[i]
+            if i + 1 < len(self.runs):
+                later = self.runs[i + 1]
+                run = [run[0] + later[0], later[1], later[2], run[3] + later[3],
+                       run[4] + later[4], run[5] + later[5], run[6] + later[6]]
+            merged.append(run)
+        self.runs = merged
+        self.run_length *= 2
+
+    @property
+    def spilled(self):
+        # Games no longer charted one point per game
+        return self.games - len(self.attempts) if self.charts else self.games
+
+    @property
+    def win_rate(self):
+        return self.wins / self.games * 100 if self.games else 0.0
+
+    @property
+    def avg_attempts(self):
+        return self.total_attempts / self.games if self.games else 0.0
+
+    @property
+    def avg_score(self):
+        return self.total_score / self.games if self.games else 0.0
+
+    @property
+    def recent_avg_score(self):
+        # Mean of the last `window` games, or of all games if there are fewer
+        return sum(self.recent_scores) / len(self.recent_scores) if self.recent_scores else 0.0
+
+    @property
+    def moving_avg_window(self):
+        return min(self.window, self.games)
+
+    def moving_averages(self):
+        # Rolling mean of attempts over moving_avg_window games. With fewer
+        # games than the window, only the last game has a value.
+        if self.games >= self.window:
+            return list(self.moving_avg_attempts)
+        values = [float('nan')] * len(self.attempts)
+        if values:
+            values[-1] = self._recent_attempts_sum / self.games
+        return values
+
+    def chart_columns(self):
+        # Column data for the line charts (game number, date, attempts, score
+        # and moving average), ready for pd.DataFrame(). Downsampled runs come
+        # first, one point each at their last game, then one point per hot game.
+        return {
+            'game_number': [run[1] for run in self.runs] + list(range(self.spilled + 1, self.games + 1)),
+            'date': [run[2] for run in self.runs] + list(self.dates),
+            'attempts': [round(run[3] / run[0], 1) for run in self.runs] + list(self.attempts),
+            'score': [round(run[4] / run[0], 1) for run in self.runs] + list(self.scores),
+            'moving_avg_attempts': [run[5] / run[6] if run[6] else float('nan') for run in self.runs]
+                                   + self.moving_averages(),
+        }
+
+    def score_quartiles(self):
+        # difficulty -> (min, lower quartile, median, upper quartile, max) score
+        return {
+            difficulty: tuple(buckets.quantiles(BOX_QUANTILES))
+            for difficulty, buckets in (self.score_buckets or {}).items() if buckets.total
+        }
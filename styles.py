@@ -0,0 +1,142 @@
+# Page styling for Number Master Pro.
+#
+# The stylesheet is minified once per process, when this module is first
+# imported, so each rerun sends one short pre-built string. Streamlit drops any
+# element a rerun does not emit again, so the block cannot be skipped on later
+# reruns; an unchanged element is not re-rendered by the browser.
+import re
+
+# Custom CSS for a pure white background with appropriate text colors
+APP_CSS = """
+<style>
+    /* Global white background */
+    .stApp, .main, .block-container, .css-1d391kg, .stSidebar, .css-1wrcr25, .css-18e3th9, .css-1kyxreq {
+        background-color: white !important;
+    }
+    
+    /* Override all Streamlit containers to have white backgrounds */
+    div[data-testid="stVerticalBlock"], div[data-testid="stHorizontalBlock"], 
+    div[data-testid="stExpander"], div[data-testid="stMetric"], 
+    div[data-testid="stForm"], div[data-testid="stSelectbox"],
+    div[data-testid="stNumberInput"], div[data-testid="stButton"],
+    div[data-testid="stProgress"], div[data-testid="stMarkdown"] {
+        background-color: white !important;
+    }
+    
+    /* Text styling */
+    .main-header {
+        font-size: 2.5rem;
+        color: #1E88E5;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    .sub-header {
+        font-size: 1.5rem;
+        color: #26A69A;
+        margin-bottom: 1rem;
+    }
+    .success-text {
+        color: #4CAF50;
+        font-weight: bold;
+    }
+    .warning-text {
+        color: #FF9800;
+        font-weight: bold;
+    }
+    .danger-text {
+        color: #F44336;
+        font-weight: bold;
+    }
+    .info-text {
+        color: #2196F3;
+        font-weight: bold;
+    }
+    
+    /* Container styling with white background */
+    .stat-container {
+        background-color: white;
+        border: 1px solid #e0e0e0;
+        border-radius: 10px;
+        padding: 10px;
+        margin: 10px 0;
+    }
+    .emoji-large {
+        font-size: 2rem;
+    }
+    .footer {
+        text-align: center;
+        margin-top: 3rem;
+        color: #9E9E9E;
+        font-size: 0.8rem;
+    }
+    .help-box {
+        background-color: white;
+        border-left: 5px solid #2196F3;
+        padding: 10px 15px;
+        border-radius: 5px;
+        margin: 10px 0;
+    }
+    .tip-box {
+        background-color: white;
+        border-left: 5px solid #4CAF50;
+        padding: 10px 15px;
+        border-radius: 5px;
+        margin: 10px 0;
+    }
+    
+    /* Override Streamlit's default styles */
+    .stButton>button {
+        background-color: white;
+        border: 1px solid #e0e0e0;
+        border-radius: 8px;
+    }
+    .stProgress>div>div {
+        background-color: #4CAF50;
+    }
+    
+    /* Override expander styling */
+    .streamlit-expanderHeader {
+        background-color: white !important;
+        color: #333333 !important;
+    }
+    .streamlit-expanderContent {
+        background-color: white !important;
+    }
+    
+    /* Override sidebar */
+    section[data-testid="stSidebar"] {
+        background-color: white !important;
+    }
+    
+    /* Override select slider */
+    div[data-testid="stSelectSlider"] {
+        background-color: white !important;
+    }
+    
+    /* Override info, error, success boxes but keep their border colors */
+    div.stAlert {
+        background-color: white !important;
+    }
+    
+    /* Make sure charts have white backgrounds */
+    .vega-embed {
+        background-color: white !important;
+    }
+    
+    /* Override any remaining elements */
+    * {
+        background-color: white;
+    }
+</style>
+"""
+
+
+# Function to strip comments and collapse whitespace in a stylesheet
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    return css.strip()
+
+
+STYLE_TAG = minify_css(APP_CSS)
@@ -0,0 +1,68 @@
+import pytest
+
+from achievements import AchievementEngine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = AchievementEngine(str(tmp_path / "history.db"))
+    yield engine
+    engine.close()
+
+
+def game(score, attempts=5, hints_used=0, date="2024-01-01 12:00"):
+    return {'score': score, 'attempts': attempts, 'hints_used': hints_used, 'date': date}
+
+
+def keys(rules):
+    return {rule.key for rule in rules}
+
+
+def test_rules_unlock_once(engine):
+    assert keys(engine.record_game("p", game(600, attempts=3))) == {'sharp_eye', 'high_scorer', 'pure_skill'}
+    assert engine.record_game("p", game(600, attempts=2)) == []
+    for _ in range(2):
+        assert engine.record_game("p", game(100, hints_used=1)) == []
+    assert keys(engine.record_game("p", game(100))) == {'winner'}
+    assert [rule.key for rule, _ in engine.unlocked("p")] == ['sharp_eye', 'high_scorer', 'pure_skill', 'winner']
+
+
+def test_win_rate_needs_enough_games(engine):
+    for i in range(9):
+        assert 'master_guesser' not in keys(engine.record_game("p", game(100)))
+    assert keys(engine.record_game("p", game(0))) == {'dedicated', 'master_guesser'}
+
+
+def test_progress_survives_a_restart(engine):
+    for _ in range(4):
+        engine.record_game("p", game(100, hints_used=1))
+    again = AchievementEngine(engine.path)
+    assert keys(again.record_game("p", game(100, hints_used=1))) == {'winner'}
+    assert len(again.unlocked("p")) == 1
+    again.close()
+
+
+def test_cache_is_bounded(tmp_path):
+    engine = AchievementEngine(str(tmp_path / "history.db"), cache_size=2)
+    for player in ("a", "b", "c", "a"):
+        engine.record_game(player, game(100, hints_used=1))
+    assert list(engine._players) == ["c", "a"]
+    # "b" was dropped from the cache, and its progress is read back
+    for _ in range(4):
+        engine.record_game("b", game(100, hints_used=1))
+    assert keys(r for r, _ in engine.unlocked("b")) == {'winner'}
+    assert len(engine._players) == 2
+    engine.close()
+
+
+def test_award_history_backfills_untracked_players(engine):
+    engine.record_game("live", game(100, hints_used=1))
+    history = [("old", dict(game(100, attempts=2, date=f"2024-01-0{i + 1}"), id=i + 1)) for i in range(5)]
+    history += [("live", dict(game(100), id=10 + i)) for i in range(10)]
+    assert engine.award_history(history, chunk_size=2) == 3
+    assert [(rule.key, when) for rule, when in engine.unlocked("old")] == [
+        ('sharp_eye', "2024-01-01"), ('pure_skill', "2024-01-01"), ('winner', "2024-01-05"),
+    ]
+    # Already tracked game by game, so its history isn't counted again
+    assert engine.unlocked("live") == []
+    assert engine.award_history(history) == 0
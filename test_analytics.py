@@ -0,0 +1,66 @@
+import csv
+import io
+import random
+
+import pytest
+
+from analytics import analyze, print_tables
+from archive import export_history
+from history_store import HistoryStore
+from stats import HistoryStats
+
+
+@pytest.fixture
+def history(tmp_path, make_record):
+    # Three players' games, in a database and in a CSV archive of it
+    rng = random.Random(0)
+    games = []
+    for i in range(60):
+        record = make_record(i, lucky=rng.random() < 0.5)
+        if rng.random() < 0.2:
+            record = dict(record, score=0)
+        games.append((f"player{i % 3}", dict(record, difficulty=rng.choice(["Easy 😊", "Hard 😓"]))))
+    path = str(tmp_path / "history.db")
+    store = HistoryStore(path)
+    store.append_many(games)
+    export_history(store, str(tmp_path / "archive"), 'csv')
+    store.close()
+    return path, str(tmp_path / "archive"), games
+
+
+def test_totals_match_the_stats_tab(history):
+    path, _, games = history
+    report = analyze([path]).report()
+    stats = HistoryStats.from_records(record for _, record in games)
+    overall = report['overall']
+    assert (overall['games'], overall['players'], overall['wins']) == (60, 3, stats.wins)
+    assert overall['avg_attempts'] == pytest.approx(stats.avg_attempts)
+    assert overall['high_score'] == stats.high_score
+    assert sum(report['attempts_distribution'].values()) == 60
+    assert sum(box['count'] for box in report['score_by_difficulty'].values()) == 60
+    assert report['learning_curve'][0]['players'] == 3
+
+
+def test_pool_matches_serial(history):
+    path, archive, _ = history
+    serial = analyze([path, archive], workers=1).report()
+    assert analyze([path, archive], workers=2).report() == serial
+    assert serial['overall']['games'] == 120
+
+
+def test_bad_csv_rows_are_skipped(history):
+    _, archive, _ = history
+    games_csv = f"{archive}/games.csv"
+    with open(games_csv, newline='') as f:
+        rows = list(csv.DictReader(f))
+    rows[0]['attempts'] = ""
+    rows[1]['score'] = "lots"
+    with open(games_csv, "w", newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    report = analyze([archive]).report()
+    assert (report['overall']['games'], report['overall']['skipped_rows']) == (58, 2)
+    out = io.StringIO()
+    print_tables(report, out)
+    assert "skipped_rows   2" in out.getvalue()
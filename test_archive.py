@@ -0,0 +1,40 @@
+import pytest
+
+from archive import FORMATS, export_history, import_history
+from guess_log import GuessLog
+from history_store import HistoryStore
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_roundtrip(tmp_path, fmt, make_record):
+    if fmt != 'csv':
+        pytest.importorskip("pyarrow")
+    source = HistoryStore(str(tmp_path / "source.db"))
+    target = 2 ** 70 + 3
+    records = [
+        make_record(1, lucky=False),
+        dict(make_record(2), daily="2024-01-01", hint_mode='adaptive'),
+        dict(make_record(3), min_range=1, max_range=2 ** 80, target=target, big_range=True,
+             guesses=GuessLog.from_values(target, [2 ** 79, target], 1, 2 ** 80)),
+    ]
+    source.append_many([("alice", records[0]), ("bob", records[1]), ("alice", records[2])])
+    assert export_history(source, str(tmp_path / "archive"), fmt, chunk_size=2) == 3
+
+    copy = HistoryStore(str(tmp_path / "copy.db"))
+    assert import_history(copy, str(tmp_path / "archive"), chunk_size=2) == 3
+    for (player, original), (copy_player, restored) in zip(source.iter_games(), copy.iter_games()):
+        assert copy_player == player
+        for field in ('min_range', 'max_range', 'attempts', 'score', 'time_taken', 'difficulty',
+                      'target', 'seed', 'big_range', 'hint_mode', 'daily'):
+            assert restored[field] == original[field]
+        assert list(restored['guesses']) == list(original['guesses'])
+    source.close()
+    copy.close()
+
+
+def test_export_one_player(tmp_path, make_record):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    store.append(make_record(1), "alice")
+    store.append(make_record(2), "bob")
+    assert export_history(store, str(tmp_path / "archive"), 'csv', player="bob") == 1
+    store.close()
@@ -0,0 +1,38 @@
+import pytest
+
+from charts import ChartCache, attempts_histogram_spec
+
+
+def test_hits_skip_the_builder():
+    cache, calls = ChartCache(), []
+
+    def build(n):
+        calls.append(n)
+        return {'n': n}
+
+    assert cache.get(("alice", 3), build, 3) == {'n': 3}
+    assert cache.get(("alice", 3), build, 99) == {'n': 3}
+    assert calls == [3]
+    # A new game count is a new key, so the chart is rebuilt
+    assert cache.get(("alice", 4), build, 4) == {'n': 4}
+    assert calls == [3, 4]
+
+
+def test_least_recently_used_spec_is_evicted():
+    cache = ChartCache(maxsize=2)
+    cache.get('a', dict, {'a': 1})
+    cache.get('b', dict, {'b': 1})
+    cache.get('a', dict)
+    cache.get('c', dict, {'c': 1})
+    assert len(cache) == 2
+    assert cache.get('a', dict) == {'a': 1}
+    assert cache.get('b', dict) == {}
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_specs_are_plain_dicts():
+    pytest.importorskip("altair")
+    spec = attempts_histogram_spec({3: 2, 5: 1})
+    assert isinstance(spec, dict)
+    assert spec['mark']['type'] == 'bar'
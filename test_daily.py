@@ -0,0 +1,83 @@
+import pytest
+
+from daily import DailyBoard, ScoreSketch, daily_challenge, daily_seed
+
+
+@pytest.fixture
+def board(tmp_path, monkeypatch):
+    monkeypatch.delenv("NUMBER_MASTER_DAILY_SECRET", raising=False)
+    board = DailyBoard(str(tmp_path / "history.db"))
+    yield board
+    board.close()
+
+
+def test_challenge_is_fixed_per_day_and_secret():
+    first = daily_challenge("secret", "2024-01-01")
+    assert daily_challenge("secret", "2024-01-01").to_json() == first.to_json()
+    assert daily_challenge("other", "2024-01-01").seed != first.seed
+    assert 'seed' not in first.to_json()
+
+
+def test_a_secret_is_required():
+    with pytest.raises(ValueError):
+        daily_seed("2024-01-01", "")
+
+
+def test_the_secret_is_kept_in_the_database(board):
+    assert len(board.secret) == 64
+    again = DailyBoard(board.path)
+    assert again.secret == board.secret
+    again.close()
+
+
+def test_one_game_per_player(board):
+    assert board.start("alice", "2024-01-01")
+    assert not board.start("alice", "2024-01-01")
+    assert board.played("alice", "2024-01-01")
+    assert not board.played("alice", "2024-01-02")
+
+
+def test_only_the_first_result_counts(board):
+    assert board.submit("alice", "2024-01-01", 500, 5, True)['counted']
+    second = board.submit("alice", "2024-01-01", 900, 3, True)
+    assert not second['counted']
+    assert second['players'] == 1
+    assert board.submit("bob", "2024-01-01", 100, 10, True)['beaten'] == 0.0
+    assert board.submit("carol", "2024-01-01", 0, 12, False)['beaten'] == 0.0
+    assert board.standing("2024-01-01", 1000) == 1.0
+    summary = board.summary("2024-01-01")
+    assert summary['players'] == 3
+    assert summary['wins'] == 2
+    assert summary['attempts'] == {5: 1, 10: 1, 12: 1}
+
+
+def test_stats_are_rebuilt_from_the_database(board):
+    for i in range(10):
+        board.submit(f"player{i}", "2024-01-01", i * 100, 5, i > 0)
+    again = DailyBoard(board.path)
+    assert again.summary("2024-01-01") == board.summary("2024-01-01")
+    assert again.standing("2024-01-01", 450) == 0.5
+    again.close()
+
+
+def test_score_sketch_quantiles():
+    sketch = ScoreSketch()
+    for score in range(1, 1001):
+        sketch.add(score)
+    assert sketch.quantile(0.5) == pytest.approx(500, rel=0.02)
+    assert sketch.quantile(0.99) == pytest.approx(990, rel=0.02)
+    assert sketch.count_below(1) == 0
+    assert ScoreSketch().quantile(0.5) is None
+
+
+def test_recent_days_stay_cached(board):
+    days = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+    for day in days:
+        board.submit("alice", day, 100, 5, True)
+    assert sorted(board._days) == days[1:]
+    # Looking up an old day keeps it, dropping the oldest of the others
+    board.summary(days[0])
+    assert sorted(board._days) == [days[0], days[2], days[3]]
+    stats = board._days[days[0]]
+    assert board.summary(days[0])['players'] == 1
+    assert board._days[days[0]] is stats
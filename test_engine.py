@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from engine import (
+    CORRECT, MAX_HINTS, TOO_HIGH, TOO_LOW, GameState, binary_search, calculate_big_range_score,
+    calculate_score, difficulty_settings, evaluate_guess, parse_number, play_many, range_error,
+    seeded_game
+)
+
+
+def test_difficulty_settings():
+    assert difficulty_settings("Medium 😐", 1, 100) == (20, 2)
+    assert difficulty_settings("Unlimited ♾️", 1, 100) == (float('inf'), 2)
+    # Big range limits follow log2 of the range size
+    assert difficulty_settings("Expert 🥵", 1, 2 ** 63, big_range=True) == (63, 4)
+
+
+@pytest.mark.parametrize("min_range, max_range, big_range, ok", [
+    (1, 100, False, True),
+    (1, 10_000, False, True),
+    (1, 10_001, False, False),
+    (0, 100, False, False),
+    (7, 7, False, False),
+    (1, 10 ** 400, True, True),
+    (10, 1, True, False),
+])
+def test_range_error(min_range, max_range, big_range, ok):
+    assert (range_error(min_range, max_range, big_range) is None) == ok
+
+
+@pytest.mark.parametrize("text, value", [
+    ("42", 42), ("1,000,000", 1_000_000), ("2^63", 2 ** 63), (" 10 ^ 3 ", 1000),
+    ("2^5000", None), ("abc", None), ("", None),
+])
+def test_parse_number(text, value):
+    assert parse_number(text) == value
+
+
+def test_guesses_narrow_the_interval():
+    game = GameState(1, 100, 42)
+    assert game.guess(50) == TOO_HIGH
+    assert game.guess(10) == TOO_LOW
+    assert (game.low, game.high) == (11, 49)
+    assert game.guess(42) == CORRECT
+    assert game.won and game.finished and game.attempts == 3
+    assert evaluate_guess(5, 5) == CORRECT
+
+
+def test_scores():
+    # 990 base, less 350 for attempts, 212.5 for time and 50 for the hint
+    assert calculate_score(7, 100, 1, 42.5, 1, 2) == 377
+    assert calculate_score(50, 100, 1, 0, 0, 2) == 0
+    assert calculate_big_range_score(10, 2 ** 63, 1, 0, 0, 2) == 100 * 63 - 500
+    game = GameState(1, 100, 42)
+    assert game.score() == 0
+    game.guess(42)
+    assert game.score(10) == calculate_score(1, 100, 1, 10, 0, 2)
+
+
+def test_seeded_games_replay():
+    first, rng = seeded_game(1234, 1, 1000)
+    second, _ = seeded_game(1234, 1, 1000)
+    assert first.target == second.target
+    hints = [first.take_hint(rng) for _ in range(MAX_HINTS + 1)]
+    assert hints[-1] is None and first.hints_used == MAX_HINTS
+
+
+def test_binary_search_always_wins():
+    result = play_many(binary_search, 500, 1, 1000, "Expert 🥵", seed=0)
+    assert result.games == result.wins == 500
+    assert result.avg_attempts <= 10
+
+
+def test_play_many_is_reproducible():
+    def strategy(game, rng):
+        return rng.randint(game.low, game.high)
+
+    first = play_many(strategy, 200, seed=random.Random(5).random())
+    second = play_many(strategy, 200, seed=random.Random(5).random())
+    assert (first.wins, first.attempts, first.score) == (second.wins, second.attempts, second.score)
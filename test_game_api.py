@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from achievements import AchievementEngine
+from daily import DailyBoard
+from game_api import ApiError, GameApi
+from history_store import HistoryStore
+from leaderboard import Leaderboard
+
+
+@pytest.fixture
+def api(tmp_path):
+    path = str(tmp_path / "api.db")
+    api = GameApi(HistoryStore(path), Leaderboard(path), AchievementEngine(path), DailyBoard(path))
+    yield api
+    for store in (api.history_store, api.leaderboard, api.achievement_engine, api.daily_board):
+        store.close()
+
+
+def post(api, path, body):
+    return asyncio.run(api.dispatch('POST', path, {}, body))
+
+
+@pytest.mark.parametrize("body", [
+    {'min_range': 50, 'max_range': 50},
+    {'max_range': "10^400"},
+    {'max_range': 2 ** 40},
+    {'min_range': 0, 'max_range': 100},
+    {'big_range': "false"},
+    {'big_range': 0},
+    {'big_range': None},
+])
+def test_start_game_rejects_ranges_the_app_rejects(api, body):
+    with pytest.raises(ApiError) as error:
+        post(api, '/games', body)
+    assert error.value.status == 400
+    assert not api.games
+
+
+def test_start_game_accepts_the_app_limits(api):
+    status, game = post(api, '/games', {'min_range': 1, 'max_range': 10_000})
+    assert status == 201
+    assert game['max_attempts'] == 2000
+
+
+def test_big_range_allows_huge_ranges(api):
+    status, game = post(api, '/games', {'max_range': "10^400", 'big_range': True})
+    assert status == 201
+    assert game['big_range'] and game['max_range'] == 10 ** 400
+
+
+def play_to_the_end(api, game_id, low, high):
+    # Binary search; returns the guess reply that ended the game
+    while True:
+        value = (low + high) // 2
+        status, reply = post(api, f'/games/{game_id}/guess', {'value': value})
+        if reply['finished']:
+            return reply
+        if reply['result'] == 'too low':
+            low = value + 1
+        else:
+            high = value - 1
+
+
+def test_history_hides_daily_targets(api):
+    status, game = post(api, '/daily', {'player': "alice"})
+    assert status == 201 and game['daily']
+    play_to_the_end(api, game['game'], game['min_range'], game['max_range'])
+    status, game = post(api, '/games', {'player': "alice"})
+    play_to_the_end(api, game['game'], 1, 100)
+
+    status, history = asyncio.run(api.dispatch('GET', '/players/alice/history', {}, {}))
+    daily, normal = sorted(history['games'], key=lambda record: record['daily'] is None)
+    assert daily['daily'] and daily['seed'] is None and daily['target'] is None
+    assert daily['guesses'] == []
+    assert normal['daily'] is None and normal['target'] == normal['guesses'][-1]
+
+
+def test_one_daily_game_per_player(api):
+    post(api, '/daily', {'player': "bob"})
+    with pytest.raises(ApiError) as error:
+        post(api, '/daily', {'player': "bob"})
+    assert error.value.status == 409
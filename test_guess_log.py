@@ -0,0 +1,26 @@
+from guess_log import GuessLog
+
+
+def test_iterates_history_dicts():
+    log = GuessLog.from_values(42, [50, 10, 42], 1, 100)
+    assert log.values.typecode == 'i'
+    assert len(log) == 3
+    assert list(log) == [
+        {'attempt': 1, 'guess': 50, 'target': 42, 'result': 'too high'},
+        {'attempt': 2, 'guess': 10, 'target': 42, 'result': 'too low'},
+        {'attempt': 3, 'guess': 42, 'target': 42, 'result': 'correct'},
+    ]
+    assert log[-1] == log[2]
+    assert log.columns()['result'] == ['too high', 'too low', 'correct']
+
+
+def test_storage_grows_with_the_range():
+    assert GuessLog(5, 1, 2 ** 40).values.typecode == 'q'
+    big = GuessLog.from_values(2 ** 70, [2 ** 69, 2 ** 70], 1, 2 ** 80)
+    assert isinstance(big.values, list)
+    assert [g['result'] for g in big] == ['too low', 'correct']
+
+
+def test_from_dicts_reads_the_old_format():
+    old = [{'attempt': 1, 'guess': 3, 'target': 7, 'result': 'too low'}]
+    assert list(GuessLog.from_dicts(7, old, 1, 10)) == old
@@ -0,0 +1,85 @@
+import random
+from collections import Counter
+
+import pytest
+
+from engine import GameState
+from hints import (
+    HINT_MODES, PROVIDERS, FeasibleSet, HintProvider, ResidueHint, entropy, next_provider, rank_providers
+)
+
+RESIDUE_PROVIDERS = [p for p in PROVIDERS.values() if isinstance(p, ResidueHint)]
+
+
+def test_providers_must_implement_every_method():
+    with pytest.raises(TypeError):
+        HintProvider()
+
+    class NoAnswers(ResidueHint):
+        key = 'broken'
+
+        def fact(self, target, min_range, max_range, rng=random):
+            return ('broken',)
+
+        def describe(self, hint_number, fact):
+            return ""
+
+    with pytest.raises(TypeError):
+        NoAnswers()
+
+
+@pytest.mark.parametrize("provider", RESIDUE_PROVIDERS, ids=lambda p: p.key)
+def test_each_residue_has_exactly_one_answer(provider):
+    answers = provider.answers()
+    for target in range(1, 2 * provider.modulus + 1):
+        fact = provider.fact(target, 1, 1000)
+        assert fact in answers
+        r = target % provider.modulus
+        assert [a for a in answers if provider.allowed(a, r)] == [fact]
+
+
+@pytest.mark.parametrize("provider", RESIDUE_PROVIDERS, ids=lambda p: p.key)
+def test_gain_is_the_entropy_of_the_answer(provider):
+    feasible = FeasibleSet(1, 500, [('parity', 1)])
+    numbers = [n for n in range(1, 501) if n % 2 == 1]
+    answers = Counter(provider.fact(n, 1, 500) for n in numbers)
+    assert provider.gain(feasible, 1, 500) == pytest.approx(entropy(list(answers.values())))
+
+
+def test_gain_does_not_depend_on_the_range_size():
+    huge = FeasibleSet(1, 2 ** 200)
+    assert PROVIDERS['parity'].gain(huge, 1, 2 ** 200) == pytest.approx(1.0)
+    assert PROVIDERS['bits3'].gain(huge, 1, 2 ** 200) == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("mode", list(HINT_MODES))
+def test_hints_never_exclude_the_target(mode):
+    rng = random.Random(0)
+    for _ in range(300):
+        min_range = rng.choice([1, -50, 1000])
+        max_range = min_range + rng.choice([3, 99, 9999, 2 ** 70])
+        game = GameState(min_range, max_range, rng.randint(min_range, max_range), hint_mode=mode)
+        while game.take_hint(rng):
+            feasible = FeasibleSet(min_range, max_range, game.hints)
+            assert feasible.low <= game.target <= feasible.high
+            assert game.target % feasible.modulus in feasible.residues
+
+
+def test_adaptive_ranks_by_gain_per_cost():
+    ranked = rank_providers('adaptive', [('parity', 0)], 1, 10_000)
+    assert 'parity' not in [provider.key for provider, _ in ranked]
+    ratios = [gain / provider.cost for provider, gain in ranked]
+    assert ratios == sorted(ratios, reverse=True)
+    assert next_provider('adaptive', [('parity', 0)], 1, 10_000) is ranked[0][0]
+    # Digit roots need positive numbers
+    assert 'digit_root' not in [p.key for p, _ in rank_providers('adaptive', [], -10, 10)]
+
+
+def test_classic_hints_come_in_order():
+    facts = []
+    for key in ('parity', 'divisor', 'range'):
+        provider = next_provider('classic', facts, 1, 100)
+        assert provider.key == key
+        facts.append(provider.fact(42, 1, 100))
+    assert next_provider('classic', facts, 1, 100) is None
+    assert sum(p.cost for p in HINT_MODES['classic']) == 3
@@ -0,0 +1,78 @@
+import sqlite3
+
+import pytest
+
+from guess_log import GuessLog
+from history_store import HistoryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+def test_records_roundtrip(store, make_record):
+    record = make_record(1, lucky=False)
+    game_id = store.append(record, "alice")
+    saved = store.get(game_id)
+    assert saved['id'] == game_id
+    assert isinstance(saved['guesses'], GuessLog)
+    assert list(saved['guesses']) == list(record['guesses'])
+    for field in ('min_range', 'max_range', 'attempts', 'score', 'target', 'seed', 'big_range'):
+        assert saved[field] == record[field]
+    assert saved['daily'] is None
+
+
+def test_players_and_orders(store, make_record):
+    scores = [30, 90, 60]
+    for i, score in enumerate(scores):
+        store.append(dict(make_record(i, lucky=False), score=score, attempts=i + 1), "alice")
+    store.append(make_record(9), "bob")
+    assert store.count("alice") == 3
+    assert store.count("bob") == 1
+    assert store.count("alice", difficulty="Easy 😊") == 0
+    assert sorted(store.players()) == ["alice", "bob"]
+    assert [r['score'] for r in store.records("alice", order='score')] == [90, 60, 30]
+    assert [r['score'] for r in store.records("alice", order='recent', limit=2)] == [60, 90]
+    assert [r['score'] for r in store.iter_records("alice", chunk_size=2)] == scores
+    assert [player for player, _ in store.iter_games(chunk_size=1)] == ["alice"] * 3 + ["bob"]
+
+
+def test_big_range_values(store, make_record):
+    target = 2 ** 70 + 3
+    record = dict(make_record(1), min_range=1, max_range=2 ** 80, target=target, big_range=True,
+                  guesses=GuessLog.from_values(target, [2 ** 79, target], 1, 2 ** 80))
+    saved = store.get(store.append(record))
+    assert saved['target'] == target
+    assert saved['max_range'] == 2 ** 80
+    assert [g['guess'] for g in saved['guesses']] == [2 ** 79, target]
+
+
+def test_daily_column(store, make_record):
+    saved = store.get(store.append(dict(make_record(1), daily="2024-01-01")))
+    assert saved['daily'] == "2024-01-01"
+
+
+def test_older_databases_gain_new_columns(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE games (id INTEGER PRIMARY KEY, player TEXT NOT NULL, min_range, max_range, "
+        "attempts INTEGER, score INTEGER, time_taken REAL, difficulty TEXT, target, "
+        "hints_used INTEGER, date TEXT, guesses TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO games (player, min_range, max_range, attempts, score, time_taken, difficulty, "
+        "target, hints_used, date, guesses) VALUES ('default', 1, 100, 1, 950, 5.0, 'Easy 😊', 42, 0, "
+        "'2024-01-01 12:00', '[{\"attempt\": 1, \"guess\": 42, \"target\": 42, \"result\": \"correct\"}]')"
+    )
+    conn.commit()
+    conn.close()
+    store = HistoryStore(path)
+    [record] = store.records()
+    store.close()
+    assert record['seed'] is None
+    assert record['daily'] is None
+    assert [g['result'] for g in record['guesses']] == ['correct']
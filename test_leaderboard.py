@@ -0,0 +1,134 @@
+import random
+
+import pytest
+
+from leaderboard import Leaderboard, ScoreIndex, player_name, range_bucket, range_bucket_label
+
+
+@pytest.fixture
+def board(tmp_path):
+    board = Leaderboard(str(tmp_path / "scores.db"))
+    yield board
+    board.close()
+
+
+def test_score_index_matches_sorted_scores():
+    rng = random.Random(7)
+    index, scores = ScoreIndex(), []
+    for _ in range(300):
+        score = rng.choice([rng.randint(0, 50), rng.randint(0, 10 ** 15)])
+        index.add(score)
+        scores.append(score)
+    scores.sort()
+    assert index.total == len(scores)
+    for probe in [-1, 0, 25, 10 ** 9, 10 ** 16] + scores[::17]:
+        assert index.count_above(probe) == sum(s > probe for s in scores)
+    for k in range(1, len(scores) + 1):
+        assert index.find(k) == scores[k - 1]
+
+
+def test_score_index_memory_follows_distinct_scores():
+    index = ScoreIndex()
+    for _ in range(3):
+        index.add(10 ** 13)
+        index.add(2 ** 62)
+    # At most one node per bit of the score, per distinct score
+    assert len(index.tree) <= 2 * 64
+    assert index.count_above(10 ** 13) == 3
+    assert index.find(4) == 2 ** 62
+
+
+def test_score_index_counts_in_bulk():
+    index = ScoreIndex()
+    index.add(7, 5)
+    index.add(3)
+    index.add(7, -2)
+    assert index.total == 4
+    assert index.count_at_most(6) == 1
+    assert index.find(2) == 7
+    with pytest.raises(ValueError):
+        index.add(-1)
+
+
+def test_ranks_share_ties_and_partitions(board):
+    for score in (50, 80, 80, 20):
+        board.submit("p", score, "Easy 😊", 1, 100)
+    board.submit("p", 999, "Hard 😓", 1, 100)
+    bucket = range_bucket(1, 100)
+    assert board.rank(80, "Easy 😊", bucket) == 1
+    assert board.rank(50, "Easy 😊", bucket) == 3
+    assert board.rank(10, "Easy 😊", bucket) == 5
+    assert board.count("Easy 😊", bucket) == 4
+    assert board.count() == 5
+    assert [e['score'] for e in board.top(3)] == [999, 80, 80]
+
+
+def test_huge_score_is_ranked(board):
+    assert board.submit("p", 10 ** 13, "Easy 😊", 1, 2 ** 40) == 1
+    assert board.count() == 1
+
+
+def test_failed_index_rolls_back_the_row(board, monkeypatch):
+    def fail(*args):
+        raise MemoryError
+
+    monkeypatch.setattr(board, "_index", fail)
+    with pytest.raises(MemoryError):
+        board.submit("p", 10, "Easy 😊", 1, 100)
+    assert board.top() == []
+
+
+def test_failed_index_leaves_every_partition_unchanged(board, monkeypatch):
+    board.submit("p", 10, "Easy 😊", 1, 100)
+    add = ScoreIndex.add
+    calls = []
+
+    def fail_third(index, score, count=1):
+        calls.append(score)
+        if len(calls) == 3:
+            raise MemoryError
+        add(index, score, count)
+
+    monkeypatch.setattr(ScoreIndex, "add", fail_third)
+    with pytest.raises(MemoryError):
+        board.submit("p", 50, "Easy 😊", 1, 100)
+    monkeypatch.undo()
+    bucket = range_bucket(1, 100)
+    for difficulty, partition in ((None, None), ("Easy 😊", None), (None, bucket), ("Easy 😊", bucket)):
+        assert board.count(difficulty, partition) == 1
+        assert board.rank(10, difficulty, partition) == 1
+
+
+def test_indexes_rebuilt_on_reopen(tmp_path):
+    path = str(tmp_path / "scores.db")
+    board = Leaderboard(path)
+    board.submit("p", 10, "Easy 😊", 1, 100)
+    board.submit("q", 30, "Easy 😊", 1, 100)
+    board.submit("r", 30, "Hard 😓", 1, 100)
+    board.submit("s", 30, "Easy 😊", 1, 100)
+    board.close()
+    board = Leaderboard(path)
+    assert board.count() == 4
+    assert board.count("Easy 😊") == 3
+    assert board.rank(20) == 4
+    assert board.rank(20, "Hard 😓", range_bucket(1, 100)) == 2
+    board.close()
+
+
+def test_big_range_games_have_their_own_buckets(board):
+    board.submit("p", 40, "Easy 😊", 1, 1000)
+    board.submit("q", 5, "Easy 😊", 1, 1000, big_range=True)
+    linear, big = range_bucket(1, 1000), range_bucket(1, 1000, True)
+    assert big == -linear
+    assert board.count("Easy 😊", linear) == 1
+    assert board.count("Easy 😊", big) == 1
+    assert board.rank(5, "Easy 😊", big) == 1
+    assert board.buckets() == [linear, big]
+    assert range_bucket_label(big) == "up to 1,000, big range"
+
+
+def test_top_lists_names_not_player_ids(board):
+    board.submit("3f1c0ffee", 10, "Easy 😊", 1, 100)
+    [entry] = board.top()
+    assert entry['player'] == player_name("3f1c0ffee")
+    assert "3f1c0ffee" not in entry['player']
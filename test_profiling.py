@@ -0,0 +1,84 @@
+import socket
+import urllib.request
+
+import pytest
+
+from profiling import LOG_ENV, PENDING_KEY, Profiler, RerunProfile, profiling_enabled
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    monkeypatch.setenv(LOG_ENV, str(tmp_path / "profile.jsonl"))
+    monkeypatch.delenv("NUMBER_MASTER_PROFILE", raising=False)
+    monkeypatch.delenv("NUMBER_MASTER_PROFILE_PORT", raising=False)
+    profiler = Profiler()
+    yield profiler
+    if profiler._server is not None:
+        profiler._server.shutdown()
+        profiler._server.server_close()
+
+
+def test_enabled_by_query_param(monkeypatch):
+    monkeypatch.delenv("NUMBER_MASTER_PROFILE", raising=False)
+    assert not profiling_enabled({})
+    assert not profiling_enabled({"profile": "0"})
+    assert profiling_enabled({"profile": "1"})
+    monkeypatch.setenv("NUMBER_MASTER_PROFILE", "1")
+    assert profiling_enabled()
+
+
+def test_finished_rerun_is_recorded(profiler, tmp_path):
+    state = {}
+    profile = profiler.start(True, state)
+    assert state[PENDING_KEY] is profile
+    profile.mark("css", profile.started + 0.5)
+    profile.mark("footer", profile.started + 0.75)
+    profiler.finish(profile, state)
+    assert PENDING_KEY not in state
+    assert profiler.reruns == 1
+    assert profiler.averages()['css'] == (0.5, 0.5)
+    assert profiler.averages()['total'] == (0.75, 0.75)
+    assert len((tmp_path / "profile.jsonl").read_text().splitlines()) == 1
+    assert 'number_master_section_seconds_count{section="css"} 1' in profiler.prometheus_text()
+
+
+def test_interrupted_rerun_is_recorded_by_the_next(profiler):
+    state = {}
+    profile = profiler.start(True, state)
+    profile.mark("css", profile.started + 0.1)
+    profile.active = profile.started + 0.3
+    # st.rerun() stops the script before finish()
+    profiler.start(False, state)
+    assert PENDING_KEY not in state
+    assert profile.sections[-1] == ("interrupted", pytest.approx(0.2))
+    assert profiler.reruns == 1
+
+
+def test_disabled_reruns_are_not_recorded(profiler):
+    profile = profiler.start(False, {})
+    assert not isinstance(profile, RerunProfile)
+    profile.mark("css")
+    profiler.finish(profile)
+    assert profiler.reruns == 0
+
+
+def test_metrics_endpoint(profiler):
+    profiler.finish(profiler.start(True))
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    assert profiler.serve(port)
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        assert b"number_master_reruns_total 1" in response.read()
+
+
+def test_port_in_use_is_reported(profiler, monkeypatch):
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        monkeypatch.setenv("NUMBER_MASTER_PROFILE_PORT", str(busy.getsockname()[1]))
+        profile = profiler.start(True)
+        assert isinstance(profile, RerunProfile)
+        assert "Can't serve profiler metrics" in profiler.serve_error
+        profiler.finish(profile)
+    assert profiler.reruns == 1
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import pytest
+
+from race_server import RaceError, RaceServer
+
+
+def test_create_room_rejects_ranges_outside_the_limits():
+    server = RaceServer(seed=0)
+    with pytest.raises(RaceError):
+        server.create_room(1, 10 ** 400)
+    with pytest.raises(RaceError):
+        server.create_room(5, 5)
+    assert not server.rooms
+
+
+def test_first_correct_guess_wins():
+    server = RaceServer(seed=0)
+    room_id = server.create_room(1, 100, "Easy 😊")
+    server.join(room_id, "alice")
+    server.join(room_id, "bob")
+    target = server.rooms[room_id].target
+    server.guess(room_id, "bob", target % 100 + 1)
+    assert server.guess(room_id, "alice", target)['result'] == 'correct'
+    assert server.standings(room_id)['winner'] == "alice"
+    with pytest.raises(RaceError):
+        server.guess(room_id, "bob", target)
+
+
+def test_tcp_errors_keep_the_connection_open():
+    async def session():
+        server = RaceServer(seed=0)
+        tcp = await asyncio.start_server(server._handle, "127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        for line in ("[]", "3", "not json", json.dumps({'op': 'create', 'max_range': "10^400"}),
+                     json.dumps({'op': 'create', 'max_range': 50})):
+            writer.write(line.encode() + b"\n")
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+        writer.close()
+        tcp.close()
+        return replies
+
+    replies = asyncio.run(session())
+    assert [reply['type'] for reply in replies] == ['error'] * 4 + ['created']
+
+
+def test_rejected_join_keeps_the_current_room():
+    async def session():
+        server = RaceServer(seed=0)
+        room_id = server.create_room(1, 100)
+        target = server.rooms[room_id].target
+        tcp = await asyncio.start_server(server._handle, "127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        for request in ({'op': 'join', 'room': room_id, 'player': "alice"},
+                        {'op': 'join', 'room': "NOPE", 'player': "bob"},
+                        {'op': 'join', 'room': room_id, 'player': ["bob"]},
+                        {'op': 'guess', 'value': target}):
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            replies.append(json.loads(await reader.readline()))
+        listeners = len(server.rooms[room_id].listeners)
+        writer.close()
+        tcp.close()
+        return replies, listeners
+
+    replies, listeners = asyncio.run(session())
+    assert [reply['type'] for reply in replies[1:3]] == ['error', 'error']
+    # The room's broadcast of the guess, so the connection is still listening
+    assert replies[3]['type'] == 'guess'
+    assert (replies[3]['player'], replies[3]['result']) == ("alice", 'correct')
+    assert listeners == 1
@@ -0,0 +1,63 @@
+import pytest
+
+from engine import calculate_score, seeded_game
+from guess_log import GuessLog
+from history_store import HistoryStore
+from replay import ReplayError, main, replay, replay_steps, rescore
+
+
+def test_replay_rebuilds_the_game(make_record):
+    record = make_record(5, lucky=False)
+    game = replay(record)
+    assert game.won
+    assert game.attempts == record['attempts']
+    steps = list(replay_steps(record))
+    assert [step['guess'] for step in steps] == list(record['guesses'].values)
+    assert steps[-1]['result'] == 'correct'
+
+
+def test_rescore_old_records_from_the_database(tmp_path, make_record):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    records = [make_record(seed, lucky=False) for seed in range(5)]
+    for record in records:
+        store.append(record)
+    stored = list(store.iter_records())
+    store.close()
+    assert [score for _, score in rescore(stored)] == [r['score'] for r in records]
+
+
+def test_rescore_with_new_rules(make_record):
+    record = make_record(6, lucky=False)
+
+    def double(*args):
+        return 2 * calculate_score(*args)
+
+    [(_, score)] = rescore([record], double)
+    assert score == 2 * record['score']
+
+
+def test_lost_games_score_nothing_under_any_rules(make_record):
+    game, _ = seeded_game(7, 1, 100)
+    wrong = 1 if game.target != 1 else 2
+    record = dict(make_record(7), attempts=3, score=0,
+                  guesses=GuessLog.from_values(game.target, [wrong] * 3, 1, 100))
+    [(_, score)] = rescore([record], lambda *args: 1000)
+    assert score == 0
+
+
+def test_records_that_cannot_be_replayed(make_record):
+    with pytest.raises(ReplayError):
+        next(rescore([dict(make_record(8), seed=None)]))
+    with pytest.raises(ReplayError):
+        replay(dict(make_record(8), target=make_record(8)['target'] + 1))
+
+
+def test_cli_reports_mismatches(tmp_path, make_record, capsys):
+    path = str(tmp_path / "history.db")
+    store = HistoryStore(path)
+    store.append(make_record(1, lucky=False))
+    store.append(dict(make_record(2, lucky=False), score=5))
+    store.append(dict(make_record(3), seed=None))
+    store.close()
+    assert main(["--db", path]) == 1
+    assert "2 games replayed, 1 score mismatches, 1 skipped" in capsys.readouterr().out
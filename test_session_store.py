@@ -0,0 +1,65 @@
+import gc
+
+import pytest
+
+from history_store import HistoryStore
+from session_store import SessionManager
+
+
+@pytest.fixture
+def store(tmp_path, make_record):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    for seed in range(30):
+        store.append(make_record(seed, lucky=False), "alice")
+    yield store
+    store.close()
+
+
+def test_stats_are_built_from_the_store(store, make_record):
+    sessions = SessionManager(store, hot_games=10, idle_ttl=60)
+    session = sessions.open("alice")
+    stats = sessions.stats(session)
+    assert stats.games == 30
+    assert len(stats.attempts) == 10
+    assert sessions.stats(session) is stats
+    record = make_record(99, lucky=False)
+    store.append(record, "alice")
+    sessions.record(session, record)
+    assert stats.games == 31
+
+
+def test_idle_sessions_lose_their_stats(store, make_record):
+    sessions = SessionManager(store, hot_games=10, idle_ttl=60)
+    idle, active = sessions.open("alice"), sessions.open("alice")
+    sessions.stats(idle)
+    sessions.stats(active)
+    idle.last_active -= 120
+    assert sessions.evict_idle() == 1
+    assert idle.stats is None and active.stats is not None
+    # A game finished while evicted is read back from the store
+    record = make_record(99, lucky=False)
+    store.append(record, "alice")
+    sessions.record(idle, record)
+    assert sessions.stats(idle).games == 31
+
+
+def test_touch_sweeps_once_per_interval(store):
+    sessions = SessionManager(store, idle_ttl=60, sweep_interval=30)
+    idle, active = sessions.open("alice"), sessions.open("alice")
+    sessions.stats(idle)
+    idle.last_active -= 120
+    sessions._last_sweep -= 10
+    sessions.touch(active)
+    assert idle.stats is not None
+    sessions._last_sweep -= 30
+    sessions.touch(active)
+    assert idle.stats is None
+
+
+def test_dropped_sessions_are_freed(store):
+    sessions = SessionManager(store)
+    session = sessions.open("alice")
+    assert len(sessions) == 1
+    del session
+    gc.collect()
+    assert len(sessions) == 0
@@ -0,0 +1,34 @@
+import math
+import random
+
+from engine import TOO_HIGH, TOO_LOW, GameState, play_many
+from solver import CandidateSet, optimal_guess
+
+
+def test_queries_agree_with_the_numbers():
+    rng = random.Random(0)
+    for _ in range(50):
+        target = rng.randint(1, 500)
+        game = GameState(1, 500, target)
+        for _ in range(3):
+            game.take_hint(rng)
+        candidates = CandidateSet.from_game(game)
+        members = [n for n in range(1, 501) if n in candidates]
+        assert target in candidates
+        assert candidates.count() == len(members)
+        assert [candidates.kth(k) for k in range(len(members))] == members
+
+
+def test_feedback_narrows_the_set():
+    candidates = CandidateSet(1, 100)
+    candidates.apply_feedback(40, TOO_LOW)
+    candidates.apply_feedback(90, TOO_HIGH)
+    assert (candidates.low, candidates.high) == (41, 89)
+    assert candidates.count() == 49
+    assert candidates.best_guess() == 65
+
+
+def test_optimal_guess_wins_in_log2_attempts():
+    result = play_many(optimal_guess, 200, seed=0, collect=True)
+    assert result.wins == 200
+    assert max(result.game_attempts) <= math.ceil(math.log2(100))
@@ -0,0 +1,54 @@
+import math
+import random
+
+from stats import ScoreBuckets, HistoryStats
+
+
+def make_records(make_record, n):
+    rng = random.Random(0)
+    return [
+        dict(make_record(i, lucky=False), score=rng.choice([0, rng.randint(1, 5000)]),
+             attempts=rng.randint(1, 20), hints_used=rng.randint(0, 1),
+             difficulty=rng.choice(["Easy 😊", "Hard 😓"]), date=f"2024-01-{i % 28 + 1:02d}")
+        for i in range(n)
+    ]
+
+
+def test_totals_match_the_records(make_record):
+    records = make_records(make_record, 200)
+    stats = HistoryStats.from_records(records)
+    scores = [r['score'] for r in records]
+    attempts = [r['attempts'] for r in records]
+    assert stats.games == 200
+    assert stats.wins == sum(score > 0 for score in scores)
+    assert stats.avg_score == sum(scores) / 200
+    assert stats.avg_attempts == sum(attempts) / 200
+    assert stats.high_score == max(scores)
+    assert (stats.min_attempts, stats.max_attempts) == (min(attempts), max(attempts))
+    assert stats.recent_avg_score == sum(scores[-5:]) / 5
+    assert stats.moving_averages()[-1] == sum(attempts[-5:]) / 5
+    assert sum(s.games for s in stats.by_difficulty.values()) == 200
+
+
+def test_hot_games_bound_the_charts(make_record):
+    records = make_records(make_record, 1000)
+    stats = HistoryStats.from_records(records, hot_games=50)
+    columns = stats.chart_columns()
+    assert len(stats.attempts) == 50
+    assert len(stats.runs) <= 50
+    assert columns['game_number'][-1] == 1000
+    assert columns['attempts'][-50:] == [r['attempts'] for r in records[-50:]]
+    assert sum(run[0] for run in stats.runs) == stats.spilled == 950
+    assert sum(stats.attempt_counts.values()) == 1000
+
+
+def test_score_quantiles_are_within_the_accuracy():
+    rng = random.Random(1)
+    scores = sorted(rng.randint(1, 100_000) for _ in range(5000))
+    buckets = ScoreBuckets(accuracy=0.01)
+    for score in scores:
+        buckets.add(score)
+    qs = (0, 0.25, 0.5, 0.75, 1)
+    for q, value in zip(qs, buckets.quantiles(qs)):
+        exact = scores[max(1, math.ceil(q * len(scores))) - 1]
+        assert abs(value - exact) <= 0.01 * exact + 1
@@ -0,0 +1,31 @@
+import pytest
+
+from engine import binary_search
+from tournament import STRATEGIES, load_strategy, run_tournament, to_rows
+
+DIFFICULTIES = ("Easy 😊", "Hard 😓")
+
+
+def totals(results):
+    return {key: (b.games, b.wins, b.attempts, b.hints, b.score) for key, b in results.items()}
+
+
+def test_results_do_not_depend_on_the_worker_count():
+    strategies = {name: STRATEGIES[name] for name in ('binary_search', 'random_guess', 'hint_first')}
+    serial = run_tournament(strategies, 250, DIFFICULTIES, seed=3, workers=1, chunk_size=100)
+    pooled = run_tournament(strategies, 250, DIFFICULTIES, seed=3, workers=2, chunk_size=100)
+    assert totals(pooled) == totals(serial)
+    assert all(batch.games == 250 for batch in serial.values())
+    assert totals(run_tournament(strategies, 250, DIFFICULTIES, seed=4, workers=1, chunk_size=100)) != totals(serial)
+
+
+def test_binary_search_always_wins():
+    results = run_tournament({'binary_search': binary_search}, 100, DIFFICULTIES, workers=1)
+    assert [row['win_rate'] for row in to_rows(results)] == [100.0, 100.0]
+
+
+def test_load_strategy():
+    assert load_strategy('optimal_guess') is STRATEGIES['optimal_guess']
+    assert load_strategy('engine:binary_search') is binary_search
+    with pytest.raises(ValueError):
+        load_strategy('no_such_bot')
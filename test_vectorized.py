@@ -0,0 +1,29 @@
+import numpy as np
+
+from engine import calculate_score, evaluate_guess
+from vectorized import calculate_scores, classify_guesses, result_names
+
+
+def test_calculate_scores_matches_the_engine():
+    rng = np.random.default_rng(0)
+    n = 2000
+    attempts = rng.integers(1, 60, n)
+    min_range = rng.integers(1, 1000, n)
+    max_range = min_range + rng.integers(1, 9000, n)
+    time_taken = rng.uniform(0, 300, n)
+    hints_used = rng.integers(0, 4, n)
+    hint_penalty = rng.integers(1, 5, n)
+    won = rng.random(n) < 0.7
+    scores = calculate_scores(attempts, max_range, min_range, time_taken, hints_used, hint_penalty, won)
+    for i in range(n):
+        expected = calculate_score(int(attempts[i]), int(max_range[i]), int(min_range[i]),
+                                   float(time_taken[i]), int(hints_used[i]), int(hint_penalty[i]))
+        assert scores[i] == (expected if won[i] else 0)
+
+
+def test_classify_guesses_matches_the_engine():
+    guesses = np.array([1, 50, 99, 50])
+    targets = np.array([50, 50, 50, 7])
+    codes = classify_guesses(guesses, targets)
+    assert list(codes) == [evaluate_guess(g, t) for g, t in zip(guesses, targets)]
+    assert list(result_names(codes)) == ['too low', 'correct', 'too high', 'too high']
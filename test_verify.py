@@ -0,0 +1,46 @@
+import pytest
+
+from history_store import HistoryStore
+from verify import (
+    IMPLAUSIBLE_WIN_RATE, SCORE_MISMATCH, SUB_HUMAN_TIMING, LiveVerifier, Verifier
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+def test_honest_game_passes(make_record):
+    assert Verifier().check_game(make_record(1, lucky=False))[0] == []
+
+
+def test_tampered_games_are_flagged(make_record):
+    record = make_record(2, lucky=False)
+    record['score'] += 100
+    assert SCORE_MISMATCH in Verifier().check_game(record)[0]
+    record = make_record(3, lucky=False, time_taken=0.01)
+    assert SUB_HUMAN_TIMING in Verifier().check_game(record)[0]
+
+
+def test_one_lucky_game_is_not_enough(make_record):
+    assert Verifier().feed("p", make_record(4)) == []
+
+
+def test_live_verifier_keeps_flagging_a_lucky_player(store, make_record):
+    verifier = LiveVerifier(store)
+    flags = [verifier.check("lucky", make_record(seed)) for seed in range(30)]
+    first = next(i for i, game_flags in enumerate(flags) if game_flags)
+    assert 1 < first < 20
+    assert all(IMPLAUSIBLE_WIN_RATE in game_flags for game_flags in flags[first:])
+    assert not any(verifier.check("honest", make_record(seed, lucky=False)) for seed in range(30))
+
+
+def test_live_verifier_counts_saved_history(store, make_record):
+    for seed in range(30):
+        store.append(make_record(seed), "lucky")
+    verifier = LiveVerifier(store)
+    assert verifier.check("lucky", make_record(99)) == [IMPLAUSIBLE_WIN_RATE]
+    assert verifier.verifier.players["lucky"].games == 31
@@ -0,0 +1,173 @@
+# Strategy tournament for Number Master Pro.
+#
+# Plays every strategy bot against every difficulty level under the real
+# scoring rules and tabulates win rate, score, attempts and hints. Games are
+# split into chunks that run on a ProcessPoolExecutor. Each chunk's seed is
+# derived from the tournament seed, the strategy, the difficulty and the chunk
+# number, so results are identical for any number of workers.
+#
+# A strategy is any module-level function strategy(game, rng) -> guess (see
+# engine.py); it may call game.take_hint(rng) first. Bots outside this module
+# can be entered as module:function.
+#
+#   python tournament.py --games 100000
+#   python tournament.py --strategy binary_search --strategy mybots:greedy --format json
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import DIFFICULTIES, BatchResult, binary_search, play_many, random_guess
+from hints import DEFAULT_HINT_MODE, HINT_MODES
+from solver import optimal_guess
+
+CHUNK_SIZE = 5_000
+DEFAULT_DIFFICULTIES = ("Easy 😊", "Medium 😐", "Hard 😓", "Expert 🥵")
+
+
+# Bots that use hints
+
+def hint_first(game, rng):
+    # Take every hint before the first guess, then guess the middle of what
+    # the hint facts still allow
+    while game.take_hint(rng):
+        pass
+    return optimal_guess(game, rng)
+
+
+def range_hint_search(game, rng):
+    # Take hints up to #3 and binary search inside the range hint's window,
+    # if one was given, ignoring the other facts
+    while game.hints_used < 3 and game.take_hint(rng):
+        pass
+    low, high = game.low, game.high
+    for fact in game.hints:
+        if fact[0] == 'range':
+            low, high = max(low, fact[1]), min(high, fact[2])
+    return (low + high) // 2
+
+
+STRATEGIES = {
+    'binary_search': binary_search,
+    'random_guess': random_guess,
+    'optimal_guess': optimal_guess,
+    'hint_first': hint_first,
+    'range_hint_search': range_hint_search,
+}
+
+
+# Function to resolve a strategy name or module:function spec
+def load_strategy(spec):
+    if spec in STRATEGIES:
+        return STRATEGIES[spec]
+    module_name, _, function_name = spec.partition(':')
+    if not function_name:
+        raise ValueError(f"Unknown strategy {spec!r}; use one of {', '.join(STRATEGIES)} or module:function")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+# Function to derive a chunk's seed; str seeds hash deterministically
+def chunk_seed(seed, strategy_name, difficulty, chunk):
+    return random.Random(f"{seed}/{strategy_name}/{difficulty}/{chunk}").getrandbits(64)
+
+
+def _play_chunk(task):
+    name, strategy, n_games, min_range, max_range, difficulty, seed, time_per_guess, big_range, hint_mode = task
+    return name, difficulty, play_many(
+        strategy, n_games, min_range, max_range, difficulty, seed, time_per_guess,
+        big_range=big_range, hint_mode=hint_mode
+    )
+
+
+# Function to run a tournament; returns {(strategy name, difficulty): BatchResult}
+def run_tournament(strategies, n_games, difficulties=DEFAULT_DIFFICULTIES, min_range=1, max_range=100,
+                   seed=0, workers=None, chunk_size=CHUNK_SIZE, time_per_guess=0.0, big_range=False,
+                   hint_mode=DEFAULT_HINT_MODE):
+    tasks = []
+    for name, strategy in strategies.items():
+        for difficulty in difficulties:
+            for chunk, start in enumerate(range(0, n_games, chunk_size)):
+                tasks.append((
+                    name, strategy, min(chunk_size, n_games - start), min_range, max_range,
+                    difficulty, chunk_seed(seed, name, difficulty, chunk), time_per_guess, big_range, hint_mode
+                ))
+
+    results = {(name, difficulty): BatchResult() for name in strategies for difficulty in difficulties}
+    if workers == 1:
+        for name, difficulty, batch in map(_play_chunk, tasks):
+            results[(name, difficulty)].merge(batch)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            # Totals are sums, so the merge order doesn't matter
+            for name, difficulty, batch in pool.map(_play_chunk, tasks):
+                results[(name, difficulty)].merge(batch)
+    return results
+
+
+def to_rows(results):
+    return [
+        {
+            'strategy': name,
+            'difficulty': difficulty,
+            'games': batch.games,
+            'win_rate': batch.win_rate,
+            'avg_score': batch.avg_score,
+            'avg_attempts': batch.avg_attempts,
+            'avg_hints': batch.hints / batch.games if batch.games else 0.0,
+        }
+        for (name, difficulty), batch in results.items()
+    ]
+
+
+def print_tables(results, difficulties, out=sys.stdout):
+    names = list(dict.fromkeys(name for name, _ in results))
+    width = max(len(name) for name in names) + 2
+    for title, value in (
+        ("Win rate (%)", lambda b: b.win_rate),
+        ("Average score", lambda b: b.avg_score),
+        ("Average attempts", lambda b: b.avg_attempts),
+    ):
+        out.write(f"{title}\n{'':<{width}}" + "".join(f"{d:>14}" for d in difficulties) + "\n")
+        for name in names:
+            out.write(f"{name:<{width}}" + "".join(
+                f"{value(results[(name, d)]):>14.2f}" for d in difficulties
+            ) + "\n")
+        out.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pit guessing strategies against every difficulty level.")
+    parser.add_argument("--strategy", action="append", help="strategy name or module:function (repeatable; "
+                        f"default: {', '.join(STRATEGIES)})")
+    parser.add_argument("--difficulty", action="append", choices=list(DIFFICULTIES),
+                        help="difficulty level (repeatable; default: Easy through Expert)")
+    parser.add_argument("--games", type=int, default=10_000, help="games per strategy and difficulty")
+    parser.add_argument("--min", type=int, default=1, dest="min_range")
+    parser.add_argument("--max", type=int, default=100, dest="max_range")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-per-guess", type=float, default=0.0, help="simulated seconds per guess")
+    parser.add_argument("--big-range", action="store_true", help="use big range mode limits and scoring")
+    parser.add_argument("--hint-mode", choices=list(HINT_MODES), default=DEFAULT_HINT_MODE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--format", choices=("table", "json"), default="table")
+    args = parser.parse_args(argv)
+
+    strategies = {spec: load_strategy(spec) for spec in (args.strategy or STRATEGIES)}
+    difficulties = args.difficulty or DEFAULT_DIFFICULTIES
+    results = run_tournament(
+        strategies, args.games, difficulties, args.min_range, args.max_range, args.seed,
+        args.workers, args.chunk_size, args.time_per_guess, args.big_range, args.hint_mode
+    )
+    if args.format == "json":
+        json.dump(to_rows(results), sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    else:
+        print_tables(results, difficulties)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# NumPy versions of the engine's scoring and guess evaluation.
+#
+# These take whole columns of games or guesses at once and return arrays that
+# match engine.calculate_score() and engine.evaluate_guess() value for value.
+import numpy as np
+
+from engine import RESULT_NAMES
+
+
+# Function to calculate scores for a batch of games
+def calculate_scores(attempts, max_range, min_range, time_taken, hints_used, hint_penalty, won=None):
+    attempts = np.asarray(attempts, dtype=np.int64)
+    max_range = np.asarray(max_range, dtype=np.int64)
+    min_range = np.asarray(min_range, dtype=np.int64)
+    time_taken = np.asarray(time_taken, dtype=np.float64)
+    hints_used = np.asarray(hints_used, dtype=np.int64)
+    hint_penalty = np.asarray(hint_penalty, dtype=np.int64)
+
+    # Same operations in the same order as the scalar version, so the float64
+    # intermediates round identically
+    range_factor = (max_range - min_range) / 100
+    base_score = 1000 * range_factor
+    attempt_penalty = attempts * 50
+    time_penalty = time_taken * 5
+    hint_penalty_total = hints_used * hint_penalty * 25
+
+    score = np.maximum(base_score - attempt_penalty - time_penalty - hint_penalty_total, 0)
+    # int() truncates toward zero; score is never negative here
+    score = score.astype(np.int64)
+    if won is not None:
+        score = np.where(np.asarray(won, dtype=bool), score, 0)
+    return score
+
+
+# Function to classify a batch of guesses as TOO_LOW / CORRECT / TOO_HIGH codes
+def classify_guesses(guesses, targets):
+    guesses = np.asarray(guesses, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    return np.sign(guesses - targets).astype(np.int8)
+
+
+# Function to turn result codes back into the labels used in game history
+def result_names(codes):
+    names = np.array([RESULT_NAMES[-1], RESULT_NAMES[0], RESULT_NAMES[1]], dtype=object)
+    return names[np.asarray(codes, dtype=np.int64) + 1]
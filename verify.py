@@ -0,0 +1,266 @@
+# Score verification and anti-cheat checks for Number Master Pro.
+#
+# A Verifier consumes finished games one at a time (e.g. straight from
+# HistoryStore.iter_games()) and flags the ones that do not add up:
+#   - the stored score differs from one re-derived from the guess log, or the
+#     seed does not reproduce the stored target;
+#   - a guess outside the interval the earlier too-low/too-high feedback
+#     already ruled out, or a guess after the game was won;
+#   - more attempts or hints than the rules allow;
+#   - less time per guess than a person needs to type and submit one.
+#
+# It also tracks each player's luck. Whatever a player's strategy, a guess
+# inside the feasible set is correct with probability 1/(feasible set size),
+# since the target is uniform over the numbers the feedback still allows. The
+# sum of those probabilities is a player's expected number of wins, and the
+# sum of p(1 - p) its variance. Wins minus expected wins is a martingale, so
+# Freedman's inequality bounds the chance that a fair player ever gets this far
+# ahead, however often the check runs. Players whose bound drops below `max_p`
+# are flagged as implausibly lucky.
+#
+# A LiveVerifier runs the same checks in a server process (app.py,
+# game_api.py) as games finish, so the win-rate test covers every game a
+# player has played rather than just the one being submitted.
+#
+#   python verify.py                   # check every game in the database
+#   python verify.py --player alice
+import argparse
+import math
+import threading
+import time
+
+from engine import DIFFICULTIES, MAX_HINTS, GameState, difficulty_settings
+from history_store import HistoryStore
+from replay import ReplayError, start_replay
+from solver import CandidateSet
+
+# Per-game flags
+INVALID_RECORD = 'invalid_record'
+SCORE_MISMATCH = 'score_mismatch'
+TARGET_MISMATCH = 'target_mismatch'
+INFEASIBLE_GUESS = 'infeasible_guess'
+GUESS_AFTER_WIN = 'guess_after_win'
+ATTEMPTS_MISMATCH = 'attempts_mismatch'
+TOO_MANY_ATTEMPTS = 'too_many_attempts'
+TOO_MANY_HINTS = 'too_many_hints'
+SUB_HUMAN_TIMING = 'sub_human_timing'
+# Per-player flag
+IMPLAUSIBLE_WIN_RATE = 'implausible_win_rate'
+
+MIN_SECONDS_PER_GUESS = 0.3
+WIN_RATE_MAX_P = 1e-6
+
+
+class PlayerLuck:
+    # Running totals for one player's win-rate test
+    __slots__ = ('games', 'wins', 'expected_wins', 'variance', 'flagged_games')
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.expected_wins = 0.0
+        self.variance = 0.0
+        self.flagged_games = 0
+
+    @property
+    def excess_wins(self):
+        return self.wins - self.expected_wins
+
+    def tail_bound(self):
+        # Upper bound on the chance a fair player is ever this many wins ahead
+        excess = self.excess_wins
+        if excess <= 0:
+            return 1.0
+        return math.exp(-excess * excess / (2 * (self.variance + excess / 3)))
+
+
+class Verifier:
+    def __init__(self, min_seconds_per_guess=MIN_SECONDS_PER_GUESS, max_p=WIN_RATE_MAX_P):
+        self.min_seconds_per_guess = min_seconds_per_guess
+        self.max_p = max_p
+        self.players = {}
+        self.games = 0
+        self.flagged_games = 0
+
+    def check_game(self, record):
+        # Returns (flags, luck), where luck is (wins, expected wins, variance)
+        # for this game, or None if the game can't be used for the luck test
+        flags = []
+        values = record['guesses'].values
+        if record.get('difficulty') not in DIFFICULTIES:
+            return [INVALID_RECORD], None
+
+        if record.get('seed') is not None:
+            try:
+                game = start_replay(record)
+            except ReplayError:
+                return [TARGET_MISMATCH], None
+        else:
+            # Saved before games were seeded: trust the stored target, and
+            # leave games with hints out of the luck test, as their hint facts
+            # are unknown
+            max_attempts, hint_penalty = difficulty_settings(
+                record['difficulty'], record['min_range'], record['max_range'],
+                record.get('big_range', False)
+            )
+            game = GameState(record['min_range'], record['max_range'], record['target'],
+                             max_attempts, hint_penalty, record.get('big_range', False))
+            # Unseeded games predate hint modes, so every hint was classic
+            game.hints_used = game.hint_cost = record.get('hints_used') or 0
+
+        hints_used = record.get('hints_used') or 0
+        if hints_used > MAX_HINTS:
+            flags.append(TOO_MANY_HINTS)
+        if record.get('attempts') != len(values):
+            flags.append(ATTEMPTS_MISMATCH)
+        if len(values) > game.max_attempts:
+            flags.append(TOO_MANY_ATTEMPTS)
+        time_taken = record.get('time_taken') or 0.0
+        if values and time_taken < len(values) * self.min_seconds_per_guess:
+            flags.append(SUB_HUMAN_TIMING)
+
+        # Walk the guesses, tracking the feasible set. Hints are treated as
+        # known from the first guess, which can only make a player look less
+        # lucky than they were.
+        candidates = CandidateSet.from_game(game) if game.hints else None
+        expected = variance = 0.0
+        infeasible = after_win = False
+        for value in values:
+            if game.won:
+                after_win = True
+                break
+            if not game.low <= value <= game.high:
+                infeasible = True
+            elif candidates is None:
+                p = 1 / (game.high - game.low + 1)
+                expected += p
+                variance += p * (1 - p)
+            elif value in candidates:
+                p = 1 / candidates.count()
+                expected += p
+                variance += p * (1 - p)
+            result = game.guess(value)
+            if candidates is not None:
+                candidates.apply_feedback(value, result)
+        if infeasible:
+            flags.append(INFEASIBLE_GUESS)
+        if after_win:
+            flags.append(GUESS_AFTER_WIN)
+
+        if game.score(time_taken) != record.get('score'):
+            flags.append(SCORE_MISMATCH)
+
+        if record.get('seed') is None and hints_used:
+            return flags, None
+        return flags, (int(game.won), expected, variance)
+
+    def feed(self, player, record):
+        # Check one finished game; returns its flags, plus IMPLAUSIBLE_WIN_RATE
+        # when this game takes the player over the threshold
+        flags, luck = self.check_game(record)
+        return self.tally(player, flags, luck)
+
+    def tally(self, player, flags, luck):
+        # Add a checked game's flags and luck to the player's totals
+        self.games += 1
+        stats = self.players.get(player)
+        if stats is None:
+            stats = self.players[player] = PlayerLuck()
+        if flags:
+            self.flagged_games += 1
+            stats.flagged_games += 1
+        if luck is not None:
+            was_implausible = self._implausible(stats)
+            stats.games += 1
+            stats.wins += luck[0]
+            stats.expected_wins += luck[1]
+            stats.variance += luck[2]
+            if not was_implausible and self._implausible(stats):
+                flags.append(IMPLAUSIBLE_WIN_RATE)
+        return flags
+
+    def run(self, games):
+        # Stream (player, record) pairs, yielding (player, record, flags) for
+        # every game that raised a flag
+        for player, record in games:
+            flags = self.feed(player, record)
+            if flags:
+                yield player, record, flags
+
+    def _implausible(self, stats):
+        return stats.tail_bound() < self.max_p
+
+    def implausible(self, player):
+        stats = self.players.get(player)
+        return stats is not None and self._implausible(stats)
+
+    def suspicious_players(self):
+        # Players whose win count is implausibly high, most suspicious first
+        return sorted(
+            ((player, stats) for player, stats in self.players.items() if self._implausible(stats)),
+            key=lambda item: item[1].tail_bound()
+        )
+
+
+class LiveVerifier:
+    # One Verifier shared by every session of a server process. A player's
+    # luck totals are built from their saved history the first time one of
+    # their games is checked, then updated game by game.
+    def __init__(self, history_store, verifier=None):
+        self.history_store = history_store
+        self.verifier = verifier or Verifier()
+        self._lock = threading.Lock()
+
+    def check(self, player, record):
+        # Flags for a game that has just finished. Call it before the game is
+        # saved, or the player's history would count it twice. Every finished
+        # game goes through here, lost or won, as losses count towards the
+        # win-rate test too.
+        if player not in self.verifier.players:
+            # Read outside the lock, so other players aren't kept waiting
+            past = Verifier(self.verifier.min_seconds_per_guess, self.verifier.max_p)
+            for old in self.history_store.iter_records(player):
+                past.feed(player, old)
+            with self._lock:
+                self.verifier.players.setdefault(player, past.players.get(player) or PlayerLuck())
+        flags, luck = self.verifier.check_game(record)
+        with self._lock:
+            flags = self.verifier.tally(player, flags, luck)
+            # feed() flags only the game that crosses the line; keep flagging
+            # the player's games for as long as they stay over it
+            if self.verifier.implausible(player) and IMPLAUSIBLE_WIN_RATE not in flags:
+                flags.append(IMPLAUSIBLE_WIN_RATE)
+        return flags
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify stored scores and flag suspicious games.")
+    parser.add_argument("--db", help="history database (default: NUMBER_MASTER_DB or number_master.db)")
+    parser.add_argument("--player", help="only check this player's games")
+    parser.add_argument("--min-seconds-per-guess", type=float, default=MIN_SECONDS_PER_GUESS)
+    parser.add_argument("--max-p", type=float, default=WIN_RATE_MAX_P,
+                        help="flag players whose wins a fair player reaches with at most this probability")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    if args.player:
+        games = ((args.player, record) for record in store.iter_records(args.player))
+    else:
+        games = store.iter_games()
+
+    verifier = Verifier(args.min_seconds_per_guess, args.max_p)
+    started = time.perf_counter()
+    for player, record, flags in verifier.run(games):
+        print(f"Game {record['id']} ({player}): {', '.join(flags)}")
+    elapsed = time.perf_counter() - started
+
+    for player, stats in verifier.suspicious_players():
+        print(f"Player {player}: {stats.wins} wins in {stats.games} games, "
+              f"{stats.expected_wins:.1f} expected (p < {stats.tail_bound():.1e})")
+    rate = verifier.games / elapsed if elapsed else 0
+    print(f"{verifier.games} games checked, {verifier.flagged_games} flagged ({rate:,.0f} games/s)")
+    return 1 if verifier.flagged_games else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())